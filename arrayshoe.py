@@ -0,0 +1,109 @@
+from array import array
+from card import Card
+from dealerodds import composition_of
+from deck import Deck
+from rules import defaultRules
+from scenarios import validate
+from shoe import decks_for
+from shuffler import defaultShuffler
+
+
+class ArrayShoe(object):
+    """
+    A shoe that keeps its cards as an array of card codes and a cursor
+    instead of a list of Card objects. It can be used anywhere a Shoe is
+    used. The array always holds every card in the shoe: dealing moves the
+    cursor and shuffling permutes the array in place, so nothing is rebuilt
+    between shoes. Card objects are only made as they are drawn.
+    """
+
+    def __init__(self, decks = None, shuffler = None, rules = None):
+        # As with Shoe, house rules decide the decks and the cut card.
+        decks = decks_for(decks, rules)
+        if rules is None:
+            rules = defaultRules
+        self.rules = rules
+        self.__decks = decks
+        if shuffler is None:
+            shuffler = defaultShuffler
+        self.shuffler = shuffler
+        self.__boxOrder = array('B', Deck.codes * decks)
+        self.__codes = array('B', self.__boxOrder)
+        #
+        # Like CardCollection.draw(), cards come off the end of the array,
+        # so the cursor is also the number of cards left in the shoe.
+        #
+        self.__cursor = len(self.__codes)
+        self.set_cut_card()
+
+    def __len__(self):
+        return self.__cursor
+
+    def __str__(self):
+        if self.__cursor == 0:
+            string = '[no cards]'
+        else:
+            debugMode = Card.debugMode
+            Card.debugMode = True
+            string = '[' + ', '.join(str(Card.from_code(code)) for code in self.__codes[:self.__cursor]) + ']'
+            Card.debugMode = debugMode
+        return string
+
+    def populate_shoe(self):
+        """Puts every card back in the shoe, in the order they came out of the box."""
+        self.__codes[:] = self.__boxOrder
+        self.__cursor = len(self.__codes)
+
+    def draw(self):
+        """Returns the top card from the shoe."""
+        if self.__cursor == 0:
+            raise ValueError('Not enough cards left to draw one.')
+        self.__cursor -= 1
+        return Card.from_code(self.__codes[self.__cursor])
+
+    def set_cut_card(self):
+        """Places the cut card the same way Shoe.set_cut_card() does."""
+        self.cutCard = self.rules.cut_card(len(self.__codes), self.shuffler.randint)
+
+    def should_shuffle(self):
+        """Returns True once the cut card has come out."""
+        return self.__cursor <= self.cutCard
+
+    def shuffle(self):
+        """
+        Gathers up every card and shuffles the shoe. The dealt cards are
+        still in the array, so this is just a copy of the box order (which
+        keeps seeded shoes reproducible on their own), an in-place
+        permutation and a cursor reset.
+        """
+        self.__codes[:] = self.__boxOrder
+        self.shuffler.shuffle(self.__codes)
+        self.__cursor = len(self.__codes)
+        self.set_cut_card()
+
+    def load(self, codes):
+        """Stacks the shoe with a scenario, the way Shoe.load() does."""
+        codes = array('B', codes)
+        validate(codes, self.__decks)
+        self.__codes = codes
+        self.__cursor = len(self.__codes)
+        self.cutCard = 0
+
+    def get_codes(self):
+        """The card codes still in the shoe. The last one is the next card drawn."""
+        return self.__codes[:self.__cursor]
+
+    def get_position(self):
+        """The number of cards dealt since the shoe was filled."""
+        return len(self.__codes) - self.__cursor
+
+    def get_decks(self):
+        return self.__decks
+
+    def composition(self):
+        """How many cards of each value are left. See dealerodds.py."""
+        return composition_of(self.__codes[:self.__cursor])
+
+    codes = property(get_codes)
+    decks = property(get_decks)
+    position = property(get_position)
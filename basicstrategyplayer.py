@@ -0,0 +1,205 @@
+import csv
+import json
+import os
+from player import Player
+
+#
+# A strategy table has a row for every hard total, soft total and pair, and
+# a column for every dealer up card. Each entry is one of:
+#
+#   H  hit                       S  stand
+#   D  double, otherwise hit     X  double, otherwise stand
+#   P  split (pair rows only)    -  don't split, play the total (pair rows only)
+#
+# In rule files the columns run 2, 3, ... 10, A, the way strategy cards are
+# printed.
+#
+upCardColumns = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'A']
+upCardValues = [2, 3, 4, 5, 6, 7, 8, 9, 10, 1]
+
+tableRows = {'hard': range(4, 22),
+             'soft': range(12, 22),
+             'pair': range(1, 11)}
+
+HARD = 0
+SOFT = 22
+PAIR = 44
+
+defaultTablesFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'basic-strategy.csv')
+
+
+class StrategyTables(object):
+    """
+    Decision tables for BasicStrategyPlayer, stored as one flat bytes object
+    so a decision is a single index: (section + row) * 10 + up card - 1,
+    where section is HARD, SOFT or PAIR and row is the hard total, the soft
+    total or the value of one card of the pair.
+    """
+
+    def __init__(self, rows):
+        """rows maps (table, row) to a string of 10 entries in upCardColumns order."""
+        entries = bytearray(b'H' * (PAIR + 22) * 10)
+        for section, table in [(HARD, 'hard'), (SOFT, 'soft'), (PAIR, 'pair')]:
+            for row in tableRows[table]:
+                if table == 'pair':
+                    line = rows.get((table, row), '-' * 10)
+                else:
+                    line = rows[(table, row)]
+                if len(line) != 10 or not set(line) <= set('HSDXP-'):
+                    raise ValueError(f'Bad {table} {row} row in strategy table: {line}')
+                for column, entry in enumerate(line):
+                    entries[(section + row) * 10 + upCardValues[column] - 1] = ord(entry)
+        self.entries = bytes(entries)
+
+    def row(self, table, row):
+        """Returns one row as a string in upCardColumns order."""
+        section = {'hard': HARD, 'soft': SOFT, 'pair': PAIR}[table]
+        return ''.join(chr(self.entries[(section + row) * 10 + upCard - 1]) for upCard in upCardValues)
+
+    @classmethod
+    def load_csv(cls, path):
+        """
+        Reads a table from a CSV file with a header row and then one line per
+        row: table,row,2,3,4,5,6,7,8,9,10,A
+        """
+        rows = {}
+        with open(path, newline='') as file:
+            reader = csv.reader(file)
+            next(reader)
+            for line in reader:
+                if line:
+                    rows[(line[0], int(line[1]))] = ''.join(entry.strip() for entry in line[2:])
+        return cls(rows)
+
+    @classmethod
+    def load_json(cls, path):
+        """
+        Reads a table from a JSON file shaped like:
+        {"hard": {"16": "SSSSSHHHHH", ...}, "soft": {...}, "pair": {...}}
+        """
+        with open(path) as file:
+            data = json.load(file)
+        return cls({(table, int(row)): line for table, lines in data.items() for row, line in lines.items()})
+
+    def save_csv(self, path):
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['table', 'row'] + upCardColumns)
+            for table, rows in tableRows.items():
+                for row in rows:
+                    writer.writerow([table, row] + list(self.row(table, row)))
+
+    def save_json(self, path):
+        with open(path, 'w') as file:
+            json.dump({table: {str(row): self.row(table, row) for row in rows}
+                       for table, rows in tableRows.items()}, file, indent=1)
+
+    @classmethod
+    def from_engine(cls, engine=None, decks=6):
+        """
+        Works out basic strategy for a full shoe with an ExpectedValue
+        engine. This takes a second or so, so the result is saved in
+        basic-strategy.csv rather than worked out every time.
+        """
+        from expectedvalue import ExpectedValue
+        from dealerodds import full_composition, remove_card
+        if engine is None:
+            engine = ExpectedValue()
+        rows = {}
+        for table, tableRange in tableRows.items():
+            for row in tableRange:
+                line = ''
+                for upCard in upCardValues:
+                    if table == 'hard':
+                        #
+                        # A two-card hand with this total that isn't a pair
+                        # where there is one. Hard 21 takes three cards and
+                        # is never played.
+                        #
+                        if row == 21:
+                            line += 'S'
+                            continue
+                        cards = [min(row - 2, 10), row - min(row - 2, 10)]
+                        hard, soft = row, False
+                    elif table == 'soft':
+                        cards = [1, row - 11]
+                        hard, soft = row - 10, True
+                    else:
+                        cards = [row, row]
+                        hard, soft = 2 * row, row == 1
+                    composition = remove_card(full_composition(decks), upCard - 1)
+                    for card in cards:
+                        composition = remove_card(composition, card - 1)
+                    line += cls._best_entry(engine, table, row, hard, soft, upCard, composition)
+                rows[(table, row)] = line
+        return cls(rows)
+
+    @staticmethod
+    def _best_entry(engine, table, row, hard, soft, upCard, composition):
+        """Returns the table entry for one two-card hand against one up card."""
+        value = hard + 10 if soft else hard
+        if value >= 21:
+            return 'S' if table != 'pair' else '-'
+        depth = engine.exactDepth
+        stand = engine.stand(hard, soft, 2, upCard, composition)
+        hit = engine.hit(hard, soft, 2, upCard, composition, depth)
+        double = engine.double(hard, soft, 2, upCard, composition, depth)
+        if table == 'pair':
+            split = engine.split(row - 1, upCard, composition, engine.splits_left(row - 1, composition), depth)
+            return 'P' if split > max(stand, hit, double) else '-'
+        if double > max(stand, hit):
+            return 'D' if hit >= stand else 'X'
+        return 'H' if hit > stand else 'S'
+
+
+class BasicStrategyPlayer(Player):
+    """
+    A bot that bets a flat amount and plays from StrategyTables. Each
+    decision is a table lookup, so bots cost very little in a simulation.
+    """
+
+    defaultTables = None
+    __slots__ = ('unitBet', 'tables', '_entries')
+
+    def __init__(self, name, money=100, unitBet=10, tables=None):
+        super().__init__(name, money)
+        self.unitBet = unitBet
+        if tables is None:
+            if BasicStrategyPlayer.defaultTables is None:
+                BasicStrategyPlayer.defaultTables = StrategyTables.load_csv(defaultTablesFile)
+            tables = BasicStrategyPlayer.defaultTables
+        self.tables = tables
+        self._entries = tables.entries
+
+    def bet_or_leave(self):
+        """Bets unitBet every hand and leaves once it can't cover it."""
+        if self._chips < self.unitBet:
+            return -1
+        return self.unitBet
+
+    def insurance(self, hand, dealerShowing):
+        """Insurance is a bad bet unless you are counting cards."""
+        return False
+
+    def play(self, hand, dealerShowing):
+        column = dealerShowing.hardValue - 1
+        entries = self._entries
+        if len(hand) == 2 and hand.can_split() and self._chips >= hand.bet:
+            entry = entries[(PAIR + hand[0].hardValue) * 10 + column]
+            if entry == 80:  # P
+                return 'p', None
+        if hand.is_soft():
+            entry = entries[(SOFT + hand.hard_value() + 10) * 10 + column]
+        else:
+            entry = entries[(HARD + hand.hard_value()) * 10 + column]
+        if entry == 72:  # H
+            return 'h', None
+        if entry == 83:  # S
+            return 's', None
+        #
+        # D or X: double for as much as we can, up to the original bet, if
+        # the rules let us.
+        #
+        if self._chips > 0 and hand.can_double():
+            return 'd', min(hand.bet, self._chips)
+        return ('h', None) if entry == 68 else ('s', None)
@@ -0,0 +1,285 @@
+import random
+from arrayshoe import ArrayShoe
+from basicstrategyplayer import BasicStrategyPlayer, StrategyTables, defaultTablesFile, HARD, SOFT, PAIR
+from dealer import Dealer
+from deck import Deck
+from events import nullSink
+from rules import defaultRules
+from settlement import settle, outcomeNames
+from shuffler import CounterShuffler
+from simulator import SimulationResult
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#
+# Status bits for a hand in a BatchTable.
+#
+STANDING = 1
+BUSTED = 2
+BLACKJACK = 4
+DOUBLED = 8
+
+if numpy is not None:
+    # The hard value of each card code and whether it is an ace.
+    codeValues = numpy.minimum(numpy.arange(52) // 4 + 1, 10).astype(numpy.int16)
+    codeAces = (numpy.arange(52) < 4).astype(numpy.int16)
+
+
+class BatchTable(object):
+    """
+    Plays many independent tables in lock-step with NumPy. Every table has
+    its own shoe and the same number of seats, each taken by a flat-betting
+    basic strategy player with an unlimited bankroll, and plays by the
+    same RuleSet (see rules.py) as a Dealer would. The round is split into the same phases as Dealer's, but each
+    phase works on every table at once: the hands live in (tables, seats)
+    arrays of hard totals, ace counts, card counts, bets and status bits,
+    and a phase is a handful of array operations instead of a loop over
+    players.
+
+    Each table's shoe is shuffled by its own stream of a CounterShuffler
+    (see shuffler.py), so a seed makes a run reproducible, and the cut card
+    goes where the rules put it for any other shoe.
+
+    Splits are the one thing kept off the fast path. A table where anyone
+    splits is set aside after the deal and its round is played again from
+    the same shoe position by a real Dealer and BasicStrategyPlayers, so
+    the results are exactly what Dealer would have produced.
+    """
+
+    def __init__(self, tables, seats=1, unitBet=10, strategy=None, seed=None, rules=None):
+        if numpy is None:
+            raise ImportError('BatchTable requires numpy.')
+        if rules is None:
+            rules = defaultRules
+        self.rules = rules
+        self.tables = tables
+        self.seats = seats
+        self.unitBet = unitBet
+        decks = rules.decks
+        if strategy is None:
+            strategy = StrategyTables.load_csv(defaultTablesFile)
+        self.strategy = strategy
+        self._entries = numpy.frombuffer(strategy.entries, dtype=numpy.uint8)
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.shufflers = [CounterShuffler(seed, table, useNumpy=True) for table in range(tables)]
+
+        # Every table's shoe, dealt from the end like ArrayShoe.
+        self._boxOrder = numpy.array(Deck.codes * decks, dtype=numpy.uint8)
+        self.shoes = numpy.tile(self._boxOrder, (tables, 1))
+        self.cursors = numpy.zeros(tables, dtype=numpy.int64)
+        self.cutCards = numpy.zeros(tables, dtype=numpy.int64)
+
+        shape = (tables, seats)
+        self.hard = numpy.zeros(shape, dtype=numpy.int16)
+        self.aces = numpy.zeros(shape, dtype=numpy.int16)
+        self.cards = numpy.zeros(shape, dtype=numpy.int16)
+        self.bets = numpy.zeros(shape, dtype=numpy.float64)
+        self.status = numpy.zeros(shape, dtype=numpy.uint8)
+        self.dealerHard = numpy.zeros(tables, dtype=numpy.int16)
+        self.dealerAces = numpy.zeros(tables, dtype=numpy.int16)
+        self.dealerStatus = numpy.zeros(tables, dtype=numpy.uint8)
+        self.upCards = numpy.zeros(tables, dtype=numpy.int16)
+        # Tables whose round goes to the scalar path, and where their round began.
+        self.splitTables = numpy.zeros(tables, dtype=bool)
+        self.roundStart = numpy.zeros(tables, dtype=numpy.int64)
+
+        self._dealer = Dealer('Dealer', 0, ArrayShoe(rules=rules), nullSink, rules)
+        self._players = [BasicStrategyPlayer(f'Seat {seat}', float('inf'), unitBet, strategy)
+                         for seat in range(seats)]
+
+    def shuffle(self, tables):
+        """Shuffles the shoes of the given tables (an index array)."""
+        shoeSize = self.shoes.shape[1]
+        cut_card = self.rules.cut_card
+        for table in tables:
+            shuffler = self.shufflers[table]
+            #
+            # As in ArrayShoe.shuffle(), every shoe starts from box order, so
+            # it only depends on its seed, stream and shoe number. Each row
+            # is a view of the table's shoe, shuffled in place.
+            #
+            self.shoes[table] = self._boxOrder
+            shuffler.shuffle(self.shoes[table])
+            self.cursors[table] = shoeSize
+            self.cutCards[table] = cut_card(shoeSize, shuffler.randint)
+
+    def draw(self, tables):
+        """Deals one card from each of the given tables' shoes and returns their codes."""
+        cursors = self.cursors[tables] - 1
+        if len(cursors) and cursors.min() < 0:
+            raise ValueError('Not enough cards left to draw one.')
+        self.cursors[tables] = cursors
+        return self.shoes[tables, cursors]
+
+    def take_bets(self):
+        """Every seat bets one unit."""
+        self.bets[:] = self.unitBet
+
+    def deal(self):
+        """Shuffles the shoes that need it and deals every table, the way Dealer.deal() does."""
+        self.shuffle(numpy.flatnonzero(self.cursors <= self.cutCards))
+        self.roundStart[:] = self.cursors
+        everyTable = numpy.arange(self.tables)
+        firstCodes = numpy.zeros((self.tables, self.seats), dtype=numpy.uint8)
+        secondCodes = numpy.zeros((self.tables, self.seats), dtype=numpy.uint8)
+        for seat in range(self.seats):
+            firstCodes[:, seat] = self.draw(everyTable)
+            secondCodes[:, seat] = self.draw(everyTable)
+        self.hard[:] = codeValues[firstCodes] + codeValues[secondCodes]
+        self.aces[:] = codeAces[firstCodes] + codeAces[secondCodes]
+        self.cards[:] = 2
+        self.status[:] = 0
+        self.status[(self.hard == 11) & (self.aces > 0)] = BLACKJACK | STANDING
+
+        first = self.draw(everyTable)
+        second = self.draw(everyTable)
+        self.dealerHard[:] = codeValues[first] + codeValues[second]
+        self.dealerAces[:] = codeAces[first] + codeAces[second]
+        self.dealerStatus[:] = 0
+        self.dealerStatus[(self.dealerHard == 11) & (self.dealerAces > 0)] = BLACKJACK | STANDING
+        # The dealer shows the second card.
+        self.upCards[:] = codeValues[second]
+
+        #
+        # Set aside the tables where a player is going to split.
+        #
+        pairs = firstCodes // 4 == secondCodes // 4
+        entries = self._entries[(PAIR + codeValues[firstCodes]) * 10 + self.upCards[:, None] - 1]
+        self.splitTables[:] = (pairs & (entries == 80)).any(axis=1)  # P
+
+    def resolve_hands(self):
+        """
+        Plays out every hand, seat by seat, and then the dealer's, on every
+        table except the ones set aside for splits.
+        """
+        entries = self._entries
+        fastTables = ~self.splitTables
+        hard = self.hard
+        aces = self.aces
+        status = self.status
+        for seat in range(self.seats):
+            playing = numpy.flatnonzero(fastTables & (status[:, seat] == 0))
+            while len(playing):
+                handHard = hard[playing, seat]
+                soft = (aces[playing, seat] > 0) & (handHard <= 11)
+                rows = numpy.where(soft, SOFT + handHard + 10, HARD + handHard)
+                choices = entries[rows * 10 + self.upCards[playing] - 1]
+                standing = choices == 83  # S
+                doubling = (choices == 68) | (choices == 88)  # D or X
+                status[playing[standing], seat] |= STANDING
+                doubled = playing[doubling]
+                self.bets[doubled, seat] *= 2
+                status[doubled, seat] |= DOUBLED | STANDING
+
+                drawing = playing[~standing]
+                codes = self.draw(drawing)
+                hard[drawing, seat] += codeValues[codes]
+                aces[drawing, seat] += codeAces[codes]
+                self.cards[drawing, seat] += 1
+                value = hard[drawing, seat] + 10 * ((aces[drawing, seat] > 0) & (hard[drawing, seat] <= 11))
+                status[drawing[value == 21], seat] |= STANDING
+                status[drawing[value > 21], seat] |= BUSTED
+                playing = drawing[status[drawing, seat] == 0]
+
+        # The dealer stands from 17 up, and on soft 17 unless the rules say to hit it.
+        standsOnSoft17 = not self.rules.hitSoft17
+        playing = numpy.flatnonzero(fastTables & (self.dealerStatus == 0))
+        while len(playing):
+            dealerHard = self.dealerHard[playing]
+            soft = (self.dealerAces[playing] > 0) & (dealerHard <= 11)
+            value = dealerHard + 10 * soft
+            standing = (value > 17) | ((value == 17) & (standsOnSoft17 | ~soft))
+            self.dealerStatus[playing[standing]] |= STANDING
+            drawing = playing[~standing]
+            codes = self.draw(drawing)
+            self.dealerHard[drawing] += codeValues[codes]
+            self.dealerAces[drawing] += codeAces[codes]
+            dealerHard = self.dealerHard[drawing]
+            value = dealerHard + 10 * ((self.dealerAces[drawing] > 0) & (dealerHard <= 11))
+            self.dealerStatus[drawing[value == 21]] |= STANDING
+            self.dealerStatus[drawing[value > 21]] |= BUSTED
+            playing = drawing[self.dealerStatus[drawing] == 0]
+
+    def payout(self):
+        """
+        Settles every hand and returns flat arrays of their outcomes
+        (indexes into settlement.outcomeNames), bets and nets.
+        """
+        fastTables = ~self.splitTables
+        hard = self.hard[fastTables]
+        value = hard + 10 * ((self.aces[fastTables] > 0) & (hard <= 11))
+        status = self.status[fastTables]
+        bets = self.bets[fastTables]
+        dealerHard = self.dealerHard[fastTables]
+        dealerValue = (dealerHard + 10 * ((self.dealerAces[fastTables] > 0) & (dealerHard <= 11)))[:, None]
+        dealerStatus = self.dealerStatus[fastTables][:, None]
+
+        outcomes, nets = settle(value, (status & BLACKJACK) > 0, (status & BUSTED) > 0, bets,
+                                dealerValue, (dealerStatus & BLACKJACK) > 0, (dealerStatus & BUSTED) > 0,
+                                self.rules.blackjackPayout)
+        outcomes = outcomes.ravel()
+        bets = bets.ravel()
+        nets = nets.ravel()
+
+        splitTables = numpy.flatnonzero(self.splitTables)
+        if len(splitTables):
+            splitOutcomes, splitBets, splitNets = self.play_scalar(splitTables)
+            outcomes = numpy.concatenate([outcomes, splitOutcomes])
+            bets = numpy.concatenate([bets, splitBets])
+            nets = numpy.concatenate([nets, splitNets])
+        return outcomes, bets, nets
+
+    def play_scalar(self, tables):
+        """
+        Plays the round again on each of the given tables with a real
+        Dealer, from where the shoe was at the start of the round.
+        """
+        dealer = self._dealer
+        shoe = dealer.shoe
+        outcomeIndex = {name: index for index, name in enumerate(outcomeNames)}
+        outcomes = []
+        bets = []
+        nets = []
+        for table in tables:
+            start = self.roundStart[table]
+            shoe.load(self.shoes[table, :start])
+            dealer.players = list(self._players)
+            dealer.take_bets()
+            dealer.deal()
+            dealer.resolve_hands()
+            for outcome, bet, net in dealer.payout():
+                outcomes.append(outcomeIndex[outcome])
+                bets.append(bet)
+                nets.append(net)
+            self.cursors[table] = start - shoe.position
+        return numpy.array(outcomes, dtype=numpy.int64), numpy.array(bets), numpy.array(nets)
+
+    def run(self, rounds):
+        """Plays rounds on every table and returns a SimulationResult."""
+        result = SimulationResult()
+        for _ in range(rounds):
+            self.take_bets()
+            self.deal()
+            self.resolve_hands()
+            outcomes, bets, nets = self.payout()
+            result.merge(batch_result(outcomes, bets, nets))
+            result.rounds += self.tables
+        return result
+
+
+def batch_result(outcomes, bets, nets):
+    """Returns a SimulationResult for arrays of settled hands."""
+    result = SimulationResult()
+    result.hands = len(nets)
+    if result.hands:
+        result.totalBet = float(bets.sum())
+        result.netWin = float(nets.sum())
+        counts = numpy.bincount(outcomes, minlength=len(outcomeNames))
+        result.outcomes = dict(zip(outcomeNames, counts.tolist()))
+        result._mean = float(nets.mean())
+        result._m2 = float(((nets - result._mean) ** 2).sum())
+    return result
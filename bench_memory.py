@@ -0,0 +1,117 @@
+"""
+Measures how much memory the game's objects take, with tracemalloc:
+
+    python bench_memory.py [count]
+
+Each line is the cost of one object, averaged over count of them, next to
+the same object built the old way, with every attribute in a __dict__.
+
+Hand keeps a __dict__ slot so a sink or a mock can be put on one hand,
+which costs it about 16 bytes. Player has none. The players that don't
+declare __slots__ of their own, like the counting players, still get a
+__dict__.
+"""
+import sys
+import tracemalloc
+from basicstrategyplayer import BasicStrategyPlayer
+from card import Card
+from hand import Hand
+
+
+#
+# What Card, Hand and Player looked like before they had slots: the same
+# attributes, kept in a __dict__.
+#
+class DictCard(object):
+
+    def __init__(self, face):
+        self.face = face
+        self.isShowing = False
+
+
+class DictHand(list):
+
+    def __init__(self, bet):
+        super().__init__()
+        self.isVerbose = False
+        self._bet = bet
+        self._insurance = 0
+        self._isBlackJack = False
+        self._isBusted = False
+        self._isStanding = False
+        self._isSplit = False
+        self._isDoubled = False
+        self._isSurrendered = False
+        self._splits = None
+        self._hardValue = 0
+        self._aces = 0
+
+
+class DictPlayer(object):
+
+    def __init__(self, name, money, unitBet, tables):
+        self.name = name
+        self._chips = money
+        self._hands = []
+        self.isVerbose = False
+        self.countsCards = False
+        self.unitBet = unitBet
+        self.tables = tables
+        self._entries = tables.entries
+
+
+def measure(make, count):
+    """Returns the bytes allocated per object by calling make() count times."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make(index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Don't count the list holding them.
+    perObject = (after - before - sys.getsizeof(objects)) / count
+    del objects
+    return perObject
+
+
+def hand_codes(index):
+    """
+    The cards of a typical hand: three of them, or two if the first two are
+    a blackjack, which can't take a third.
+    """
+    codes = [index % 52, (index + 17) % 52, (index + 31) % 52]
+    first, second = Card.faces[codes[0]], Card.faces[codes[1]]
+    if first.hardValue + second.hardValue == 11 and (first.isAce or second.isAce):
+        del codes[2]
+    return codes
+
+
+def make_hand(index):
+    # The cards are part of what a hand costs.
+    hand = Hand(10)
+    for code in hand_codes(index):
+        hand.hit(Card.from_code(code).flip())
+    return hand
+
+
+def make_dict_hand(index):
+    hand = DictHand(10)
+    for code in hand_codes(index):
+        hand.append(DictCard(Card.faces[code]))
+    return hand
+
+
+def main(count=100000):
+    tables = BasicStrategyPlayer('Bot', 0).tables
+    rows = [('Card', lambda index: Card.from_code(index % 52), lambda index: DictCard(Card.faces[index % 52])),
+            ('Hand of 3 cards', make_hand, make_dict_hand),
+            ('BasicStrategyPlayer', lambda index: BasicStrategyPlayer('Bot', 100, 10, tables),
+             lambda index: DictPlayer('Bot', 100, 10, tables))]
+    print(f'{"":<22}{"slots":>10}{"__dict__":>10}{"saved":>8}')
+    for name, make, makeDict in rows:
+        slotted = measure(make, count)
+        unslotted = measure(makeDict, count)
+        print(f'{name:<22}{slotted:>9.0f}B{unslotted:>9.0f}B{1 - slotted / unslotted:>8.0%}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
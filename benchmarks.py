@@ -0,0 +1,243 @@
+"""
+Times the game's hot paths and compares them with an earlier run:
+
+    python benchmarks.py --output now.json
+    python benchmarks.py --baseline now.json --threshold 0.25
+
+Each benchmark reports the best time per call over a few repeats. The
+results go to a JSON file, and with --baseline the run fails (exit status
+1) if any benchmark got slower than the baseline by more than the
+threshold, a fraction: 0.25 allows 25% slower. Only compare runs made on
+the same machine.
+
+Short runs are noisy: one repeat of 0.05 seconds can come out half as
+slow again from one run to the next, and even the defaults (five repeats
+of at least 0.2 seconds) can move by a third on a busy machine. So with
+--baseline the run never uses fewer repeats or less time than the
+defaults, and a benchmark that looks slower is measured again (--retries
+times, two by default) and keeps its best time before it counts as a
+regression. With those settings and the default threshold, repeated runs
+against the same baseline pass; for a tighter threshold use a quiet
+machine and raise --repeat and --min-time. Make the baseline with the
+same settings as the runs compared with it.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+from basicstrategyplayer import BasicStrategyPlayer
+from card import Card
+from dealer import Dealer
+from deck import Deck
+from events import nullSink
+from hand import Hand
+from shoe import Shoe
+from shuffler import CounterShuffler
+from simulator import Simulator
+
+#
+# Every benchmark, by name. A benchmark takes a number of calls, makes them
+# and returns how many seconds they took, so anything that has to be set up
+# for each call can be left out of the time.
+#
+benchmarks = {}
+#
+# The fewest repeats and seconds per repeat a run compared with a baseline
+# uses, whatever it is asked for: below these, noise alone fails the check.
+#
+baselineRepeat = 5
+baselineMinTime = 0.2
+
+
+def benchmark(name):
+    """Adds the decorated function to benchmarks."""
+    def register(function):
+        benchmarks[name] = function
+        return function
+    return register
+
+
+def timed(function):
+    """Returns a benchmark that times number calls of function()."""
+    def run(number):
+        return timeit.Timer(function).timeit(number)
+    return run
+
+
+def make_dealer(players=3, seed=0):
+    """A headless Dealer with flat-betting basic strategy players and a seeded shoe."""
+    dealer = Dealer('Dealer', 0, Shoe(shuffler=CounterShuffler(seed)), nullSink)
+    for seat in range(players):
+        dealer.deal_in(BasicStrategyPlayer(f'Seat {seat}', float('inf')))
+    dealer.shoe.shuffle()
+    return dealer
+
+
+@benchmark('card.construct')
+def card_construct(number):
+    return timed(lambda: Card('queen', 'hearts'))(number)
+
+
+@benchmark('card.from_code')
+def card_from_code(number):
+    return timed(lambda: Card.from_code(46))(number)
+
+
+@benchmark('deck.create')
+def deck_create(number):
+    return timed(Deck)(number)
+
+
+@benchmark('shoe.create')
+def shoe_create(number):
+    shuffler = CounterShuffler(0)
+    return timed(lambda: Shoe(6, shuffler))(number)
+
+
+@benchmark('shoe.shuffle')
+def shoe_shuffle(number):
+    shoe = Shoe(6, CounterShuffler(0))
+    return timed(shoe.shuffle)(number)
+
+
+@benchmark('hand.hit_value')
+def hand_hit_value(number):
+    cards = [Card.from_code(code).flip() for code in (0, 20, 36)]
+
+    def play():
+        hand = Hand(10)
+        for card in cards:
+            hand.hit(card)
+            hand.value()
+    return timed(play)(number)
+
+
+@benchmark('dealer.payout')
+def dealer_payout(number):
+    dealer = make_dealer()
+    elapsed = 0.0
+    for _ in range(number):
+        dealer.take_bets()
+        dealer.deal()
+        dealer.resolve_hands()
+        start = time.perf_counter()
+        dealer.payout()
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+@benchmark('round.headless')
+def round_headless(number):
+    dealer = make_dealer()
+    simulator = Simulator(dealer, list(dealer.players), number)
+    dealer.players = []
+    start = time.perf_counter()
+    simulator.run()
+    return time.perf_counter() - start
+
+
+def measure(function, repeat=5, minTime=0.2):
+    """
+    Returns the best seconds per call of a benchmark, over repeat runs of
+    enough calls to take at least minTime seconds.
+    """
+    number = 1
+    while function(number) < minTime:
+        number *= 10 if number < 1000 else 2
+    return min(function(number) for _ in range(repeat)) / number
+
+
+def run(names=None, repeat=5, minTime=0.2):
+    """Runs the named benchmarks (all of them by default) and returns their results."""
+    if names is None:
+        names = list(benchmarks)
+    return {'python': platform.python_version(),
+            'machine': platform.machine(),
+            'benchmarks': {name: measure(benchmarks[name], repeat, minTime) for name in names}}
+
+
+def compare(results, baseline, threshold=0.25):
+    """
+    Returns (name, baseline, now, ratio) for every benchmark in both results
+    that is more than threshold slower than in baseline.
+    """
+    regressions = []
+    for name, seconds in results['benchmarks'].items():
+        before = baseline['benchmarks'].get(name)
+        if before and seconds > before * (1 + threshold):
+            regressions.append((name, before, seconds, seconds / before))
+    return regressions
+
+
+def confirm(results, baseline, threshold=0.25, repeat=5, minTime=0.2, retries=2):
+    """
+    Measures every benchmark that compare() finds slower again, up to
+    retries more times, and keeps its best time in results, so one noisy
+    measurement isn't taken for a regression. Returns the regressions that
+    are left.
+    """
+    regressions = compare(results, baseline, threshold)
+    for _ in range(retries):
+        if not regressions:
+            break
+        times = results['benchmarks']
+        for name, before, seconds, ratio in regressions:
+            times[name] = min(seconds, measure(benchmarks[name], repeat, minTime))
+        regressions = compare(results, baseline, threshold)
+    return regressions
+
+
+def report(results, baseline=None):
+    """Returns a text table of the results, and how they changed since baseline."""
+    lines = []
+    for name, seconds in results['benchmarks'].items():
+        line = f'{name:<20}{seconds * 1e6:>12.3f} us'
+        if baseline is not None and baseline['benchmarks'].get(name):
+            line += f'{seconds / baseline["benchmarks"][name] - 1:>+9.1%}'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the hot paths of the game.')
+    parser.add_argument('names', nargs='*', help='benchmarks to run (default: all)')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with the results in this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fail if a benchmark is this much slower than the baseline (default: 0.25)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help=f'repeats per benchmark, at least {baselineRepeat} with --baseline (default: 5)')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help=f'seconds per repeat, at least {baselineMinTime} with --baseline (default: 0.2)')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='times to measure a benchmark that looks slower than the baseline again (default: 2)')
+    options = parser.parse_args(argv)
+    for name in options.names:
+        if name not in benchmarks:
+            parser.error(f'unknown benchmark {name}; choose from {", ".join(benchmarks)}')
+
+    repeat, minTime = options.repeat, options.min_time
+    baseline = None
+    if options.baseline:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+        repeat, minTime = max(repeat, baselineRepeat), max(minTime, baselineMinTime)
+    results = run(options.names or None, repeat, minTime)
+    regressions = []
+    if baseline is not None:
+        regressions = confirm(results, baseline, options.threshold, repeat, minTime, options.retries)
+    print(report(results, baseline))
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(results, file, indent=1)
+    for name, before, now, ratio in regressions:
+        print(f'REGRESSION {name}: {before * 1e6:.3f} us -> {now * 1e6:.3f} us ({ratio:.2f}x)')
+    if regressions:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,4 @@
+from collections import namedtuple
 from errors import RuleError
 
 
@@ -71,63 +72,55 @@ class Card(object):
     #   if you ask for information about a card that is not showing, a RulesError exception
     #   will be raised.
     #
+    # A card is only its shared face (see the card pool below) and which
+    # way up it is. Slots keep that to two pointers, with no __dict__, which
+    # matters when a simulation keeps millions of cards around.
+    #
+    # _face is the engine's way in. Hand, Dealer and the simulators read
+    # card._face.hardValue, .isAce, .code and so on directly, without the
+    # is_showing() check and property call that the public properties
+    # make on every access. Only use it where the card is known to be face
+    # up, or the game already knows it; players go through the properties.
+    #
+    __slots__ = ('_face', '__isShowing')
 
     def __init__(self, name, suit):
         #
-        # Check that the name is a legal name.
-        #
-        if name.lower() in Card.names:
-            self.__name = name.lower()
-            self.__shortName = Card.shortNameDict[self.__name]
-        #
-        # Or that name is a legal short name, just in case.
-        #
-        elif name.upper() in Card.shortNames:
-            name = Card.names[Card.shortNames.index(name.upper())]
-            self.__name = name.lower()
-            self.__shortName = Card.shortNameDict[self.__name]
-        else:
-            raise TypeError(name + ' is not a valid card name.')
-        #
-        # Check that the suit is legal
+        # Look the card up by name (or short name, just in case) and suit.
+        # Everything else about the card comes from its face in the pool.
         #
-        if suit.lower() in Card.suits:
-            self.__suit = suit.lower()
-        else:
+        try:
+            code = Card.codeDict[name.lower(), suit.lower()]
+        except KeyError:
+            if name.lower() not in Card.nameCodeDict:
+                raise TypeError(name + ' is not a valid card name.')
             raise TypeError(suit + ' is not a valid card suit.')
-        #
-        # Check if it is a facecard
-        #
-        if self.__name in ['jack', 'queen', 'king']:
-            self.__isFacecard = True
-        else:
-            self.__isFacecard = False
-        #
-        # Check if it is an ace
-        #
-        if self.__name == 'ace':
-            self.__isAce = True
-        else:
-            self.__isAce = False
-        #
-        # A few more settings
-        #
+        self._face = Card.faces[code]
         self.__isShowing = False
-        self.__rank = Card.rankDict[self.__name]
-        self.__hardValue = Card.hardValueDict[self.__name]
-        self.__softValue = Card.softValueDict[self.__name]
+
+    @classmethod
+    def from_code(cls, code):
+        """
+        Returns a new face-down card for a card code (0-51). This skips the
+        name checks in __init__, so it is the fast way to make cards.
+        """
+        card = object.__new__(cls)
+        card._face = Card.faces[code]
+        card.__isShowing = False
+        return card
 
     def __str__(self):
-        if Card.useUnicode:
-            string = f'{self.__shortName}{Card.unicodeDict[self.__suit]}'
-        else:
-            string = f'{self.__name.capitalize()} of {self.__suit.capitalize()}'
+        face = self._face
         if not self.__isShowing and not Card.debugMode:
             string = '[face down]'
+        elif Card.useUnicode:
+            string = f'{face.shortName}{Card.unicodeDict[face.suit]}'
+        else:
+            string = f'{face.name.capitalize()} of {face.suit.capitalize()}'
         return string
 
     def __repr__(self):
-        return f"Card('{self.__name}','{self.__suit}')"
+        return f"Card('{self._face.name}','{self._face.suit}')"
 
     def __eq__(self, other):
         #
@@ -136,7 +129,7 @@ class Card(object):
         return self.same_rank(other) and self.same_suit(other)
 
     def __lt__(self,other):
-        return self.__rank < other.__rank
+        return self._face.rank < other._face.rank
 
     def flip(self):
         """Flips the card over from 'showing' to 'not showing' or visa versa."""
@@ -163,44 +156,50 @@ class Card(object):
         """Returns True if the card is a facecard."""
         if not self.is_showing():
             raise RuleError('card is not showing, you can not use is_face_card()')
-        return self.__isFacecard
+        return self._face.isFacecard
 
     def get_is_ace(self):
         """Returns True if the card is an ace."""
         if not self.is_showing():
             raise RuleError('card is not showing, you can not use is_ace()')
-        return self.__isAce
+        return self._face.isAce
 
 
     def get_hard_value(self):
         """Returns the hard value of the card."""
         if not self.is_showing():
             raise RuleError('card is not showing, you can not use hard_value()')
-        return self.__hardValue
+        return self._face.hardValue
 
     def get_soft_value(self):
         """Returns the soft value of the card."""
         if not self.is_showing():
             raise RuleError('card is not showing, you can not use hard_value()')
-        return self.__softValue
+        return self._face.softValue
 
     def get_suit(self):
         """Returns the suit of the card."""
         if not self.is_showing():
             raise RuleError('card is not showing, you can not use suit()')
-        return self.__suit
+        return self._face.suit
 
     def get_name(self):
         """Returns the name of the card."""
         if not self.is_showing():
             raise RuleError('card is not showing, you can not use name()')
-        return self.__name
+        return self._face.name
+
+    def get_code(self):
+        """Returns the card code: rank index * 4 + suit index (0-51)."""
+        if not self.is_showing():
+            raise RuleError('card is not showing, you can not use code()')
+        return self._face.code
 
     def get_rank(self):
         """Returns the rank of the card."""
         if not self.is_showing():
             raise RuleError('card is not showing, you can not use rank()')
-        return self.__rank
+        return self._face.rank
 
     isFacecard = property(get_is_facecard)
     isAce = property(get_is_ace)
@@ -209,6 +208,38 @@ class Card(object):
     suit = property(get_suit)
     name = property(get_name)
     rank = property(get_rank)
+    code = property(get_code)
+
+
+#
+# The card pool. Each of the 52 cards has an immutable face that every Card
+# object for that card shares, so making a card is a lookup instead of a
+# round of validation. A card's code is its index in Card.names times 4 plus
+# its index in Card.suits: the ace of clubs is 0 and the king of diamonds
+# is 51.
+#
+CardFace = namedtuple('CardFace', 'code name shortName suit rank hardValue softValue isAce isFacecard')
+
+Card.faces = tuple(CardFace(code=nameIndex * 4 + suitIndex,
+                            name=name,
+                            shortName=Card.shortNames[nameIndex],
+                            suit=suit,
+                            rank=Card.ranks[nameIndex],
+                            hardValue=Card.hardValues[nameIndex],
+                            softValue=Card.softValues[nameIndex],
+                            isAce=name == 'ace',
+                            isFacecard=name in ['jack', 'queen', 'king'])
+                   for nameIndex, name in enumerate(Card.names)
+                   for suitIndex, suit in enumerate(Card.suits))
+
+Card.nameCodeDict = {}
+for _nameIndex, _name in enumerate(Card.names):
+    Card.nameCodeDict[_name] = _nameIndex * 4
+    Card.nameCodeDict[Card.shortNames[_nameIndex].lower()] = _nameIndex * 4
+Card.codeDict = {(_name, _suit): _code + _suitIndex
+                 for _name, _code in Card.nameCodeDict.items()
+                 for _suitIndex, _suit in enumerate(Card.suits)}
+del _nameIndex, _name
 
 
 import unittest
@@ -243,6 +274,36 @@ class CardTester(unittest.TestCase):
             c.softValue
             c.hardValue
 
+    def test_codes(self):
+        c = Card('queen', 'hearts')
+        c.flip()
+        self.assertEqual(c.code, 11 * 4 + 2)
+        self.assertEqual(Card('Q', 'Hearts').flip().code, c.code)
+        self.assertEqual(Card.from_code(0).flip().code, Card('ace', 'clubs').flip().code)
+        for code in range(52):
+            card = Card.from_code(code)
+            self.assertFalse(card.is_showing())
+            card.flip()
+            self.assertEqual(card.code, code)
+            self.assertEqual(Card(card.name, card.suit).flip().code, code)
+        with self.assertRaises(TypeError):
+            Card('eleven', 'hearts')
+        with self.assertRaises(TypeError):
+            Card('ace', 'stars')
+
+    def test_shared_faces(self):
+        c1 = Card('ace', 'spades')
+        c2 = Card.from_code(c1.flip().code)
+        self.assertIs(c1._face, c2._face)
+        # Flipping one card doesn't flip the other
+        self.assertFalse(c2.is_showing())
+
+    def test_slots(self):
+        c = Card('ace', 'spades')
+        self.assertFalse(hasattr(c, '__dict__'))
+        with self.assertRaises(AttributeError):
+            c.value = 11
+
     def test_equality(self):
         c1 = Card('ace', 'spades')
         c2 = Card('ace', 'spades')
@@ -272,5 +333,7 @@ if __name__ == '__main__':
 
 class SchopskopfCard(Card):
 
+    __slots__ = ()
+
     def __eq__(self, other):
         return self.suit == other.suit and self.name == other.name
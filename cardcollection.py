@@ -1,9 +1,11 @@
 from card import Card
-from random import randrange
+from shuffler import defaultShuffler
 
 
 class CardCollection(list):
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(self)
 
@@ -20,11 +22,11 @@ class CardCollection(list):
             Card.debugMode = debugMode
         return string
 
-    def shuffle(self):
-        """Shuffles the collection in place"""
-        for pos1 in range(len(self)):
-            pos2 = randrange(len(self))
-            self[pos1], self[pos2] = self[pos2], self[pos1]
+    def shuffle(self, shuffler=None):
+        """Shuffles the collection in place. See shuffler.py for the options."""
+        if shuffler is None:
+            shuffler = defaultShuffler
+        shuffler.shuffle(self)
 
     def draw(self):
         """Returns the top card from the collection; removing it from the deck in the process."""
@@ -0,0 +1,112 @@
+from basicstrategyplayer import BasicStrategyPlayer
+from rules import defaultRules
+
+
+class CountingPlayer(BasicStrategyPlayer):
+    """
+    A basic strategy player that keeps a card count and raises its bet
+    when the count is good. Subclasses set the tags: how much each card
+    value adds to the running count, from ace (index 0) to ten (index 9).
+
+    The bet is unitBet times the betting count less one, between 1 and
+    maxUnits units. For a balanced count the betting count is the true count
+    (the running count per deck left in the shoe). The player learns how
+    many decks are in the shoe when the dealer deals them in (see
+    set_rules()); until then it assumes the default rules.
+    """
+
+    tags = (0,) * 10
+    balanced = True
+    __slots__ = ('decks', 'maxUnits', '_tagByCode', 'runningCount', 'cardsSeen')
+
+    def __init__(self, name, money=100, unitBet=10, tables=None, maxUnits=8):
+        super().__init__(name, money, unitBet, tables)
+        self.decks = defaultRules.decks
+        self.maxUnits = maxUnits
+        #
+        # One tag per card code, so counting a card is one index.
+        #
+        self._tagByCode = [type(self).tags[min(code // 4, 9)] for code in range(52)]
+        self.reset_count()
+
+    def initial_count(self):
+        """The running count at the start of a shoe."""
+        return 0
+
+    def reset_count(self):
+        self.runningCount = self.initial_count()
+        self.cardsSeen = 0
+
+    def set_rules(self, rules):
+        # The count is per deck, so it needs to know how many are in the shoe.
+        self.decks = rules.decks
+        self.reset_count()
+
+    def count(self, card):
+        self.runningCount += self._tagByCode[card.code]
+        self.cardsSeen += 1
+
+    def count_round(self, cards):
+        tagByCode = self._tagByCode
+        self.runningCount += sum([tagByCode[card.code] for card in cards])
+        self.cardsSeen += len(cards)
+
+    def get_decks_remaining(self):
+        """Decks left in the shoe, never less than a quarter of a deck."""
+        return max(self.decks - self.cardsSeen / 52, 0.25)
+
+    def get_true_count(self):
+        return self.runningCount / self.get_decks_remaining()
+
+    def betting_count(self):
+        return self.get_true_count()
+
+    def bet_or_leave(self):
+        units = int(self.betting_count()) - 1
+        if units < 1:
+            units = 1
+        elif units > self.maxUnits:
+            units = self.maxUnits
+        bet = units * self.unitBet
+        if self._chips < bet:
+            bet = self.unitBet
+        if self._chips < bet:
+            return -1
+        return bet
+
+    def insurance(self, hand, dealerShowing):
+        """Insurance pays when a third of the unseen cards are tens: roughly a true count of +3."""
+        return self.get_true_count() >= 3
+
+    decksRemaining = property(get_decks_remaining)
+    trueCount = property(get_true_count)
+
+
+class HiLoPlayer(CountingPlayer):
+    """Hi-Lo: 2-6 count +1, 7-9 count 0, tens and aces count -1."""
+    tags = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1)
+
+
+class KOPlayer(CountingPlayer):
+    """
+    Knock-Out: like Hi-Lo but the 7 counts +1 too. It is unbalanced, so it
+    starts at 4 - 4 * decks and bets off the running count with no true
+    count conversion.
+    """
+    tags = (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1)
+    balanced = False
+
+    def initial_count(self):
+        return 4 - 4 * self.decks
+
+    def betting_count(self):
+        return self.runningCount
+
+
+class OmegaIIPlayer(CountingPlayer):
+    """Omega II: a level two count that ignores aces."""
+    tags = (0, 1, 1, 2, 2, 2, 1, 0, -1, -2)
+
+    def insurance(self, hand, dealerShowing):
+        # Omega II counts tens double, so its insurance point is doubled too.
+        return self.get_true_count() >= 6
@@ -1,23 +1,67 @@
 from player import Player
 from shoe import Shoe
 from hand import Hand
+from errors import RuleError
+from rules import defaultRules
+import roundlog
+from settlement import settle, outcomeNames, BUST, LOSE, PUSH, BLACKJACK, WIN
+from events import (consoleSink, HAND_FINISHED, DEALER_REVEALS, DEALER_STANDS, PAYOUT_STARTS,
+                    PLAYER_BUSTS, PLAYER_LOSES, PLAYER_PUSHES, PLAYER_BLACKJACK, PLAYER_WINS, PLAYER_BROKE,
+                    PLAYER_SURRENDERS, PLAYER_INSURES, INSURANCE_PAYS)
 
 class Dealer(Player):
 
-    def __init__(self, name, money):
+    def __init__(self, name, money, shoe=None, sink=None, rules=None):
         super().__init__(name, money)
-        self.shoe = Shoe()
         self.players = []
+        # The house rules (see rules.py). The shoe and every hand dealt
+        # follow them too.
+        if rules is None:
+            rules = defaultRules
+        self.set_rules(rules)
+        # The dealer narrates the game to an event sink (see events.py). It
+        # prints to the console by default; simulations use a NullSink.
+        if sink is None:
+            sink = consoleSink
+        self.sink = sink
+        # Any object with draw(), should_shuffle() and shuffle() will do,
+        # e.g. an ArrayShoe for long simulations.
+        if shoe is None:
+            shoe = Shoe(rules=rules)
+        self.shoe = shoe
         # Holds bets before hands have been dealt
         # We could make this a dictionary with the player's name as the key,
         # but that assumes the player names are unique. Better solution would
         # probably be to set bets on the Player object
         self.playerBets = []
+        # Set recorder to a RoundLogWriter (see roundlog.py) to log every
+        # hand the dealer settles.
+        self.recorder = None
+        self.roundNumber = 0
 
 #region Dealer-specific methods
 
+    def set_rules(self, rules):
+        """
+        Sets the house rules for the hands the dealer deals from now on.
+        The rules are looked at once, here: the dealer's play is bound to
+        the version for hitting or standing on soft 17, and everything else
+        the game loop needs is copied to an attribute, so nothing has to
+        check the rules while a round is being played. Everyone seated is
+        told the new rules too.
+        """
+        self.rules = rules
+        self.blackjackPayout = rules.blackjackPayout
+        self._offersInsurance = rules.insurance
+        # Subclasses that play their own way keep their play().
+        if type(self).play is Dealer.play:
+            self.play = self.hit_soft_17 if rules.hitSoft17 else self.stand_on_soft_17
+        for player in self.players:
+            player.set_rules(rules)
+
     def deal_in(self, player):
-        """Add a player to the dealer's table"""
+        """Add a player to the dealer's table and tell them its rules"""
+        player.set_rules(self.rules)
         self.players.append(player)
 
     def has_players(self):
@@ -26,10 +70,11 @@ class Dealer(Player):
 
     def take_bets(self):
         """Ask all players how much they want to bet. Removes them from the table if they bet -1"""
-        for player in self.players:
-            bet = player.bet_or_leave()
-            # Add each player's bet to a list of bets
-            self.playerBets.append(bet)
+        self.accept_bets([player.bet_or_leave() for player in self.players])
+
+    def accept_bets(self, bets):
+        """Takes the players' bets, one for each player in order. A bet of -1 leaves the table."""
+        self.playerBets.extend(bets)
         # Filter out players if they bet -1
         self.players = [p for i, p in enumerate(self.players) if self.playerBets[i] != -1]
         # Remove the -1 bets from the list of bets
@@ -37,9 +82,28 @@ class Dealer(Player):
 
     def deal(self):
         """Deal out hands to the players. Assumes we've taken bets"""
-        # Shuffle the shoe if it needs it
+        self.deal_cards()
+        if self.insurance_offered():
+            self.offer_insurance()
+
+    def deal_cards(self):
+        """Deals every player with a bet, and the dealer, two cards."""
+        # Shuffle the shoe if it needs it, and tell anyone counting cards
         if (self.shoe.should_shuffle()):
             self.shoe.shuffle()
+            for player in self.players:
+                if player.countsCards:
+                    player.reset_count()
+        self.roundNumber += 1
+        if self.recorder is not None:
+            shuffler = getattr(self.shoe, 'shuffler', None)
+            shoeNumber = getattr(shuffler, 'shoeNumber', 0)
+            if shoeNumber < 0:
+                shoeNumber = roundlog.UNSHUFFLED
+            self._roundInfo = (self.roundNumber, getattr(shuffler, 'seed', 0), getattr(shuffler, 'stream', 0),
+                               shoeNumber, getattr(self.shoe, 'position', 0), getattr(self.shoe, 'decks', 0),
+                               roundlog.shuffler_kind(shuffler))
+            self._actions = {}
         
         # Deal out cards to the players
         for index, player in enumerate(self.players):
@@ -47,7 +111,7 @@ class Dealer(Player):
             # Don't deal a hand if the player bet 0
             if bet > 0:
                 player.rake_out(bet)
-                hand = Hand(bet)
+                hand = Hand(bet, self.rules)
                 for _ in range(2):
                     hand.hit(self.shoe.draw().flip())
                 player.add_hand(hand)
@@ -56,88 +120,221 @@ class Dealer(Player):
         self.playerBets = []
 
         # Deal out cards to the dealer
-        dealerHand = Hand(0)
+        dealerHand = Hand(0, self.rules)
         for _ in range(2):
             dealerHand.hit(self.shoe.draw().flip())
         # Give the dealer the hand
         self.add_hand(dealerHand)
-        
+
+    def insurance_offered(self):
+        """Returns True if the rules offer insurance and the dealer shows an ace."""
+        return self._offersInsurance and self.hands[0][-1]._face.isAce
+
+    def offer_insurance(self):
+        """
+        Offers insurance on every hand when the dealer shows an ace. It
+        costs half the hand's bet and pays 2:1 if the dealer has blackjack.
+        """
+        dealerShowing = self.hands[0][-1]
+        for player in self.players:
+            for hand in player.hands:
+                amount = hand.bet / 2
+                if player.money >= amount and player.insurance(hand, dealerShowing):
+                    self.insure(player, hand, amount)
+
+    def insure(self, player, hand, amount):
+        """Takes an insurance bet of amount from player on hand."""
+        player.rake_out(amount)
+        hand.insure(amount)
+        if self.recorder is not None:
+            self.record_action(hand, 'i', amount)
+        if self.sink.isActive:
+            self.sink.emit(PLAYER_INSURES, player, amount)
+
     def resolve_hands(self):
-        dealerHand = self.hands[0]
-        dealerShowing = dealerHand[-1]
+        dealerShowing = self.hands[0][-1]
+        apply_play = self.apply_play
         for player in self.players:
             for hand in player.hands:
                 while hand.can_hit():
                     choice, bet = player.play(hand, dealerShowing)
-                    if (choice == 's'):
-                        hand.stand()
-                    if (choice == 'h'):
-                        hand.hit(self.shoe.draw().flip())
-                    if (choice == 'd'):
-                        player.rake_out(bet)
-                        hand.double_down(self.shoe.draw().flip(), bet)
-                    if (choice == 'p'):
-                        player.rake_out(hand.bet)
-                        splitHand = Hand(hand.bet)
-                        card = hand.split()
-                        splitHand.hit(card)
-                        splitHand.hit(self.shoe.draw().flip())
-                        player.add_hand(splitHand)
-                        hand.hit(self.shoe.draw().flip())
-
-                print(f"{player.name} finishes with {hand}")
-                        
-
-        # Now that the players have played, the dealer needs to play
-        print("Let's see what the dealer has...")
-        print(f"{self.name} flips their card, showing {dealerHand}")
+                    apply_play(player, hand, choice, bet)
+                if self.sink.isActive:
+                    self.sink.emit(HAND_FINISHED, player, hand)
+        self.play_own_hand()
+
+    def apply_play(self, player, hand, choice, bet):
+        """Carries out a player's choice (see Player.play()) on one of their hands."""
+        if self.recorder is not None:
+            self.record_action(hand, choice, bet)
+        if (choice == 's'):
+            hand.stand()
+        elif (choice == 'h'):
+            hand.hit(self.shoe.draw().flip())
+        elif (choice == 'd'):
+            player.rake_out(bet)
+            hand.double_down(self.shoe.draw().flip(), bet)
+        elif (choice == 'p'):
+            player.rake_out(hand.bet)
+            card = hand.split()
+            splitHand = Hand(hand.bet, self.rules, hand)
+            splitHand.hit(card)
+            splitHand.hit(self.shoe.draw().flip())
+            player.add_hand(splitHand)
+            hand.hit(self.shoe.draw().flip())
+        elif (choice == 'u'):
+            hand.surrender()
+        else:
+            raise RuleError(f'{player.name} made an unknown play: {choice!r}')
+
+    def play_own_hand(self):
+        """Now that the players have played, the dealer plays."""
+        dealerHand = self.hands[0]
+        dealerShowing = dealerHand[-1]
+        if self.sink.isActive:
+            self.sink.emit(DEALER_REVEALS, self, dealerHand)
         while dealerHand.can_hit():
             self.play(dealerHand, dealerShowing)
-        print(f"{self.name} stands with {dealerHand}")
+        if self.sink.isActive:
+            self.sink.emit(DEALER_STANDS, self, dealerHand)
 
     def payout(self):
-        print("Time to pay out!")
+        """
+        Settles every player hand against the dealer's hand and clears the
+        table for the next round. Returns a list of (outcome, bet, net)
+        tuples, one per hand, where outcome is one of 'bust', 'lose', 'push',
+        'blackjack' or 'win' and net is the player's win (or loss) on the hand.
+        """
+        sink = self.sink
+        isActive = sink.isActive
+        if isActive:
+            sink.emit(PAYOUT_STARTS)
+        results = []
         dealerHand = self.hands[0]
-        for player in self.players:
-            for hand in player.hands:
-                # If the player busts, they lose
-                if hand.isBusted:
-                    print(f"{player.name} busts, losing ${hand.bet:,.2f}.")
-                    self.rake_in(hand.bet)
-                # If the player's hand is worth less than dealer, they lose
-                elif hand < dealerHand:
-                    print(f"{player.name} lost to the dealer, losing ${hand.bet:,.2f}.")
-                    self.rake_in(hand.bet)
-                # If the hands are equal, the player gets their bet back
-                elif hand == dealerHand:
-                    print(f"{player.name} pushed, returning their bet of ${hand.bet:,.2f}.")
-                    player.rake_in(hand.bet)
-                # if player has blackjack and dealer doesn't (checked in == case), they win
-                elif hand.isBlackJack:
-                    # Blackjack pays 3:2
-                    print(f"Blackjack! {player.name} wins ${hand.bet * 1.5:,.2f}.")
-                    player.rake_in(hand.bet + hand.bet * 1.5)
-                # If the player's hand is worth more than dealer, they win
-                elif hand > dealerHand:
-                    # Winning pays 1:1
-                    print(f"{player.name} beat the dealer, winning ${hand.bet:,.2f}.")
-                    player.rake_in(hand.bet + hand.bet)
+        self.show_cards()
+        if self.recorder is not None:
+            settled = [(seat, index, hand) for seat, player in enumerate(self.players)
+                       for index, hand in enumerate(player.hands)]
+        #
+        # Settle every hand at once. Each hand's value and status is read
+        # once here instead of in every comparison with the dealer's hand.
+        #
+        hands = [(player, hand) for player in self.players for hand in player.hands]
+        outcomes, nets = settle([hand.value() for player, hand in hands],
+                                [hand.isBlackJack for player, hand in hands],
+                                [hand.isBusted for player, hand in hands],
+                                [hand.bet for player, hand in hands],
+                                dealerHand.value(), dealerHand.isBlackJack, dealerHand.isBusted,
+                                self.blackjackPayout,
+                                [hand.isSurrendered for player, hand in hands])
+        for (player, hand), outcome, net in zip(hands, outcomes, nets):
+            bet = hand.bet
+            if outcome == BUST:
+                if isActive:
+                    sink.emit(PLAYER_BUSTS, player, bet)
+                self.rake_in(bet)
+            elif outcome == LOSE:
+                if isActive:
+                    sink.emit(PLAYER_LOSES, player, bet)
+                self.rake_in(bet)
+            # On a push the player gets their bet back
+            elif outcome == PUSH:
+                if isActive:
+                    sink.emit(PLAYER_PUSHES, player, bet)
+                player.rake_in(bet)
+            elif outcome == BLACKJACK:
+                if isActive:
+                    sink.emit(PLAYER_BLACKJACK, player, net)
+                player.rake_in(bet + net)
+            elif outcome == WIN:
+                if isActive:
+                    sink.emit(PLAYER_WINS, player, net)
+                player.rake_in(bet + net)
+            # A surrendered hand gets half its bet back
+            else:
+                if isActive:
+                    sink.emit(PLAYER_SURRENDERS, player, -net)
+                self.rake_in(-net)
+                player.rake_in(bet + net)
+            if hand.insurance:
+                insurance = hand.insurance
+                if dealerHand.isBlackJack:
+                    if isActive:
+                        sink.emit(INSURANCE_PAYS, player, 2 * insurance)
+                    player.rake_in(3 * insurance)
+                    net += 2 * insurance
                 else:
-                    raise NotImplementedError(f'Unchecked condition in payout. Player hand: {hand} Dealer: {dealerHand}.')
+                    self.rake_in(insurance)
+                    net -= insurance
+            results.append((outcomeNames[outcome], bet, net))
+        for player in self.players:
             player._hands = []
-            self._hands = []
+        if self.recorder is not None:
+            self.record_round(settled, results, dealerHand)
+        # The dealer's hand is cleared even if nobody was dealt in.
+        self._hands = []
 
         # Remove players that run out of money
-        for player in self.players:
-            if player.money <= 0:
-                print(f"{player.name} is out of cash. Thanks for playing!")
+        if isActive:
+            for player in self.players:
+                if player.money <= 0:
+                    sink.emit(PLAYER_BROKE, player)
         self.players = [p for p in self.players if p.money > 0]
+        return results
+
+    def show_cards(self):
+        """
+        Shows every card played this round to the players that count cards,
+        with one count_round() call each.
+        """
+        cards = None
+        for player in self.players:
+            if player.countsCards:
+                if cards is None:
+                    cards = [card for hand in self.hands for card in hand]
+                    for p in self.players:
+                        for hand in p.hands:
+                            cards.extend(hand)
+                player.count_round(cards)
+
+    def record_action(self, hand, choice, bet):
+        """Remembers a player's choice on a hand for the round log."""
+        actions, doubleBet = self._actions.get(id(hand), ('', 0.0))
+        if choice == 'd':
+            doubleBet += bet
+        self._actions[id(hand)] = (actions + choice, doubleBet)
+
+    def record_round(self, settled, results, dealerHand):
+        """Writes every hand of the round, and then the dealer's, to the recorder."""
+        write_hand = self.recorder.write_hand
+        roundInfo = self._roundInfo
+        for (seat, index, hand), (outcome, bet, net) in zip(settled, results):
+            actions, doubleBet = self._actions.get(id(hand), ('', 0.0))
+            write_hand(roundInfo, seat, index, [card._face.code for card in hand], actions,
+                       bet, doubleBet, net, roundlog.outcomes.index(outcome))
+        write_hand(roundInfo, roundlog.DEALER_SEAT, 0, [card._face.code for card in dealerHand], '',
+                   0.0, 0.0, 0.0, roundlog.DEALER_SEAT)
 
 #endregion
 
     def play(self, hand, dealerShowing):
-        # Dealer hits on soft 17
-        if (hand.hard_value() >= 17):
+        # set_rules() binds one of the two below in place of this.
+        if self.rules.hitSoft17:
+            self.hit_soft_17(hand, dealerShowing)
+        else:
+            self.stand_on_soft_17(hand, dealerShowing)
+
+    def hit_soft_17(self, hand, dealerShowing):
+        # Dealer hits on soft 17 and stands on everything else from 17 up
+        value = hand.value()
+        if value > 17 or (value == 17 and not hand.is_soft()):
+            hand.stand()
+        else:
+            hand.hit(self.shoe.draw().flip())
+
+    def stand_on_soft_17(self, hand, dealerShowing):
+        # Dealer stands on everything from 17 up
+        if hand.value() >= 17:
             hand.stand()
         else:
             hand.hit(self.shoe.draw().flip())
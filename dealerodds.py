@@ -0,0 +1,131 @@
+from functools import lru_cache
+
+#
+# Probabilities of how the dealer's hand finishes, in this order. A
+# blackjack is kept apart from other 21s because it beats them.
+#
+outcomes = (17, 18, 19, 20, 21, 'blackjack', 'bust')
+BLACKJACK = 5
+BUST = 6
+
+#
+# A shoe composition is a tuple of 10 counts: how many cards of each value
+# are left, from aces (index 0) through ten-valued cards (index 9).
+#
+def value_index(code):
+    """Returns the composition index (0-9) of a card code."""
+    return min(code // 4, 9)
+
+
+def composition_of(codes):
+    """Returns the composition of a collection of card codes."""
+    counts = [0] * 10
+    for code in codes:
+        counts[min(code // 4, 9)] += 1
+    return tuple(counts)
+
+
+def full_composition(decks=6):
+    """Returns the composition of a complete shoe."""
+    return (4 * decks,) * 9 + (16 * decks,)
+
+
+def remove_card(composition, valueIndex):
+    """Returns the composition with one card of the given value taken out."""
+    if composition[valueIndex] < 1:
+        raise ValueError(f'No cards of value {valueIndex + 1} left in {composition}.')
+    return composition[:valueIndex] + (composition[valueIndex] - 1,) + composition[valueIndex + 1:]
+
+
+def dealer_probabilities(upCard, composition=None, hitSoft17=True):
+    """
+    Returns the probabilities of each of the dealer's final outcomes (see
+    outcomes above) when the dealer shows upCard, a card value from 1 (ace)
+    to 10. composition is what is left in the shoe, with the up card (and
+    any other cards that have been seen) already taken out. Leave it out to
+    look the answer up in the infinite-deck table instead.
+    """
+    if composition is None:
+        return infiniteDeckTable[hitSoft17][upCard]
+    return _finish(tuple(composition), upCard, upCard == 1, 1, hitSoft17)
+
+
+def clear_cache():
+    """Forgets every composition worked out so far."""
+    _finish.cache_clear()
+
+
+def _stop(hard, hasAce, cards, hitSoft17):
+    """
+    Returns the outcome index if the dealer's hand is finished, or None if
+    the dealer has to hit. Mirrors Dealer.play().
+    """
+    soft = hasAce and hard <= 11
+    value = hard + 10 if soft else hard
+    if value > 21:
+        return BUST
+    if value == 21 and cards == 2:
+        return BLACKJACK
+    if value > 17 or (value == 17 and not (soft and hitSoft17)):
+        return value - 17
+    return None
+
+
+@lru_cache(maxsize=None)
+def _finish(composition, hard, hasAce, cards, hitSoft17):
+    """
+    Probabilities of each outcome for a dealer hand with the given hard
+    total that is still drawing from composition. cards only needs to
+    count to 3: after that the hand can no longer be a blackjack.
+    """
+    probabilities = [0.0] * 7
+    total = sum(composition)
+    nextCards = min(cards + 1, 3)
+    for index, count in enumerate(composition):
+        if not count:
+            continue
+        chance = count / total
+        newHard = hard + index + 1
+        newHasAce = hasAce or index == 0
+        stop = _stop(newHard, newHasAce, nextCards, hitSoft17)
+        if stop is None:
+            subProbabilities = _finish(remove_card(composition, index), newHard, newHasAce, nextCards, hitSoft17)
+            for outcome in range(7):
+                probabilities[outcome] += chance * subProbabilities[outcome]
+        else:
+            probabilities[stop] += chance
+    return tuple(probabilities)
+
+
+def _infinite_deck(upCard, hitSoft17):
+    """Works out one row of the infinite-deck table."""
+    drawChances = [1 / 13] * 9 + [4 / 13]
+    memo = {}
+
+    def finish(hard, hasAce, cards):
+        key = (hard, hasAce, cards)
+        if key not in memo:
+            probabilities = [0.0] * 7
+            for index, chance in enumerate(drawChances):
+                newHard = hard + index + 1
+                newHasAce = hasAce or index == 0
+                nextCards = min(cards + 1, 3)
+                stop = _stop(newHard, newHasAce, nextCards, hitSoft17)
+                if stop is None:
+                    for outcome, probability in enumerate(finish(newHard, newHasAce, nextCards)):
+                        probabilities[outcome] += chance * probability
+                else:
+                    probabilities[stop] += chance
+            memo[key] = tuple(probabilities)
+        return memo[key]
+
+    return finish(upCard, upCard == 1, 1)
+
+
+#
+# infiniteDeckTable[hitSoft17][upCard] is the outcome probabilities for each
+# up card (1-10) when every card is equally likely to come next, as it is in
+# an infinite number of decks. It takes a few milliseconds to build.
+#
+infiniteDeckTable = {hitSoft17: {upCard: _infinite_deck(upCard, hitSoft17) for upCard in range(1, 11)}
+                     for hitSoft17 in (True, False)}
@@ -1,24 +1,33 @@
 from card import Card
 from cardcollection import CardCollection
+from errors import ScenarioError
+from scenarios import read_scenarios
 
 
 class Deck(CardCollection):
 
+    #
+    # Card codes in the order a new deck comes out of the box: all the clubs
+    # from ace to king, then the spades, hearts and diamonds.
+    #
+    codes = tuple(nameIndex * 4 + suitIndex
+                  for suitIndex in range(len(Card.suits))
+                  for nameIndex in range(len(Card.names)))
+
     def __init__(self):
         super().__init__()
-        for suit in Card.suits:
-            for name in Card.names:
-                card = Card(name, suit)
-                self.append(card)
+        self.extend(map(Card.from_code, Deck.codes))
 
     def stack(self, deckFile='stacked-deck.txt'):
-        """Stack the deck. Also useful for testing."""
+        """
+        Stack the deck with the first scenario in a scenario file (see
+        scenarios.py). Also useful for testing.
+        """
+        shoes = read_scenarios(deckFile, decks=1)
+        if not shoes:
+            raise ScenarioError('No cards to stack the deck with.', deckFile)
         self.clear()
-        with open(deckFile,'r') as file:
-            for line in file:
-                value, suit = line.split(" of ")
-                card = Card(value, suit.strip())
-                self.append(card)
+        self.extend(map(Card.from_code, shoes[0]))
 
 
 import unittest
@@ -4,3 +4,35 @@ class RuleError(Exception):
        raised, the program should catch the error and take action. It would be bad
        for the user to see a RuleError."""
     pass
+
+
+class ScenarioError(ValueError):
+    """ScenarioErrors are raised when a stacked shoe scenario can't be read or
+       isn't a legal shoe. source and line say where the problem is, when that
+       is known."""
+
+    def __init__(self, message, source=None, line=None):
+        if source is not None and line is not None:
+            message = f'{source}, line {line}: {message}'
+        elif source is not None:
+            message = f'{source}: {message}'
+        super().__init__(message)
+        self.source = source
+        self.line = line
+
+
+class ParseError(ValueError):
+    """ParseErrors describe input that isn't what was asked for. The toolbox
+       parse_ procedures return them instead of raising them, so a whole
+       column of input can be checked without stopping at the first bad
+       entry. text is what was entered, reason why it was rejected and
+       index, for a column, which entry it was."""
+
+    def __init__(self, text, reason, index=None):
+        message = f'{text!r} {reason}'
+        if index is not None:
+            message = f'entry {index}: {message}'
+        super().__init__(message)
+        self.text = text
+        self.reason = reason
+        self.index = index
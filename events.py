@@ -0,0 +1,156 @@
+import struct
+
+#
+# Everything the dealer (and a verbose hand) has to say about the game goes
+# to an event sink as an event code and the objects involved. Turning that
+# into text (or anything else) is up to the sink, so nothing is formatted
+# unless a sink wants it. Callers check sink.isActive first, which makes a
+# NullSink free.
+#
+HAND_FINISHED = 1       # player, hand
+DEALER_REVEALS = 2      # dealer, hand
+DEALER_STANDS = 3       # dealer, hand
+PAYOUT_STARTS = 4       # (nothing)
+PLAYER_BUSTS = 5        # player, bet
+PLAYER_LOSES = 6        # player, bet
+PLAYER_PUSHES = 7       # player, bet
+PLAYER_BLACKJACK = 8    # player, winnings
+PLAYER_WINS = 9         # player, winnings
+PLAYER_BROKE = 10       # player
+HAND_HIT = 11           # hand, card
+HAND_STANDS = 12        # hand
+HAND_SPLITS = 13        # hand
+HAND_DOUBLES = 14       # hand, card
+HAND_BLACKJACK = 15     # hand
+HAND_BUSTED = 16        # hand
+HAND_21 = 17            # hand
+PLAYER_SURRENDERS = 18  # player, amount lost
+PLAYER_INSURES = 19     # player, insurance bet
+INSURANCE_PAYS = 20     # player, winnings
+
+
+class EventSink(object):
+    """
+    The interface for event sinks. This one ignores everything, so it is
+    also the no-op sink.
+    """
+
+    isActive = False
+
+    def emit(self, event, *args):
+        """Receives one event and the objects it is about."""
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+NullSink = EventSink
+nullSink = NullSink()
+
+
+class ConsoleSink(EventSink):
+    """Prints the game the way the dealer always has."""
+
+    isActive = True
+
+    messages = {
+        HAND_FINISHED: lambda player, hand: f"{player.name} finishes with {hand}",
+        DEALER_REVEALS: lambda dealer, hand: f"Let's see what the dealer has...\n{dealer.name} flips their card, showing {hand}",
+        DEALER_STANDS: lambda dealer, hand: f"{dealer.name} stands with {hand}",
+        PAYOUT_STARTS: lambda: "Time to pay out!",
+        PLAYER_BUSTS: lambda player, bet: f"{player.name} busts, losing ${bet:,.2f}.",
+        PLAYER_LOSES: lambda player, bet: f"{player.name} lost to the dealer, losing ${bet:,.2f}.",
+        PLAYER_PUSHES: lambda player, bet: f"{player.name} pushed, returning their bet of ${bet:,.2f}.",
+        PLAYER_BLACKJACK: lambda player, winnings: f"Blackjack! {player.name} wins ${winnings:,.2f}.",
+        PLAYER_WINS: lambda player, winnings: f"{player.name} beat the dealer, winning ${winnings:,.2f}.",
+        PLAYER_BROKE: lambda player: f"{player.name} is out of cash. Thanks for playing!",
+        HAND_HIT: lambda hand, card: "  hit and received: " + str(card),
+        HAND_STANDS: lambda hand: "  standing with: " + str(hand),
+        HAND_SPLITS: lambda hand: "  splitting hand",
+        HAND_DOUBLES: lambda hand, card: "  doubled down and received: " + str(card),
+        HAND_BLACKJACK: lambda hand: "  Black Jack! Hand over.",
+        HAND_BUSTED: lambda hand: "  %s: busted! Hand over." % hand.value(),
+        HAND_21: lambda hand: f"  {hand.value()}: I'm stanging.",
+        PLAYER_SURRENDERS: lambda player, amount: f"{player.name} surrendered, losing ${amount:,.2f}.",
+        PLAYER_INSURES: lambda player, amount: f"{player.name} buys ${amount:,.2f} of insurance.",
+        INSURANCE_PAYS: lambda player, winnings: f"Insurance pays! {player.name} wins ${winnings:,.2f}.",
+    }
+
+    def emit(self, event, *args):
+        print(ConsoleSink.messages[event](*args))
+
+
+consoleSink = ConsoleSink()
+
+
+class BinarySink(EventSink):
+    """
+    Writes each event as a fixed 12-byte record to a binary file, buffering
+    them in memory and writing bufferSize bytes at a time. A record is:
+
+        event   uint8    the event code
+        seat    uint8    the player's seat, in the order players were first
+                         seen (see seats); 255 for hand events, so a log
+                         has room for 255 players
+        value   int16    the card code for HAND_HIT and HAND_DOUBLES, the
+                         value of the hand for other hand events, else -1
+        amount  float64  the bet or winnings, else 0
+    """
+
+    isActive = True
+    record = struct.Struct('<BBhd')
+
+    def __init__(self, file, bufferSize=65536):
+        self.file = file
+        self.bufferSize = bufferSize
+        self._buffer = bytearray()
+        # The names of the players in the order they were first seen; their index is their seat.
+        self.seats = []
+        #
+        # Seats by player. Keeping the players (rather than their id()s) means
+        # a new player can't be given the seat of one that has gone.
+        #
+        self._seatNumbers = {}
+
+    def emit(self, event, *args):
+        seat = 255
+        value = -1
+        amount = 0.0
+        if HAND_HIT <= event <= HAND_21:
+            hand = args[0]
+            if event == HAND_HIT or event == HAND_DOUBLES:
+                value = args[1].code
+            else:
+                value = hand.value()
+        elif args:
+            player = args[0]
+            seat = self._seatNumbers.get(player)
+            if seat is None:
+                seat = len(self.seats)
+                if seat == 255:
+                    raise ValueError('A binary event log has room for 255 players, and they have all been seen.')
+                self._seatNumbers[player] = seat
+                self.seats.append(player.name)
+            if len(args) > 1:
+                if PLAYER_BUSTS <= event <= PLAYER_WINS or event >= PLAYER_SURRENDERS:
+                    amount = args[1]
+                else:
+                    value = args[1].value()
+        self._buffer += BinarySink.record.pack(event, seat, value, amount)
+        if len(self._buffer) >= self.bufferSize:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.file.write(self._buffer)
+            self._buffer = bytearray()
+        self.file.flush()
+
+
+def read_binary_events(data):
+    """Returns the (event, seat, value, amount) tuples in BinarySink output."""
+    return list(BinarySink.record.iter_unpack(data))
@@ -0,0 +1,239 @@
+from dealerodds import dealer_probabilities, remove_card, value_index, BLACKJACK, BUST
+from rules import defaultRules
+
+
+class ExpectedValue(object):
+    """
+    Works out the expected value of each legal play for a hand, given the
+    dealer's up card and what is left in the shoe. The engine plays by a
+    RuleSet (see rules.py), the way Hand and Dealer enforce it:
+
+      - any two-card 21 is a blackjack, even after a split, and pays
+        blackjackPayout unless the dealer also has one;
+      - the dealer doesn't peek, so a dealer blackjack takes every other
+        hand at its full (doubled or split) stake;
+      - you can double whenever you can hit, for one more card, but only
+        on a split hand if doubleAfterSplit is set;
+      - a pair of the same rank can be split, up to splitLimit times in
+        all, or as long as there are cards of that rank left if there is
+        no limit;
+      - where the rules allow it, surrender gives up half the bet unless
+        the dealer has blackjack, which takes all of it;
+      - the dealer hits soft 17 unless hitSoft17 is False.
+
+    action_evs() takes the rules from the hand it is given, and starts
+    over if they aren't the ones it has been using.
+
+    EVs are in units of the hand's current bet. Everything is memoized on
+    the shoe composition (see dealerodds.py), so once a shoe has been seen
+    most decisions are a few dictionary lookups.
+
+    To keep a decision down to milliseconds the tree is pruned: only the
+    first exactDepth cards drawn after the decision are taken out of the
+    composition; after that the composition is held fixed. From a six-deck
+    shoe that moves the EVs by well under 0.1% and lets the rest of the
+    tree be shared. Set exactDepth to None
+    for the fully exact (and much slower) answer.
+
+    Splits use the usual approximation: both hands are played as if the
+    other didn't exist, from the composition at the time of the split, and
+    a ten-valued card is taken to match a ten-valued pair one time in four.
+    """
+
+    def __init__(self, rules=None, exactDepth=1):
+        if exactDepth is None:
+            exactDepth = 21
+        self.exactDepth = exactDepth
+        self._standMemo = {}
+        self._playMemo = {}
+        self._splitMemo = {}
+        if rules is None:
+            rules = defaultRules
+        self.set_rules(rules)
+
+    def set_rules(self, rules):
+        """Plays by rules from now on. What was worked out under the old ones is forgotten."""
+        self.rules = rules
+        self.hitSoft17 = rules.hitSoft17
+        self.blackjackPayout = rules.blackjackPayout
+        self.clear()
+
+    def clear(self):
+        """Forgets everything worked out so far. Call this between shoes."""
+        self._standMemo.clear()
+        self._playMemo.clear()
+        self._splitMemo.clear()
+
+    def action_evs(self, hand, dealerShowing, composition):
+        """
+        Returns a dictionary of the expected value of each legal play for
+        hand, keyed by the choices Player.play() returns: 's', 'h', 'd', 'p'
+        and 'u'. dealerShowing is the dealer's up card and composition is
+        the unseen cards (the shoe plus the dealer's hole card).
+        """
+        if hand.rules != self.rules:
+            self.set_rules(hand.rules)
+        upCard = dealerShowing.hardValue
+        hard = hand.hard_value()
+        soft = hand.is_soft()
+        cards = min(len(hand), 3)
+        evs = {'s': self.stand(hard, soft, cards, upCard, composition)}
+        if not hand.can_hit():
+            return evs
+        # Whether the hand can still double after it has taken another card.
+        canDouble = self.rules.doubleAfterSplit or not hand.isSplit
+        evs['h'] = self.hit(hard, soft, cards, upCard, composition, self.exactDepth, canDouble)
+        if hand.can_double():
+            evs['d'] = self.double(hard, soft, cards, upCard, composition, self.exactDepth)
+        if hand.can_split():
+            pairIndex = value_index(hand[0].code)
+            splitsLeft = self.splits_left(pairIndex, composition, hand.splits)
+            evs['p'] = self.split(pairIndex, upCard, composition, splitsLeft, self.exactDepth)
+        if hand.can_surrender():
+            dealerBlackjack = dealer_probabilities(upCard, composition, self.hitSoft17)[BLACKJACK]
+            evs['u'] = -0.5 - 0.5 * dealerBlackjack
+        return evs
+
+    def splits_left(self, pairIndex, composition, splitsMade=0):
+        """
+        How many more times the hands can be split after splitting a pair
+        now, when they have been split splitsMade times already.
+        """
+        splitLimit = self.rules.splitLimit
+        if splitLimit is None:
+            # No limit but the cards left to make another pair.
+            return composition[pairIndex]
+        return splitLimit - splitsMade - 1
+
+    def best_action(self, hand, dealerShowing, composition):
+        """Returns the play with the highest EV and its EV."""
+        evs = self.action_evs(hand, dealerShowing, composition)
+        choice = max(evs, key=evs.get)
+        return choice, evs[choice]
+
+    def stand(self, hard, soft, cards, upCard, composition):
+        """EV of standing on a hand."""
+        key = (hard, soft, cards, upCard, composition)
+        ev = self._standMemo.get(key)
+        if ev is None:
+            value = hard + 10 if soft else hard
+            if value > 21:
+                return -1.0
+            dealer = dealer_probabilities(upCard, composition, self.hitSoft17)
+            if value == 21 and cards == 2:
+                ev = self.blackjackPayout * (1 - dealer[BLACKJACK])
+            else:
+                #
+                # dealer[0:5] are the chances of the dealer finishing on
+                # 17-21: the player wins on anything lower, pushes on a tie.
+                #
+                ev = dealer[BUST] - dealer[BLACKJACK]
+                for dealerValue, chance in enumerate(dealer[:5], 17):
+                    if value > dealerValue:
+                        ev += chance
+                    elif value < dealerValue:
+                        ev -= chance
+            self._standMemo[key] = ev
+        return ev
+
+    def hit(self, hard, soft, cards, upCard, composition, depthLeft, canDouble=True):
+        """
+        EV of taking one card and then playing on as well as possible.
+        depthLeft is how many more cards to take out of the composition, and
+        canDouble says whether the hand may double after this card.
+        """
+        total = sum(composition)
+        nextCards = min(cards + 1, 3)
+        ev = 0.0
+        for index, count in enumerate(composition):
+            if count:
+                newHard = hard + index + 1
+                newSoft = (soft or index == 0) and newHard <= 11
+                if depthLeft:
+                    ev += count / total * self.play(newHard, newSoft, nextCards, upCard, remove_card(composition, index),
+                                                    depthLeft - 1, canDouble)
+                else:
+                    ev += count / total * self.play(newHard, newSoft, nextCards, upCard, composition, 0, canDouble)
+        return ev
+
+    def double(self, hard, soft, cards, upCard, composition, depthLeft):
+        """EV of doubling the bet for exactly one more card."""
+        total = sum(composition)
+        nextCards = min(cards + 1, 3)
+        ev = 0.0
+        for index, count in enumerate(composition):
+            if count:
+                newHard = hard + index + 1
+                newSoft = (soft or index == 0) and newHard <= 11
+                if depthLeft:
+                    ev += count / total * self.stand(newHard, newSoft, nextCards, upCard, remove_card(composition, index))
+                else:
+                    ev += count / total * self.stand(newHard, newSoft, nextCards, upCard, composition)
+        return 2 * ev
+
+    def play(self, hard, soft, cards, upCard, composition, depthLeft, canDouble=True):
+        """
+        EV of a hand that has just been dealt a card, played as well as
+        possible from here on (without splitting), doubling only if canDouble.
+        """
+        key = (hard, soft, cards, upCard, composition, depthLeft, canDouble)
+        ev = self._playMemo.get(key)
+        if ev is None:
+            value = hard + 10 if soft else hard
+            if value >= 21:
+                # Busted, blackjack or 21: the hand is over.
+                ev = self.stand(hard, soft, cards, upCard, composition)
+            elif cards == 1:
+                # Half of a split waiting for its second card.
+                ev = self.hit(hard, soft, cards, upCard, composition, depthLeft, canDouble)
+            else:
+                ev = max(self.stand(hard, soft, cards, upCard, composition),
+                         self.hit(hard, soft, cards, upCard, composition, depthLeft, canDouble))
+                if canDouble:
+                    ev = max(ev, self.double(hard, soft, cards, upCard, composition, depthLeft))
+            self._playMemo[key] = ev
+        return ev
+
+    def split(self, pairIndex, upCard, composition, splitsLeft, depthLeft):
+        """
+        EV of splitting a pair (both cards have value index pairIndex),
+        per unit of the original bet: two hands, each starting with one of
+        the pair.
+        """
+        return 2 * self._split_hand(pairIndex, upCard, composition, splitsLeft, depthLeft)
+
+    def _split_hand(self, pairIndex, upCard, composition, splitsLeft, depthLeft):
+        """EV of one hand of a split, which may be split again."""
+        key = (pairIndex, upCard, composition, splitsLeft, depthLeft)
+        ev = self._splitMemo.get(key)
+        if ev is None:
+            hard = pairIndex + 1
+            soft = pairIndex == 0
+            total = sum(composition)
+            ev = 0.0
+            for index, count in enumerate(composition):
+                if not count:
+                    continue
+                if depthLeft:
+                    remaining = remove_card(composition, index)
+                else:
+                    remaining = composition
+                newHard = hard + index + 1
+                newSoft = (soft or index == 0) and newHard <= 11
+                playEV = self.play(newHard, newSoft, 2, upCard, remaining, max(depthLeft - 1, 0),
+                                   self.rules.doubleAfterSplit)
+                chance = count / total
+                if index == pairIndex and splitsLeft > 0:
+                    #
+                    # The same rank again: split once more if that's better.
+                    # Only a quarter of ten-valued cards match a ten-valued pair.
+                    #
+                    splitEV = max(playEV, self.split(pairIndex, upCard, remaining, splitsLeft - 1, max(depthLeft - 1, 0)))
+                    if index == 9:
+                        ev += chance * (splitEV / 4 + playEV * 3 / 4)
+                    else:
+                        ev += chance * splitEV
+                else:
+                    ev += chance * playEV
+            self._splitMemo[key] = ev
+        return ev
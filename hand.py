@@ -1,18 +1,52 @@
 from errors import RuleError
 from cardcollection import CardCollection
+from rules import defaultRules
+from events import consoleSink, HAND_HIT, HAND_STANDS, HAND_SPLITS, HAND_DOUBLES, HAND_BLACKJACK, HAND_BUSTED, HAND_21
 
 
 class Hand(CardCollection):
 
-    def __init__(self, bet):
+    # Where a verbose hand narrates its play. See events.py.
+    sink = consoleSink
+    #
+    # A simulation makes a hand for every bet, so its bookkeeping lives in
+    # slots instead of a __dict__. The __dict__ slot is still there for the
+    # odd attribute set from outside (a sink, or a mock in the tests); it
+    # costs nothing until something is put in it.
+    #
+    __slots__ = ('isVerbose', '_bet', '_insurance', '_isBlackJack', '_isBusted', '_isStanding', '_isSplit',
+                 '_isDoubled', '_isSurrendered', '_splits', '_rules', '_hardValue', '_aces', '__dict__')
+
+    def __init__(self, bet, rules=None, splitFrom=None):
+        """
+        splitFrom is the hand this one was split off, if it was. The two
+        hands then share one count of how many times they have been split.
+        """
         super().__init__()
         self.isVerbose = False
         self._bet = bet
+        self._insurance = 0
         self._isBlackJack = False
         self._isBusted = False
         self._isStanding = False
         self._isSplit = False
         self._isDoubled = False
+        self._isSurrendered = False
+        self._splits = None
+        # The house rules for splitting, doubling and surrender. See rules.py.
+        if rules is None:
+            rules = defaultRules
+        self._rules = rules
+        if splitFrom is not None:
+            self._isSplit = True
+            self._splits = splitFrom._splits
+        #
+        # Running totals so the value of the hand never has to be added up
+        # card by card. hit() and split() keep them current, so cards should
+        # only be added to or taken from a hand through those methods.
+        #
+        self._hardValue = 0
+        self._aces = 0
 
     def __str__(self):
         string = super().__str__()
@@ -24,7 +58,9 @@ class Hand(CardCollection):
             string += " Split"
         if self._isDoubled:
             string += " Doubled"
-        if self._isStanding:
+        if self._isSurrendered:
+            string += " Surrendered"
+        elif self._isStanding:
             string += " Standing"
         elif self._isBusted:
             string += " Busted"
@@ -45,6 +81,12 @@ class Hand(CardCollection):
         elif self.isBlackJack != other.isBlackJack:
             equal = False
         #
+        # Busted hands are all worth the same (nothing), and a busted
+        # hand is never equal to one that is still in the game.
+        #
+        elif self.isBusted or other.isBusted:
+            equal = self.isBusted == other.isBusted
+        #
         # Neither has a blackjack, so we can go by their value:
         #
         elif self.value() == other.value():
@@ -56,6 +98,14 @@ class Hand(CardCollection):
     def __gt__(self, other):
         if (self.__eq__(other)):
             greaterThan = False
+        #
+        # A busted hand loses to any hand that isn't busted, and a
+        # blackjack beats any other 21.
+        #
+        elif self.isBusted or other.isBusted:
+            greaterThan = other.isBusted
+        elif self.isBlackJack or other.isBlackJack:
+            greaterThan = self.isBlackJack
         else:
             greaterThan = self.value() > other.value()
         return greaterThan
@@ -63,34 +113,33 @@ class Hand(CardCollection):
     def __lt__(self, other):
         if (self.__eq__(other)):
             lessThan = False
+        elif self.isBusted or other.isBusted:
+            lessThan = self.isBusted
+        elif self.isBlackJack or other.isBlackJack:
+            lessThan = other.isBlackJack
         else:
             lessThan = self.value() < other.value()
         return lessThan
 
     def hard_value(self):
-        value = 0
-        for card in self:
-            value += card.hardValue
-        return value
+        return self._hardValue
 
     def soft_value(self):
-        numberOfAces = 0
-        value = 0
-        for card in self:
-            if card.isAce:
-                numberOfAces += 1
-            if numberOfAces > 1:
-                value += card.hardValue
-            else:
-                value += card.softValue
-        return value
+        # Only one ace can ever count as 11.
+        if self._aces:
+            return self._hardValue + 10
+        return self._hardValue
 
     def value(self):
-        value = self.soft_value()  # ace as 11
-        if value > 21:
-            value = self.hard_value()  # ace as 1
+        value = self._hardValue
+        if self._aces and value <= 11:
+            value += 10  # ace as 11
         return value
 
+    def is_soft(self):
+        """Returns True if the value of the hand counts an ace as 11."""
+        return self._aces > 0 and self._hardValue <= 11
+
     def can_hit(self):
         canHit = True
         if self._isBlackJack or self._isDoubled or self._isBusted or self._isStanding:
@@ -100,22 +149,32 @@ class Hand(CardCollection):
     def hit(self, card):
         if not self.can_hit():
             raise RuleError(f"Can't hit on this hand: {self}")
+        # Only a face up card can go in a hand. See Card._face.
+        if not card.is_showing():
+            raise RuleError(f"Can't hit with a card that isn't showing: {self}")
         if self.isVerbose:
-            print("  hit and received: " + str(card))
+            self.sink.emit(HAND_HIT, self, card)
+        face = card._face
+        self._hardValue += face.hardValue
+        if face.isAce:
+            self._aces += 1
         self.append(card)
-        self.check_blackjack()
-        self.check_21()
-        self.check_busted()
+        # Nothing below 21 can end the hand.
+        if self.value() >= 21:
+            self.check_blackjack()
+            self.check_21()
+            self.check_busted()
 
     def stand(self):
         self._isStanding = True
         if self.isVerbose:
-            print("  standing with: " + str(self))
+            self.sink.emit(HAND_STANDS, self)
 
     def can_split(self):
         canSplit = False
-        if (len(self) == 2) and self[0].same_rank(self[1]) and not self._isStanding:
-            canSplit = True
+        if (len(self) == 2) and self[0]._face.rank == self[1]._face.rank and not self._isStanding:
+            splitLimit = self.rules.splitLimit
+            canSplit = splitLimit is None or self.get_splits() < splitLimit
         return canSplit
 
     def split(self):
@@ -126,14 +185,28 @@ class Hand(CardCollection):
         if not self.can_split():
             raise RuleError("Can't split this hand: " + str(self))
         if self.isVerbose:
-            print("  splitting hand")
+            self.sink.emit(HAND_SPLITS, self)
         self._isSplit = True
+        #
+        # Every hand that comes from the same dealt hand shares this count,
+        # so the split limit covers resplits too.
+        #
+        if self._splits is None:
+            self._splits = [0]
+        self._splits[0] += 1
         card = self.pop()
+        face = card._face
+        self._hardValue -= face.hardValue
+        if face.isAce:
+            self._aces -= 1
         return card
 
     def can_double(self):
-        """Anytime you can hit you can also double down."""
-        return self.can_hit()
+        """
+        Anytime you can hit you can also double down, unless the hand came
+        from a split and the rules don't allow doubling after a split.
+        """
+        return self.can_hit() and (self.rules.doubleAfterSplit or not self._isSplit)
 
     def double_down(self, card, additionalBet = None):
         if additionalBet == None:
@@ -143,30 +216,45 @@ class Hand(CardCollection):
         if additionalBet > self._bet:
             raise RuleError('Double Down bet can not be more than original bet.')
         if self.isVerbose:
-            print("  doubled down and received: " + str(card))
+            self.sink.emit(HAND_DOUBLES, self, card)
         self._bet += additionalBet
         self.hit(card)
         self._isDoubled = True
         self._isStanding = True
 
+    def can_surrender(self):
+        """Surrender is only allowed, if at all, instead of playing the first two cards."""
+        return self.rules.surrender and len(self) == 2 and not self._isSplit and self.can_hit()
+
+    def surrender(self):
+        """Gives up the hand. Half the bet is returned at the payout, unless the dealer has blackjack."""
+        if not self.can_surrender():
+            raise RuleError("Can't surrender this hand: " + str(self))
+        self._isSurrendered = True
+        self._isStanding = True
+
+    def insure(self, amount):
+        """Places an insurance bet of amount on the hand."""
+        self._insurance = amount
+
     def check_blackjack(self):
         if (self.value() == 21) and (len(self) == 2):
             self._isBlackJack = True
             self._isStanding = True
             if self.isVerbose:
-                print("  Black Jack! Hand over.")
+                self.sink.emit(HAND_BLACKJACK, self)
 
     def check_busted(self):
         if self.value() > 21:
             self._isBusted = True
             if self.isVerbose:
-                print("  %s: busted! Hand over." % self.value())
+                self.sink.emit(HAND_BUSTED, self)
 
     def check_21(self):
         if self.value() == 21:
             self._isStanding = True
             if self.isVerbose:
-                print(f"  {self.value()}: I'm stanging.")
+                self.sink.emit(HAND_21, self)
 
     def get_is_blackjack(self):
         return self._isBlackJack
@@ -183,15 +271,34 @@ class Hand(CardCollection):
     def get_is_doubled(self):
         return self._isDoubled
 
+    def get_is_surrendered(self):
+        return self._isSurrendered
+
     def get_bet(self):
         return self._bet
 
+    def get_insurance(self):
+        return self._insurance
+
+    def get_rules(self):
+        return self._rules
+
+    def get_splits(self):
+        """How many times this hand and the hands split from the same one have been split."""
+        if self._splits is None:
+            return 0
+        return self._splits[0]
+
     isBlackJack = property(get_is_blackjack)
     isBusted = property(get_is_busted)
     isStanding = property(get_is_standing)
     isSplit = property(get_is_split)
     isDoubled = property(get_is_doubled)
+    isSurrendered = property(get_is_surrendered)
     bet = property(get_bet)
+    insurance = property(get_insurance)
+    rules = property(get_rules)
+    splits = property(get_splits)
 
 def informal_hand_test():
     from shoe import Shoe
@@ -37,7 +37,8 @@ class HumanPlayer(Player):
         allPlays = {'s': '[S]tand',
                     'h': '[H]it',
                     'd': '[D]ouble down',
-                    'p': 's[P]lit'}
+                    'p': 's[P]lit',
+                    'u': 's[U]rrender'}
         #
         # Some plays will not be legal for a given hand. Remove those choices.
         #
@@ -47,6 +48,8 @@ class HumanPlayer(Player):
             del allPlays['p']
         if not hand.can_double() or (self._chips == 0):
             del allPlays['d']
+        if not hand.can_surrender():
+            del allPlays['u']
         if hand.isStanding or hand.isBusted:
             del allPlays['s']
 
@@ -74,24 +77,6 @@ class HumanPlayer(Player):
         return choice, additionalBet
 
 
-    def count(self, card):
-        """This method will be called every time the dealer deals a card to anyone."""
-        #
-        # Use this if you want your player to count cards. The dealer will call this method
-        # on the player and send it each card as the player would see them. You can create one
-        # of more instance variables here for your other methods to access as needed.
-        #
-        pass
-
-
-    def reset_count(self):
-        """This method will be called for you every time the dealer shuffles the deck."""
-        #
-        # Use this if you are counting cards.
-        #
-        pass
-
-
 def test():
     from card import Card
     from hand import Hand
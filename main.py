@@ -1,5 +1,7 @@
+import sys
 from dealer import Dealer
 from humanplayer import HumanPlayer 
+from toolbox import FileInput, set_input_provider
 
 def main():
     dealer = Dealer('Dealer', 1000)
@@ -16,5 +18,8 @@ def main():
         dealer.take_bets()
 
 if __name__ == '__main__':
+    # python main.py answers.txt plays the answers in the file instead of asking.
+    if len(sys.argv) > 1:
+        set_input_provider(FileInput(sys.argv[1]))
     main()
 
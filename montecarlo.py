@@ -0,0 +1,63 @@
+from multiprocessing import Pool, cpu_count
+from arrayshoe import ArrayShoe
+from dealer import Dealer
+from rules import defaultRules
+from shuffler import CounterShuffler
+from simulator import Simulator, SimulationResult
+
+
+class MonteCarloRunner(object):
+    """
+    Splits a long simulation across a pool of worker processes. Each worker
+    plays its share of the rounds at its own table, with its own Dealer,
+    ArrayShoe and players, and its shoes come from its own CounterShuffler
+    stream (the master seed plus the worker's number). The results are
+    merged in worker order, so a given seed and worker count always
+    produces exactly the same numbers.
+
+    playerClasses is a list of non-interactive Player subclasses; each
+    worker seats one of each. They have to be importable by name (defined at
+    the top level of a module) so they can be sent to the workers.
+
+    Every table plays by rules (a RuleSet, see rules.py); without them the
+    default rules are used with the given number of decks.
+    """
+
+    def __init__(self, playerClasses, rounds, workers=None, seed=0, decks=6, bankroll=1000000000, rules=None):
+        if workers is None:
+            workers = cpu_count()
+        if rules is None:
+            rules = defaultRules.variant(decks=decks)
+        self.playerClasses = playerClasses
+        self.rounds = rounds
+        self.workers = workers
+        self.seed = seed
+        self.rules = rules
+        self.bankroll = bankroll
+
+    def shards(self):
+        """Returns the arguments for each worker's share of the rounds."""
+        rounds, extra = divmod(self.rounds, self.workers)
+        return [(self.playerClasses, rounds + (1 if worker < extra else 0), self.seed, worker, self.rules, self.bankroll)
+                for worker in range(self.workers)]
+
+    def run(self):
+        """Plays all the rounds and returns the merged SimulationResult."""
+        shards = self.shards()
+        if self.workers == 1:
+            shardResults = [run_shard(shards[0])]
+        else:
+            with Pool(self.workers) as pool:
+                shardResults = pool.map(run_shard, shards, chunksize=1)
+        result = SimulationResult()
+        for shardResult in shardResults:
+            result.merge(shardResult)
+        return result
+
+
+def run_shard(shard):
+    """Plays one worker's share of the rounds. This runs in the worker process."""
+    playerClasses, rounds, seed, stream, rules, bankroll = shard
+    dealer = Dealer('Dealer', 0, ArrayShoe(shuffler=CounterShuffler(seed, stream), rules=rules), rules=rules)
+    players = [playerClass(f'Player {number}', bankroll) for number, playerClass in enumerate(playerClasses)]
+    return Simulator(dealer, players, rounds).run()
@@ -1,10 +1,22 @@
 class Player(object):
 
+    #
+    # Slots for the attributes every player has. Subclasses that declare
+    # their own __slots__ stay free of a __dict__; one that doesn't (like
+    # most bots written against this class) gets one as usual.
+    #
+    __slots__ = ('name', '_chips', '_hands', 'isVerbose', 'countsCards')
+
     def __init__(self, name, money=100):
         self.name = name
         self._chips = money
         self._hands = []
         self.isVerbose = False
+        #
+        # The dealer only shows the cards to players that count them, so
+        # players that don't override count() or count_round() cost nothing.
+        #
+        self.countsCards = type(self).count is not Player.count or type(self).count_round is not Player.count_round
 
     def __str__(self):
         s = f'{self.name} ${self._chips:0.2f}: '
@@ -81,7 +93,8 @@ class Player(object):
         """
         THIS IS AN ABSTRACT METHOD! implement it in your subclass.
 
-        This method will be called every time the dealer deals a card to anyone.
+        The dealer shows you every card that is dealt to anyone. It does this at
+        the end of each round, through count_round().
         """
         #
         # Use this if you want your player to count cards. The dealer will call this method
@@ -91,6 +104,17 @@ class Player(object):
         pass
 
 
+    def count_round(self, cards):
+        """
+        The dealer calls this once at the end of every round with a list of
+        all the cards that were turned over during the round. By default it
+        just calls count() for each one; override it if you can count a
+        whole round at once.
+        """
+        for card in cards:
+            self.count(card)
+
+
     def reset_count(self):
         """
         THIS IS AN ABSTRACT METHOD! implement it in your subclass.
@@ -101,6 +125,13 @@ class Player(object):
         #
         pass
 
+    def set_rules(self, rules):
+        """
+        Tells the player the house rules (see rules.py) of the table it is
+        about to play at. Players that don't care can leave this alone.
+        """
+        pass
+
     def get_money(self):
         return self._chips
 
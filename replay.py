@@ -0,0 +1,219 @@
+from collections import namedtuple
+from arrayshoe import ArrayShoe
+from dealer import Dealer
+from events import nullSink
+from player import Player
+from rules import defaultRules
+from roundlog import RoundLogReader, DEALER_SEAT, UNSHUFFLED, COUNTER_SHUFFLER, COUNTER_SHUFFLER_NUMPY, outcomes
+from shuffler import CounterShuffler
+from simulator import SimulationResult
+
+#
+# One difference between a recorded hand and its replay. seat is
+# DEALER_SEAT for the dealer's hand and field is 'cards', 'outcome', 'bet'
+# or 'net', or 'hands' if the round didn't have as many hands as the log.
+#
+Mismatch = namedtuple('Mismatch', 'round seat hand field recorded replayed')
+
+
+class ReplayShoe(object):
+    """
+    A shoe that deals whichever shoe a round log says was in play. Every
+    shoe shuffled by a CounterShuffler can be rebuilt from its seed, stream
+    and shoe number, so seek() reshuffles only when the shoe changes and
+    otherwise just deals on from where the last round left off. It never
+    asks to be shuffled: the log decides that.
+    """
+
+    def __init__(self, decks=6, useNumpy=False):
+        self.shuffler = CounterShuffler(0, 0, useNumpy)
+        self.shoe = ArrayShoe(decks, self.shuffler)
+        self.draw = self.shoe.draw
+        self._shoeKey = None
+
+    def __len__(self):
+        return len(self.shoe)
+
+    def seek(self, seed, stream, shoeNumber, position):
+        """Makes the next card drawn the one at position in the given shoe."""
+        shoe = self.shoe
+        shoeKey = (seed, stream, shoeNumber)
+        if shoeKey != self._shoeKey or position < shoe.position:
+            if shoeNumber == UNSHUFFLED:
+                shoe.populate_shoe()
+            else:
+                self.shuffler.seed = seed
+                self.shuffler.stream = stream
+                self.shuffler.shoeNumber = shoeNumber - 1
+                shoe.shuffle()
+            self._shoeKey = shoeKey
+        for _ in range(position - shoe.position):
+            shoe.draw()
+
+    def should_shuffle(self):
+        return False
+
+    def shuffle(self):
+        pass
+
+    def get_position(self):
+        return self.shoe.position
+
+    def get_decks(self):
+        return self.shoe.decks
+
+    decks = property(get_decks)
+    position = property(get_position)
+
+
+class ScriptedPlayer(Player):
+    """
+    Bets, insures and plays exactly what a round log says one seat did.
+    Give it the seat's records for a round with load(). If a replay asks for
+    more decisions than were recorded (say, because the rules changed) it
+    stands.
+    """
+
+    def __init__(self, name, money=1e12):
+        super().__init__(name, money)
+        self._bet = 0
+        self._scripts = []
+        self._insured = []
+        self._steps = {}
+
+    def load(self, records):
+        """Sets up the next round from this seat's records, in hand order."""
+        if records:
+            first = records[0]
+            self._bet = first.bet - first.doubleBet
+        else:
+            self._bet = 0
+        # Insurance comes before any play, so an insured hand's actions start with 'i'.
+        self._insured = [record.actions[:1] == 'i' for record in records]
+        self._scripts = [(record.actions[insured:], record.doubleBet)
+                         for record, insured in zip(records, self._insured)]
+        self._steps = {}
+
+    def hand_index(self, hand):
+        # Hands are found by identity: Hand.__eq__ compares values.
+        index = 0
+        while self._hands[index] is not hand:
+            index += 1
+        return index
+
+    def bet_or_leave(self):
+        return self._bet
+
+    def insurance(self, hand, dealerShowing):
+        index = self.hand_index(hand)
+        return index < len(self._insured) and self._insured[index]
+
+    def play(self, hand, dealerShowing):
+        index = self.hand_index(hand)
+        step = self._steps.get(index, 0)
+        self._steps[index] = step + 1
+        if index >= len(self._scripts):
+            return 's', None
+        actions, doubleBet = self._scripts[index]
+        if step >= len(actions):
+            return 's', None
+        choice = actions[step]
+        if choice == 'd':
+            return 'd', doubleBet
+        return choice, None
+
+
+class Replayer(object):
+    """
+    Plays a round log back through a Dealer and checks that every hand
+    comes out the way it was recorded: the same cards, outcome, bet and
+    net. The log is streamed from disk a round at a time, so logs of any
+    size can be replayed.
+
+    Only logs of shoes shuffled by a CounterShuffler can be replayed, and
+    the shoe is rebuilt with as many decks as the log says it had; decks,
+    if given, must agree. The log doesn't keep the house rules, so a log of
+    a table with insurance or surrender needs a dealer with those rules.
+    To regression-test a rule change, pass a dealer with the new rules (its
+    shoe and sink are replaced) and look at the mismatches.
+    """
+
+    def __init__(self, path, decks=None, dealer=None):
+        self.reader = RoundLogReader(path)
+        records = iter(self.reader)
+        first = next(records, None)
+        records.close()
+        if first is None:
+            self.decks = decks or defaultRules.decks
+            self.shufflerKind = COUNTER_SHUFFLER
+        else:
+            if first.shuffler not in (COUNTER_SHUFFLER, COUNTER_SHUFFLER_NUMPY):
+                raise ValueError(f"{path} wasn't shuffled by a CounterShuffler, so its shoes can't be rebuilt.")
+            if not first.decks:
+                raise ValueError(f"{path} doesn't say how many decks its shoe had.")
+            if decks is not None and decks != first.decks:
+                raise ValueError(f'{path} was dealt from {first.decks} decks, not {decks}.')
+            self.decks = first.decks
+            self.shufflerKind = first.shuffler
+        self.shoe = ReplayShoe(self.decks, self.shufflerKind == COUNTER_SHUFFLER_NUMPY)
+        if dealer is None:
+            dealer = Dealer('Dealer', 0)
+        dealer.shoe = self.shoe
+        dealer.sink = nullSink
+        self.dealer = dealer
+        self.seats = []
+        self.mismatches = []
+
+    def run(self, maxMismatches=None):
+        """
+        Replays every round and returns a SimulationResult for the replayed
+        hands. Differences from the log are collected in mismatches; the
+        replay stops early once there are maxMismatches of them.
+        """
+        dealer = self.dealer
+        shoe = self.shoe
+        seats = self.seats
+        result = SimulationResult()
+        add_hand = result.add_hand
+        for records in self.reader.rounds():
+            dealerRecord = records[-1]
+            if (dealerRecord.decks, dealerRecord.shuffler) != (self.decks, self.shufflerKind):
+                raise ValueError(f'Round {dealerRecord.round} of {self.reader.path} was dealt from a '
+                                 f'different shoe than the rounds before it.')
+            playerRecords = records[:-1]
+            seatCount = playerRecords[-1].seat + 1 if playerRecords else 0
+            while len(seats) < seatCount:
+                seats.append(ScriptedPlayer(f'Seat {len(seats)}'))
+            bySeat = [[] for _ in range(seatCount)]
+            for record in playerRecords:
+                bySeat[record.seat].append(record)
+            for seat, seatRecords in enumerate(bySeat):
+                seats[seat].load(seatRecords)
+            dealer.players = seats[:seatCount]
+            shoe.seek(dealerRecord.seed, dealerRecord.stream, dealerRecord.shoe, dealerRecord.position)
+
+            dealer.take_bets()
+            dealer.deal()
+            dealer.resolve_hands()
+            cards = [[card._face.code for card in hand] for player in dealer.players for hand in player.hands]
+            dealerCards = tuple(card._face.code for card in dealer.hands[0])
+            results = dealer.payout()
+
+            self.compare(dealerRecord, 'cards', dealerRecord.cards, dealerCards)
+            if len(results) != len(playerRecords):
+                self.mismatches.append(Mismatch(dealerRecord.round, DEALER_SEAT, 0, 'hands',
+                                                len(playerRecords), len(results)))
+            for record, handCards, (outcome, bet, net) in zip(playerRecords, cards, results):
+                self.compare(record, 'cards', record.cards, tuple(handCards))
+                self.compare(record, 'outcome', outcomes[record.outcome], outcome)
+                self.compare(record, 'bet', record.bet, bet)
+                self.compare(record, 'net', record.net, net)
+                add_hand(outcome, bet, net)
+            result.rounds += 1
+            if maxMismatches is not None and len(self.mismatches) >= maxMismatches:
+                break
+        return result
+
+    def compare(self, record, field, recorded, replayed):
+        if recorded != replayed:
+            self.mismatches.append(Mismatch(record.round, record.seat, record.hand, field, recorded, replayed))
@@ -0,0 +1,196 @@
+import mmap
+import os
+import struct
+from collections import namedtuple
+from settlement import outcomeNames
+from shuffler import CounterShuffler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#
+# A round log is an 8-byte header followed by one fixed-width record for
+# every hand played: each player hand and then the dealer's hand. All
+# numbers are little-endian and the records are packed with no padding:
+#
+#   round        uint64    the dealer's round number
+#   seed         uint64    the shuffler's seed and stream (0 if the shoe
+#   stream       uint32    isn't shuffled by a CounterShuffler)
+#   shoe         uint32    the shuffler's shoe number; UNSHUFFLED if the
+#                          shoe is still in box order
+#   position     uint16    cards dealt from the shoe before the round started
+#   decks        uint8     decks in the shoe; 0 if the shoe doesn't say
+#   shuffler     uint8     what shuffled the shoe: COUNTER_SHUFFLER,
+#                          COUNTER_SHUFFLER_NUMPY or OTHER_SHUFFLER
+#   seat         uint8     the player's seat this round; 255 for the dealer
+#   hand         uint8     which of the player's hands this is
+#   cardCount    uint8
+#   cards        21 x uint8   card codes in the order they were dealt to the
+#                             hand, padded with 255 (21 cards is the most a
+#                             hand can hold)
+#   actionCount  uint8
+#   actions      21 bytes  the player's choices, 'h', 's', 'd', 'p' or 'u',
+#                          after an 'i' if the hand was insured
+#   bet          float64   the final bet on the hand
+#   doubleBet    float64   how much of that was added by doubling down
+#   net          float64   the player's win or loss on the hand
+#   outcome      uint8     index into outcomes; 255 for the dealer
+#
+MAGIC = b'BJRL'
+VERSION = 2
+MAX_CARDS = 21
+DEALER_SEAT = 255
+UNSHUFFLED = 0xFFFFFFFF
+# Only the shoes of a CounterShuffler can be rebuilt from the log.
+COUNTER_SHUFFLER = 0
+COUNTER_SHUFFLER_NUMPY = 1
+OTHER_SHUFFLER = 255
+header = struct.Struct('<4sHH')
+record = struct.Struct(f'<QQIIHBBBBB{MAX_CARDS}sB{MAX_CARDS}sdddB')
+outcomes = outcomeNames
+# The largest value each whole-number field of a record can hold, in record order.
+fieldLimits = (('round', 2 ** 64 - 1), ('seed', 2 ** 64 - 1), ('stream', 2 ** 32 - 1), ('shoe', 2 ** 32 - 1),
+               ('position', 2 ** 16 - 1), ('decks', 255), ('shuffler', 255), ('seat', 255), ('hand', 255))
+
+RoundRecord = namedtuple('RoundRecord', 'round seed stream shoe position decks shuffler seat hand cards actions '
+                                        'bet doubleBet net outcome')
+
+if numpy is not None:
+    recordDtype = numpy.dtype([('round', '<u8'), ('seed', '<u8'), ('stream', '<u4'), ('shoe', '<u4'),
+                               ('position', '<u2'), ('decks', 'u1'), ('shuffler', 'u1'),
+                               ('seat', 'u1'), ('hand', 'u1'),
+                               ('cardCount', 'u1'), ('cards', 'u1', (MAX_CARDS,)),
+                               ('actionCount', 'u1'), ('actions', f'S{MAX_CARDS}'),
+                               ('bet', '<f8'), ('doubleBet', '<f8'), ('net', '<f8'), ('outcome', 'u1')])
+    assert recordDtype.itemsize == record.size
+
+
+def shuffler_kind(shuffler):
+    """The shuffler field for a shoe shuffled by shuffler."""
+    if isinstance(shuffler, CounterShuffler):
+        return COUNTER_SHUFFLER_NUMPY if shuffler.useNumpy else COUNTER_SHUFFLER
+    return OTHER_SHUFFLER
+
+
+class RoundLogWriter(object):
+    """
+    Writes a round log. Give one to a Dealer as its recorder and every hand
+    the dealer settles is written here. Records are buffered and written
+    bufferSize bytes at a time; call close() when you are done.
+    """
+
+    def __init__(self, path, bufferSize=1 << 20):
+        self.file = open(path, 'wb')
+        self.file.write(header.pack(MAGIC, VERSION, record.size))
+        self.bufferSize = bufferSize
+        self._buffer = bytearray()
+
+    def write_hand(self, roundInfo, seat, handIndex, cards, actions, bet, doubleBet, net, outcome):
+        """
+        Adds one hand. roundInfo is (round, seed, stream, shoe, position,
+        decks, shuffler), cards is a list of card codes and actions a
+        string of choices.
+        """
+        if len(cards) > MAX_CARDS:
+            raise ValueError(f'A hand of {len(cards)} cards is too big for the round log.')
+        if len(actions) > MAX_CARDS:
+            raise ValueError(f'{len(actions)} actions are too many for the round log.')
+        for (name, limit), value in zip(fieldLimits, (*roundInfo, seat, handIndex)):
+            if not 0 <= value <= limit:
+                raise ValueError(f'A {name} of {value} does not fit in the round log (0 to {limit}).')
+        self._buffer += record.pack(*roundInfo, seat, handIndex,
+                                    len(cards), bytes(cards).ljust(MAX_CARDS, b'\xff'), len(actions), actions.encode('ascii'),
+                                    bet, doubleBet, net, outcome)
+        if len(self._buffer) >= self.bufferSize:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self._buffer)
+        self._buffer = bytearray()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class RoundLogReader(object):
+    """
+    Reads a round log without loading it: the file is memory-mapped, so
+    even very large logs open instantly and are only paged in as they are
+    read.
+
+        reader.records   a numpy.memmap structured array over the whole
+                         file (needs numpy)
+        iter(reader)     RoundRecord tuples, one at a time
+        reader.rounds()  lists of the RoundRecords of each round
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            start = file.read(header.size)
+            size = os.fstat(file.fileno()).st_size
+        if len(start) < header.size:
+            raise ValueError(f'{path} is not a version {VERSION} round log.')
+        magic, version, recordSize = header.unpack(start)
+        if magic != MAGIC or version != VERSION or recordSize != record.size:
+            raise ValueError(f'{path} is not a version {VERSION} round log.')
+        # The log is read as it was when it was opened.
+        self._length, extra = divmod(size - header.size, record.size)
+        if extra:
+            raise ValueError(f'{path} is truncated: it ends {extra} bytes into a record.')
+
+    def __len__(self):
+        return self._length
+
+    def get_records(self):
+        """A read-only structured array of every record, mapped from the file."""
+        if numpy is None:
+            raise ImportError('RoundLogReader.records requires numpy; iterate over the reader instead.')
+        return numpy.memmap(self.path, dtype=recordDtype, mode='r', offset=header.size, shape=(self._length,))
+
+    def __iter__(self):
+        if self._length == 0:
+            return
+        with open(self.path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                view = memoryview(data)[header.size:header.size + self._length * record.size]
+                unpacker = record.iter_unpack(view)
+                try:
+                    for fields in unpacker:
+                        yield unpack_record(fields)
+                finally:
+                    # The mmap can't be closed while anything still holds a view of it.
+                    del unpacker
+                    view.release()
+
+    def rounds(self):
+        """Yields the records of each round as a list, player hands first."""
+        current = []
+        for hand in self:
+            if current and hand.round != current[0].round:
+                yield current
+                current = []
+            current.append(hand)
+        if current:
+            yield current
+
+    records = property(get_records)
+
+
+def unpack_record(fields):
+    """Turns the fields of a raw record into a RoundRecord."""
+    (roundNumber, seed, stream, shoe, position, decks, shuffler, seat, handIndex,
+     cardCount, cards, actionCount, actions, bet, doubleBet, net, outcome) = fields
+    return RoundRecord(roundNumber, seed, stream, shoe, position, decks, shuffler, seat, handIndex,
+                       tuple(cards[:cardCount]), actions[:actionCount].decode('ascii'),
+                       bet, doubleBet, net, outcome)
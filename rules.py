@@ -0,0 +1,72 @@
+from dataclasses import dataclass, replace
+
+#
+# The fewest cards left in the shoe when the cut card comes out: enough for
+# a full table's round (seven players and the dealer), so a round never runs
+# the shoe dry.
+#
+cutCardReserve = 40
+
+
+@dataclass(frozen=True)
+class RuleSet(object):
+    """
+    The house rules for a table. A RuleSet can't be changed once it is
+    made, so one can be shared by a Dealer, its Shoe and every Hand, and
+    used as a dictionary key. Use variant() to make a copy with a few rules
+    changed:
+
+        sixToFive = defaultRules.variant(blackjackPayout=1.2)
+
+    The defaults are the rules the game has always been played by.
+    """
+
+    # The dealer hits soft 17 (H17) if True and stands on it (S17) if False.
+    hitSoft17: bool = True
+    decks: int = 6
+    #
+    # How much of the shoe is dealt before the cut card comes out, from 0
+    # to 1, though never so much that fewer than cutCardReserve cards are
+    # left. None puts the cut card where it has always gone: 40 cards plus
+    # up to 20% of the shoe from the end.
+    #
+    penetration: float = None
+    # Whether hands that came from a split can be doubled (DAS).
+    doubleAfterSplit: bool = True
+    # How many times a hand can be split, resplits included; None for no limit.
+    splitLimit: int = None
+    # What a blackjack pays per unit bet: 1.5 for 3:2, 1.2 for 6:5.
+    blackjackPayout: float = 1.5
+    #
+    # Late surrender: give up half the bet instead of playing the first two
+    # cards. The dealer doesn't peek, so it only counts if the dealer turns
+    # out not to have blackjack; against a blackjack the whole bet is lost.
+    #
+    surrender: bool = False
+    # Insurance is offered when the dealer shows an ace, and pays 2:1.
+    insurance: bool = False
+
+    def __post_init__(self):
+        if self.decks < 1 or self.decks != int(self.decks):
+            raise ValueError(f'A shoe needs a whole number of decks, not {self.decks}.')
+        if self.penetration is not None and not 0 < self.penetration <= 1:
+            raise ValueError(f'Penetration must be between 0 and 1, not {self.penetration}.')
+        if self.splitLimit is not None and self.splitLimit < 0:
+            raise ValueError('The split limit can not be negative.')
+
+    def variant(self, **changes):
+        """Returns a copy of these rules with some of them changed."""
+        return replace(self, **changes)
+
+    def cut_card(self, shoeSize, randint):
+        """
+        Returns how many cards should be left in a freshly shuffled shoe of
+        shoeSize cards when the cut card comes out. randint(low, high) is the
+        shuffler's random number source.
+        """
+        if self.penetration is None:
+            return cutCardReserve + randint(0, int(0.20 * shoeSize))
+        return max(shoeSize - int(round(self.penetration * shoeSize)), cutCardReserve)
+
+
+defaultRules = RuleSet()
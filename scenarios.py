@@ -0,0 +1,131 @@
+import struct
+from array import array
+from collections import Counter
+from card import Card
+from errors import ScenarioError
+
+#
+# A scenario is a stacked shoe: a list of card codes in the order they sit
+# in the shoe. Like Deck.stack(), cards are drawn from the end, so the last
+# card listed is the first one dealt.
+#
+# Text scenario files have one card per line, written the way
+# stacked-deck.txt is ("6 of Diamonds", "Jack of Clubs" or "J of Clubs"),
+# and hold as many shoes as you like, separated by blank lines. Lines
+# starting with # are comments.
+#
+# Binary scenario files are a header and then each shoe as a uint16 card
+# count followed by that many card codes, one byte each.
+#
+MAGIC = b'BJSC'
+VERSION = 1
+header = struct.Struct('<4sHI')
+shoeLength = struct.Struct('<H')
+
+#
+# Every way a card can be written in a text file, lower case, mapped to its
+# code.
+#
+lineCodes = {f'{name} of {suit}': code for (name, suit), code in Card.codeDict.items()}
+
+
+def parse_text(text, decks=1, source='<text>'):
+    """Returns the shoes in a text scenario file as arrays of card codes."""
+    shoes = []
+    codes = array('B')
+    lineNumbers = []
+    get = lineCodes.get
+    for lineNumber, line in enumerate(text.splitlines(), 1):
+        key = ' '.join(line.lower().split())
+        code = get(key)
+        if code is not None:
+            codes.append(code)
+            lineNumbers.append(lineNumber)
+        elif not key:
+            if codes:
+                validate(codes, decks, source, lineNumbers)
+                shoes.append(codes)
+                codes = array('B')
+                lineNumbers = []
+        elif key[0] != '#':
+            raise ScenarioError(f'{line.strip()!r} is not a card.', source, lineNumber)
+    if codes:
+        validate(codes, decks, source, lineNumbers)
+        shoes.append(codes)
+    return shoes
+
+
+def parse_binary(data, decks=1, source='<binary>'):
+    """Returns the shoes in a binary scenario file as arrays of card codes."""
+    data = memoryview(data)
+    if len(data) < header.size:
+        raise ScenarioError('Too short to be a scenario file.', source)
+    magic, version, count = header.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ScenarioError(f'Not a version {VERSION} scenario file.', source)
+    shoes = []
+    offset = header.size
+    for number in range(count):
+        if offset + shoeLength.size > len(data):
+            raise ScenarioError(f'Shoe {number} is missing.', source)
+        length, = shoeLength.unpack_from(data, offset)
+        offset += shoeLength.size
+        if offset + length > len(data):
+            raise ScenarioError(f'Shoe {number} is cut short.', source)
+        codes = array('B', data[offset:offset + length])
+        offset += length
+        validate(codes, decks, f'{source} shoe {number}')
+        shoes.append(codes)
+    return shoes
+
+
+def read_scenarios(path, decks=1):
+    """
+    Reads every shoe in a scenario file, text or binary, and checks each
+    one could come out of a shoe of that many decks.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:len(MAGIC)] == MAGIC:
+        return parse_binary(data, decks, path)
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ScenarioError('Not a text or binary scenario file.', path)
+    return parse_text(text, decks, path)
+
+
+def write_binary(path, shoes):
+    """Writes shoes (any sequences of card codes) to a binary scenario file."""
+    with open(path, 'wb') as file:
+        file.write(header.pack(MAGIC, VERSION, len(shoes)))
+        for codes in shoes:
+            file.write(shoeLength.pack(len(codes)))
+            file.write(bytes(codes))
+
+
+def validate(codes, decks, source=None, lineNumbers=None):
+    """
+    Raises a ScenarioError if codes has more of any card than a shoe of
+    that many decks holds, or anything that isn't a card code.
+    lineNumbers, if given, is the line each code came from.
+    """
+    if not codes:
+        return
+    if len(codes) > 52 * decks:
+        raise ScenarioError(f'{len(codes)} cards is more than {decks} decks hold.', source)
+    counts = Counter(codes)
+    if max(counts) > 51 or max(counts.values()) > decks:
+        #
+        # Go back through the cards to say which one is the problem.
+        #
+        seen = Counter()
+        for index, code in enumerate(codes):
+            seen[code] += 1
+            line = lineNumbers[index] if lineNumbers else None
+            where = '' if lineNumbers else f' (card {index})'
+            if code > 51:
+                raise ScenarioError(f'{code} is not a card code{where}.', source, line)
+            if seen[code] > decks:
+                card = Card.faces[code]
+                raise ScenarioError(f'One {card.name} of {card.suit} too many for {decks} decks{where}.', source, line)
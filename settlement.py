@@ -0,0 +1,83 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#
+# How a hand was settled, as indexes into outcomeNames (the same order as
+# SimulationResult.outcomeNames).
+#
+outcomeNames = ['bust', 'lose', 'push', 'blackjack', 'win', 'surrender']
+BUST, LOSE, PUSH, BLACKJACK, WIN, SURRENDER = range(6)
+
+
+def settle(values, blackjacks, busts, bets, dealerValue, dealerBlackjack, dealerBust, blackjackPayout=1.5,
+           surrenders=None):
+    """
+    Settles a batch of player hands against the dealer in one pass and
+    returns (outcomes, nets): each hand's outcome index and the player's
+    win or loss on it. The player hands are given as parallel sequences of
+    final values, blackjack flags, bust flags and bets. The rules are the
+    ones Dealer.payout() has always used:
+
+      - a surrendered hand (if surrenders is given) loses half its bet,
+        unless the dealer has blackjack: surrender is late, and the dealer
+        doesn't peek, so a dealer blackjack takes the whole bet;
+      - a busted hand loses, even if the dealer busts too;
+      - two blackjacks push, and a blackjack beats any other hand, paying
+        blackjackPayout (1.5 for 3:2, 1.2 for 6:5);
+      - otherwise a dealer blackjack wins, a dealer bust loses, and the
+        higher value wins.
+
+    With NumPy arrays the whole batch is a few array operations, and the
+    dealer arguments may be arrays too (one per hand, or anything that
+    broadcasts), for settling many tables at once. Lists are settled with
+    plain Python, which is faster for the handful of hands at one table.
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        outcomes = numpy.where(values > dealerValue, WIN, numpy.where(values == dealerValue, PUSH, LOSE))
+        outcomes = numpy.where(dealerBust, WIN, outcomes)
+        outcomes = numpy.where(dealerBlackjack, LOSE, outcomes)
+        outcomes = numpy.where(blackjacks, numpy.where(dealerBlackjack, PUSH, BLACKJACK), outcomes)
+        outcomes = numpy.where(busts, BUST, outcomes)
+        if surrenders is not None:
+            outcomes = numpy.where(surrenders, numpy.where(dealerBlackjack, LOSE, SURRENDER), outcomes)
+        netRatios = numpy.array([-1.0, -1.0, 0.0, blackjackPayout, 1.0, -0.5])
+        return outcomes, bets * netRatios[outcomes]
+
+    outcomes = []
+    nets = []
+    if surrenders is None:
+        surrenders = [False] * len(values)
+    for value, blackjack, bust, bet, surrendered in zip(values, blackjacks, busts, bets, surrenders):
+        if surrendered and not dealerBlackjack:
+            outcome = SURRENDER
+            net = -bet / 2
+        elif surrendered:
+            outcome = LOSE
+            net = -bet
+        elif bust:
+            outcome = BUST
+            net = -bet
+        elif blackjack:
+            if dealerBlackjack:
+                outcome = PUSH
+                net = 0
+            else:
+                outcome = BLACKJACK
+                net = bet * blackjackPayout
+        elif dealerBlackjack:
+            outcome = LOSE
+            net = -bet
+        elif dealerBust or value > dealerValue:
+            outcome = WIN
+            net = bet
+        elif value == dealerValue:
+            outcome = PUSH
+            net = 0
+        else:
+            outcome = LOSE
+            net = -bet
+        outcomes.append(outcome)
+        nets.append(net)
+    return outcomes, nets
@@ -1,25 +1,41 @@
-from random import randint
+from card import Card
 from deck import Deck
+from rules import defaultRules
+from scenarios import validate
 from cardcollection import CardCollection
+from shuffler import defaultShuffler
 from toolbox import is_integer
 
 
 class Shoe(CardCollection):
 
-    def __init__(self, decks = 6):
+    def __init__(self, decks = None, shuffler = None, rules = None):
         super().__init__()
-        if not is_integer(decks):
-            raise TypeError('Number of decks must be an integer.')
+        #
+        # If there are house rules (see rules.py) they decide the number of
+        # decks and where the cut card goes.
+        #
+        decks = decks_for(decks, rules)
+        if rules is None:
+            rules = defaultRules
+        self.rules = rules
         self.__decks = decks
+        #
+        # The shuffler decides where the random numbers come from. Pass a
+        # seeded one (see shuffler.py) to make a game reproducible.
+        #
+        if shuffler is None:
+            shuffler = defaultShuffler
+        self.shuffler = shuffler
         self.populate_shoe()
         self.set_cut_card()
 
     def populate_shoe(self):
         """Adds the specified number of decks of cards to the shoe."""
         self.clear()
-        for _ in range(self.__decks):
-            for card in Deck():
-                self.append(card)
+        self.extend(map(Card.from_code, Deck.codes * self.__decks))
+        # How many cards the shoe was filled with, for get_position().
+        self.__size = len(self)
 
     def set_cut_card(self):
         """
@@ -27,11 +43,9 @@ class Shoe(CardCollection):
         the number of cards in the shoe falls below this number, the shoe
         needs to be shuffled. We set it at 40 (a reasonable minimum number
         of cards you might need to play blackjack with 7 people) plus upto
-        20% of the size of the shoe.
+        20% of the size of the shoe, unless the rules set a penetration.
         """
-        minShoeLength = 40
-        maxPercentLeft = 0.20
-        self.cutCard = minShoeLength + randint(0, int(maxPercentLeft* len(self)))
+        self.cutCard = self.rules.cut_card(len(self), self.shuffler.randint)
 
     def should_shuffle(self):
         """
@@ -48,9 +62,48 @@ class Shoe(CardCollection):
         shoe before we shuffle it.
         """
         self.populate_shoe()
-        super().shuffle()
+        super().shuffle(self.shuffler)
         self.set_cut_card()
 
+    def load(self, codes):
+        """
+        Stacks the shoe with a scenario (see scenarios.py): the card codes
+        in the order they sit in the shoe, last card dealt first. A stacked
+        shoe is dealt down to the last card before the dealer shuffles.
+        Raises a ScenarioError if the cards couldn't all be in this shoe.
+        """
+        codes = list(codes)
+        validate(codes, self.__decks)
+        self.clear()
+        self.extend(map(Card.from_code, codes))
+        self.__size = len(codes)
+        self.cutCard = 0
+
+    def get_position(self):
+        """The number of cards dealt since the shoe was filled or loaded."""
+        return self.__size - len(self)
+
+    def get_decks(self):
+        return self.__decks
+
+    decks = property(get_decks)
+    position = property(get_position)
+
+
+def decks_for(decks, rules):
+    """
+    Returns the number of decks for a shoe: decks if it is given, else as
+    many as the rules (or the default rules) say. The two must agree if
+    both are given.
+    """
+    if decks is None:
+        decks = (defaultRules if rules is None else rules).decks
+    if not is_integer(decks):
+        raise TypeError('Number of decks must be an integer.')
+    if rules is not None and decks != rules.decks:
+        raise ValueError(f'A shoe of {decks} decks can not be dealt by rules for {rules.decks}.')
+    return decks
+
 # [ ] 1. create a new shoe
 # [ ] 2. print the shoe
 # [ ] 3. shuffle the shoe
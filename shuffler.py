@@ -0,0 +1,114 @@
+import random
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Shuffler(object):
+    """
+    Shuffles card collections with an unbiased Fisher-Yates shuffle, using
+    whatever random number generator it is given:
+
+        rng = None                     the global random module (the default)
+        rng = random.Random(seed)      a reproducible stream
+        rng = numpy.random.default_rng(seed)
+
+    With a NumPy generator, array-backed shoes are permuted in place by
+    NumPy's own Fisher-Yates shuffle, which is much faster for multi-deck
+    shoes. Set vectorize to False to keep NumPy generators on the Python
+    path.
+    """
+
+    def __init__(self, rng=None, vectorize=True):
+        if rng is None:
+            rng = random
+        self.rng = rng
+        self.vectorize = vectorize
+
+    def is_numpy(self):
+        """Returns True if the generator is a numpy.random.Generator."""
+        return numpy is not None and isinstance(self.rng, numpy.random.Generator)
+
+    def shuffle(self, cards):
+        """Shuffles a list of cards, or an array or NumPy array of card codes, in place."""
+        if self.is_numpy():
+            if self.vectorize and isinstance(cards, array):
+                #
+                # A zero-copy view of the array, shuffled in place.
+                #
+                self.rng.shuffle(numpy.frombuffer(cards, dtype=numpy.uint8))
+            elif isinstance(cards, numpy.ndarray):
+                self.rng.shuffle(cards)
+            else:
+                order = self.rng.permutation(len(cards))
+                cards[:] = [cards[position] for position in order]
+        else:
+            fisher_yates(cards, self.rng)
+
+    def randint(self, low, high):
+        """Returns a random integer N such that low <= N <= high."""
+        if self.is_numpy():
+            return int(self.rng.integers(low, high + 1))
+        return self.rng.randint(low, high)
+
+
+class CounterShuffler(Shuffler):
+    """
+    A Shuffler that keys a fresh generator on (seed, stream, shoe number)
+    for every shoe, so any shoe of any stream can be reproduced on its own
+    and parallel simulations can each take their own stream. The pure
+    Python generator is random.Random seeded with the key; with useNumpy
+    it is NumPy's counter-based Philox generator.
+    """
+
+    def __init__(self, seed, stream=0, useNumpy=False):
+        if useNumpy and numpy is None:
+            raise ImportError('useNumpy requires numpy.')
+        self.seed = seed
+        self.stream = stream
+        self.useNumpy = useNumpy
+        #
+        # The number of the shoe most recently shuffled. The first shuffle
+        # is shoe 0.
+        #
+        self.shoeNumber = -1
+        super().__init__(self.generator(self.shoeNumber))
+
+    def generator(self, shoeNumber):
+        """Returns the generator for one shoe of this stream."""
+        if self.useNumpy:
+            #
+            # The shoe number goes in the high word of Philox's counter, so
+            # the shoes of a stream never overlap.
+            #
+            bitGenerator = numpy.random.Philox(key=self.seed << 64 | self.stream,
+                                               counter=[0, 0, 0, shoeNumber + 1])
+            rng = numpy.random.Generator(bitGenerator)
+        else:
+            rng = random.Random(f'{self.seed}/{self.stream}/{shoeNumber}')
+        return rng
+
+    def shuffle(self, cards):
+        self.shoeNumber += 1
+        self.rng = self.generator(self.shoeNumber)
+        super().shuffle(cards)
+
+
+def fisher_yates(cards, rng=random):
+    """
+    Shuffles cards in place. random.Random.shuffle() is a Fisher-Yates
+    (Durstenfeld) shuffle, so generators that have one use it; anything
+    else only needs randrange().
+    """
+    if hasattr(rng, 'shuffle'):
+        rng.shuffle(cards)
+    else:
+        for last in range(len(cards) - 1, 0, -1):
+            other = rng.randrange(last + 1)
+            cards[last], cards[other] = cards[other], cards[last]
+
+
+defaultShuffler = Shuffler()
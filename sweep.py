@@ -0,0 +1,156 @@
+import hashlib
+import itertools
+import json
+import os
+from collections import namedtuple
+from dataclasses import asdict, fields
+from multiprocessing import Pool, cpu_count
+from montecarlo import run_shard
+from rules import RuleSet, defaultRules
+from simulator import SimulationResult
+
+#
+# One cell of a sweep: a rule set, a strategy (a Player class), its
+# SimulationResult and whether that came from the cache.
+#
+SweepCell = namedtuple('SweepCell', 'rules strategy result cached')
+
+
+def rule_grid(base=defaultRules, **options):
+    """
+    Returns a RuleSet for every combination of the given options, each a
+    list of values for one RuleSet field, starting from base:
+
+        rule_grid(decks=[2, 6, 8], hitSoft17=[True, False], blackjackPayout=[1.5, 1.2])
+    """
+    names = list(options)
+    return [base.variant(**dict(zip(names, values))) for values in itertools.product(*options.values())]
+
+
+def strategy_name(strategy):
+    return f'{strategy.__module__}.{strategy.__qualname__}'
+
+
+def default_cache_directory():
+    """Where sweeps keep their cells unless told otherwise: the user's cache, not the working directory."""
+    cacheHome = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cacheHome, 'blackjack', 'sweep')
+
+
+class SweepCache(object):
+    """
+    Finished sweep cells on disk, one small JSON file per cell named after a
+    hash of everything that decides its result. If the code behind a
+    strategy changes, clear the cache (or use a new directory).
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(rules, strategy, seed, rounds, seats, bankroll):
+        """Returns the cache key for a cell and what went into it."""
+        description = {'rules': asdict(rules), 'strategy': strategy_name(strategy),
+                       'seed': seed, 'rounds': rounds, 'seats': seats, 'bankroll': bankroll}
+        digest = hashlib.sha256(json.dumps(description, sort_keys=True).encode('utf-8')).hexdigest()
+        return digest, description
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """Returns the cached SimulationResult for key, or None."""
+        try:
+            with open(self.path(key)) as file:
+                return SimulationResult.from_dict(json.load(file)['result'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, description, result):
+        # Write to a temporary file first so a crash never leaves half a cell.
+        path = self.path(key)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(dict(description, result=result.as_dict()), file, indent=1, sort_keys=True)
+        os.replace(temporary, path)
+
+
+class Sweep(object):
+    """
+    Runs every strategy under every rule set in a grid through the Dealer
+    game loop, one cell per worker process at a time, and keeps each
+    finished cell in a SweepCache. Running the same sweep again only plays
+    the cells that are new or have changed.
+
+    strategies are Player classes, importable by name like the ones given
+    to MonteCarloRunner; each cell seats the strategy seats times. Every
+    cell plays from the same seed, so differences between rule sets are
+    measured on the same shuffles. The cache is kept in cacheDirectory, by
+    default the one default_cache_directory() returns.
+    """
+
+    def __init__(self, rulesGrid, strategies, rounds, seed=0, seats=1, workers=None,
+                 cacheDirectory=None, bankroll=1000000000):
+        if workers is None:
+            workers = cpu_count()
+        if cacheDirectory is None:
+            cacheDirectory = default_cache_directory()
+        self.rulesGrid = rulesGrid
+        self.strategies = strategies
+        self.rounds = rounds
+        self.seed = seed
+        self.seats = seats
+        self.workers = workers
+        self.cache = SweepCache(cacheDirectory)
+        self.bankroll = bankroll
+        # How many cells the last run() actually played.
+        self.computed = 0
+
+    def run(self):
+        """Returns a SweepCell for every (rules, strategy) pair, in grid order."""
+        cells = [(rules, strategy) for rules in self.rulesGrid for strategy in self.strategies]
+        results = {}
+        missing = []
+        for index, (rules, strategy) in enumerate(cells):
+            key, description = self.cache.key(rules, strategy, self.seed, self.rounds, self.seats, self.bankroll)
+            result = self.cache.get(key)
+            if result is None:
+                missing.append((index, key, description))
+            else:
+                results[index] = result
+        shards = [([cells[index][1]] * self.seats, self.rounds, self.seed, 0, cells[index][0], self.bankroll)
+                  for index, key, description in missing]
+        if self.workers == 1 or len(shards) < 2:
+            self.store(missing, map(run_shard, shards), results)
+        else:
+            with Pool(min(self.workers, len(shards))) as pool:
+                self.store(missing, pool.imap(run_shard, shards), results)
+        self.computed = len(missing)
+        played = {index for index, key, description in missing}
+        return [SweepCell(rules, strategy, results[index], index not in played)
+                for index, (rules, strategy) in enumerate(cells)]
+
+    def store(self, missing, played, results):
+        # Each cell is cached as soon as it finishes, so an interrupted sweep keeps its work.
+        for (index, key, description), result in zip(missing, played):
+            self.cache.put(key, description, result)
+            results[index] = result
+
+
+def describe_rules(rules):
+    """A short description of how rules differ from the defaults."""
+    changes = [f'{field.name}={getattr(rules, field.name)}' for field in fields(RuleSet)
+               if getattr(rules, field.name) != getattr(defaultRules, field.name)]
+    return ', '.join(changes) or 'default rules'
+
+
+def report(cells):
+    """Returns a text table of the house edge in each cell of a sweep."""
+    lines = []
+    for cell in cells:
+        result = cell.result
+        houseEdge = -result.edge * 100
+        lines.append(f'{describe_rules(cell.rules):<60} {cell.strategy.__name__:<20} '
+                     f'{houseEdge:+7.3f}%  ({result.hands:,} hands{", cached" if cell.cached else ""})')
+    return '\n'.join(lines)
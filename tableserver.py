@@ -0,0 +1,364 @@
+"""
+Hosts many blackjack tables in one process with asyncio. Every table is a
+coroutine running an AsyncDealer, and they all share one event loop, so a
+table waiting on a slow player only holds up itself.
+
+Players connect over TCP and play with a line-based text protocol. The
+client starts with:
+
+    JOIN <name> [<table>]
+
+and the server then sends one line at a time, waiting for an answer to
+the ones that are questions:
+
+    WELCOME <table> <chips>
+    BET <chips>                      answer a bet, 0 to sit out, -1 to leave
+    INSURANCE <hand> <dealer card>   answer y or n
+    PLAY <hand> <value> <dealer card> <choices>   answer one of the choices
+    DEALER <hand> <value>            the dealer's hand at the end of a round
+    RESULT <outcome> <bet> <net> <chips>          one for each hand
+    ERROR <message>                  the last answer wasn't understood, or
+                                     the JOIN was refused; questions are asked again
+    BYE <chips>                      the player has left the table
+
+Cards are written as their short name and suit initial, like QH or 10S,
+and a hand as its cards joined by commas. Run a server with:
+
+    python tableserver.py [port] [tables]
+"""
+import asyncio
+import inspect
+import logging
+import sys
+from dealer import Dealer
+from errors import ParseError
+from events import HAND_FINISHED, nullSink
+from player import Player
+from toolbox import parse_choice, parse_number
+
+logger = logging.getLogger(__name__)
+
+
+async def decision(answer):
+    """The answer to a question put to a player, whether they answer at once or must be awaited."""
+    if inspect.isawaitable(answer):
+        answer = await answer
+    return answer
+
+
+class AsyncDealer(Dealer):
+    """
+    A Dealer whose players can take their time. A player's bet_or_leave(),
+    insurance() and play() may be coroutines (see RemotePlayer) or plain
+    methods, so bots can sit at the same table as remote players. Dealing,
+    playing and settling are Dealer's; only the questions are awaited.
+    """
+
+    async def take_bets(self):
+        # Everyone bets at once, so the round waits for the slowest player only.
+        self.accept_bets(await asyncio.gather(*[decision(player.bet_or_leave()) for player in self.players]))
+
+    async def deal(self):
+        self.deal_cards()
+        if self.insurance_offered():
+            await self.offer_insurance()
+
+    async def offer_insurance(self):
+        dealerShowing = self.hands[0][-1]
+        for player in self.players:
+            for hand in player.hands:
+                amount = hand.bet / 2
+                if player.money >= amount and await decision(player.insurance(hand, dealerShowing)):
+                    self.insure(player, hand, amount)
+
+    async def resolve_hands(self):
+        dealerShowing = self.hands[0][-1]
+        apply_play = self.apply_play
+        for player in self.players:
+            for hand in player.hands:
+                while hand.can_hit():
+                    choice, bet = await decision(player.play(hand, dealerShowing))
+                    apply_play(player, hand, choice, bet)
+                if self.sink.isActive:
+                    self.sink.emit(HAND_FINISHED, player, hand)
+        self.play_own_hand()
+
+    async def play_round(self):
+        """
+        Plays one round and returns [(player, (outcome, bet, net)), ...]
+        for every hand settled. Players who leave or go broke are no longer
+        in players afterwards.
+        """
+        await self.take_bets()
+        if not self.players:
+            return []
+        await self.deal()
+        await self.resolve_hands()
+        owners = [player for player in self.players for hand in player.hands]
+        dealerHand = self.hands[0]
+        for player in set(owners):
+            if hasattr(player, 'round_over'):
+                player.round_over(dealerHand)
+        return list(zip(owners, self.payout()))
+
+
+def card_text(card):
+    """A face-up card as it is sent to clients: QH, 10S."""
+    face = card._face
+    return face.shortName + face.suit[0].upper()
+
+
+def hand_text(hand):
+    return ','.join(card_text(card) for card in hand)
+
+
+class RemotePlayer(Player):
+    """
+    A player on the other end of a connection, answering the questions in
+    the protocol above. If an answer doesn't come within timeout seconds
+    (None waits forever), or the connection goes, the player is asked
+    nothing more: they stand, turn down insurance and leave at the next bet.
+    """
+
+    def __init__(self, name, money, reader, writer, timeout=None):
+        super().__init__(name, money)
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.isConnected = True
+        #
+        # Cleared when the player stops answering. A reply that comes after
+        # the timeout is never read, so it can't be taken for the answer to
+        # a later question.
+        #
+        self.isAnswering = True
+        # Set once the player has left the table.
+        self.left = asyncio.Event()
+
+    def send(self, *words):
+        if self.isConnected:
+            self.writer.write((' '.join(str(word) for word in words) + '\n').encode('utf-8'))
+
+    async def ask(self, parse, *words):
+        """
+        Sends a question and returns the answer as parse() (a toolbox
+        parse_ procedure) reads it, asking again until it makes sense.
+        Returns None if no answer comes.
+        """
+        while self.isAnswering:
+            self.send(*words)
+            try:
+                await self.writer.drain()
+                line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            except asyncio.TimeoutError:
+                self.isAnswering = False
+                self.send('ERROR', 'too slow')
+                return None
+            except ConnectionError:
+                line = b''
+            if not line:
+                self.isConnected = False
+                self.isAnswering = False
+                return None
+            answer = parse(line.decode('utf-8', 'replace').strip())
+            if not isinstance(answer, ParseError):
+                return answer
+            self.send('ERROR', answer)
+        return None
+
+    def parse_bet(self, text):
+        bet = parse_number(text)
+        if not isinstance(bet, ParseError) and bet != -1 and not 0 <= bet <= self._chips:
+            bet = ParseError(text, f'is not a bet from 0 to {self._chips:.2f}, or -1 to leave')
+        return bet
+
+    async def bet_or_leave(self):
+        bet = await self.ask(self.parse_bet, 'BET', f'{self._chips:.2f}')
+        return -1 if bet is None else bet
+
+    async def insurance(self, hand, dealerShowing):
+        answer = await self.ask(lambda text: parse_choice(text, {'y', 'n'}),
+                                'INSURANCE', hand_text(hand), card_text(dealerShowing))
+        return answer == 'y'
+
+    async def play(self, hand, dealerShowing):
+        choices = ['s', 'h']
+        if hand.can_double() and self._chips > 0:
+            choices.append('d')
+        if hand.can_split() and self._chips >= hand.bet:
+            choices.append('p')
+        if hand.can_surrender():
+            choices.append('u')
+        choice = await self.ask(lambda text: parse_choice(text, choices),
+                                'PLAY', hand_text(hand), hand.value(), card_text(dealerShowing), ''.join(choices))
+        if choice is None:
+            choice = 's'
+        # A double is for as much as the original bet, or all the player has left.
+        return choice, min(hand.bet, self._chips) if choice == 'd' else None
+
+    def round_over(self, dealerHand):
+        self.send('DEALER', hand_text(dealerHand), dealerHand.value())
+
+    def settled(self, outcome, bet, net):
+        self.send('RESULT', outcome, f'{bet:.2f}', f'{net:.2f}', f'{self._chips:.2f}')
+
+    async def leave(self):
+        """Says goodbye and closes the connection."""
+        self.send('BYE', f'{self._chips:.2f}')
+        self.disconnect()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    def disconnect(self):
+        """Closes the connection without a goodbye."""
+        self.isConnected = False
+        self.isAnswering = False
+        self.writer.close()
+        self.left.set()
+
+
+class Table(object):
+    """
+    One table: an AsyncDealer and up to seats players. Players who join
+    mid-round sit down at the start of the next one. run() plays rounds
+    for as long as anyone is seated and then waits for someone to join.
+    If a round fails, the error is logged and everyone seated is sent
+    away, so one broken table doesn't take the server down.
+    """
+
+    def __init__(self, number, seats=7, shoe=None, rules=None):
+        self.number = number
+        self.seats = seats
+        self.dealer = AsyncDealer(f'Table {number}', 0, shoe, nullSink, rules)
+        self.waiting = []
+        self.rounds = 0
+        self._joined = asyncio.Event()
+
+    def is_full(self):
+        return len(self.dealer.players) + len(self.waiting) >= self.seats
+
+    def join(self, player):
+        """Seats player at the start of the next round."""
+        if self.is_full():
+            raise ValueError(f'Table {self.number} is full.')
+        self.waiting.append(player)
+        self._joined.set()
+
+    async def run(self, rounds=None):
+        """Plays rounds (forever by default) as long as anyone is seated."""
+        dealer = self.dealer
+        while rounds is None or self.rounds < rounds:
+            for player in self.waiting:
+                dealer.deal_in(player)
+            self.waiting = []
+            if not dealer.players:
+                self._joined.clear()
+                await self._joined.wait()
+                continue
+            seated = list(dealer.players)
+            try:
+                settled = await dealer.play_round()
+            except Exception:
+                logger.exception('Table %s: the round failed; sending the players away.', self.number)
+                self.clear()
+                continue
+            for player, (outcome, bet, net) in settled:
+                if hasattr(player, 'settled'):
+                    player.settled(outcome, bet, net)
+            self.rounds += 1
+            for player in seated:
+                if player not in dealer.players and hasattr(player, 'leave'):
+                    await player.leave()
+            # Let the other tables have a turn, even if nobody here had to be waited on.
+            await asyncio.sleep(0)
+
+    def clear(self):
+        """Hangs up on everyone seated and clears away a round that went wrong."""
+        dealer = self.dealer
+        for player in dealer.players:
+            player._hands = []
+            if isinstance(player, RemotePlayer):
+                player.disconnect()
+        dealer.players = []
+        dealer.playerBets = []
+        dealer._hands = []
+
+
+class TableServer(object):
+    """Accepts connections and seats each player at the table they ask for."""
+
+    def __init__(self, tables=10, host='127.0.0.1', port=0, chips=1000, seats=7, rules=None, timeout=60):
+        self.host = host
+        self.port = port
+        self.chips = chips
+        self.timeout = timeout
+        self.tables = [Table(number, seats, rules=rules) for number in range(tables)]
+        self._server = None
+        self._tasks = []
+
+    async def start(self):
+        """Starts listening and starts every table. Returns the server."""
+        self._server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [asyncio.ensure_future(table.run()) for table in self.tables]
+        return self
+
+    async def close(self):
+        """Stops the tables and hangs up on everyone still playing."""
+        self._server.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for table in self.tables:
+            for player in table.dealer.players + table.waiting:
+                if isinstance(player, RemotePlayer):
+                    player.disconnect()
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        await self._server.serve_forever()
+
+    def choose_table(self, words):
+        """Returns the table a JOIN asks for, or the first with a free seat."""
+        if len(words) > 2:
+            number = parse_number(words[2])
+            if isinstance(number, ParseError) or number != int(number) or not 0 <= number < len(self.tables):
+                raise ValueError(f'There is no table {words[2]}.')
+            return self.tables[int(number)]
+        for table in self.tables:
+            if not table.is_full():
+                return table
+        raise ValueError('Every table is full.')
+
+    async def handle_client(self, reader, writer):
+        line = await reader.readline()
+        words = line.decode('utf-8', 'replace').split()
+        try:
+            if len(words) < 2 or words[0].upper() != 'JOIN':
+                raise ValueError('Start with JOIN <name> [<table>].')
+            table = self.choose_table(words)
+            player = RemotePlayer(words[1], self.chips, reader, writer, self.timeout)
+            table.join(player)
+        except ValueError as error:
+            writer.write(f'ERROR {error}\n'.encode('utf-8'))
+            writer.close()
+            return
+        player.send('WELCOME', table.number, f'{self.chips:.2f}')
+        # Keep the connection open until the player leaves the table.
+        await player.left.wait()
+
+
+def main(port=8021, tables=10):
+    server = TableServer(tables, host='0.0.0.0', port=port)
+    print(f'Dealing {tables} tables on port {port}.')
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,46 @@
+import unittest
+from collections import Counter
+from arrayshoe import ArrayShoe
+from dealer import Dealer
+from simulator import Simulator
+from testplayers import MimicPlayer
+
+
+class ArrayShoeTests(unittest.TestCase):
+
+    def test_draws_like_a_shoe(self):
+        shoe = ArrayShoe(1)
+        self.assertEqual(len(shoe), 52)
+        card = shoe.draw().flip()
+        self.assertEqual((card.name, card.suit), ('king', 'diamonds'))
+        self.assertEqual(len(shoe), 51)
+        for _ in range(51):
+            shoe.draw()
+        self.assertRaises(ValueError, shoe.draw)
+
+    def test_shuffle_keeps_composition(self):
+        shoe = ArrayShoe(2)
+        for _ in range(30):
+            shoe.draw()
+        shoe.shuffle()
+        self.assertEqual(len(shoe), 104)
+        self.assertEqual(Counter(shoe.codes), Counter(range(52)) + Counter(range(52)))
+
+    def test_should_shuffle(self):
+        shoe = ArrayShoe(1)
+        self.assertFalse(shoe.should_shuffle())
+        while len(shoe) > shoe.cutCard:
+            shoe.draw()
+        self.assertTrue(shoe.should_shuffle())
+
+    def test_rejects_fractional_decks(self):
+        self.assertRaises(TypeError, ArrayShoe, 0.5)
+
+    def test_dealer_plays_from_array_shoe(self):
+        dealer = Dealer('test', 10000, ArrayShoe())
+        result = Simulator(dealer, [MimicPlayer('bot', 100000)], 300).run()
+        self.assertEqual(result.rounds, 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from basicstrategyplayer import BasicStrategyPlayer, StrategyTables
+from card import Card
+from dealer import Dealer
+from hand import Hand
+from simulator import Simulator
+
+
+def make_hand(*names, bet=10):
+    hand = Hand(bet)
+    for name in names:
+        hand.hit(Card(name, 'hearts').flip())
+    return hand
+
+
+class BasicStrategyPlayerTests(unittest.TestCase):
+
+    def test_decisions(self):
+        player = BasicStrategyPlayer('bot', 1000)
+        six = Card('6', 'clubs').flip()
+        ten = Card('10', 'clubs').flip()
+        self.assertEqual(player.play(make_hand('10', '6'), ten), ('h', None))
+        self.assertEqual(player.play(make_hand('10', '6'), six), ('s', None))
+        self.assertEqual(player.play(make_hand('5', '6'), six), ('d', 10))
+        self.assertEqual(player.play(make_hand('8', '8'), six), ('p', None))
+        self.assertEqual(player.play(make_hand('ace', '7'), ten), ('h', None))
+        # Three cards: the total, not the pair, decides
+        self.assertEqual(player.play(make_hand('2', '2', '10'), ten), ('h', None))
+
+    def test_falls_back_without_chips(self):
+        player = BasicStrategyPlayer('bot', 0)
+        six = Card('6', 'clubs').flip()
+        self.assertEqual(player.play(make_hand('5', '6'), six), ('h', None))
+        # Can't afford to split eights: play sixteen
+        self.assertEqual(player.play(make_hand('8', '8'), six), ('s', None))
+
+    def test_bets_until_broke(self):
+        player = BasicStrategyPlayer('bot', 15, unitBet=10)
+        self.assertEqual(player.bet_or_leave(), 10)
+        player.rake_out(10)
+        self.assertEqual(player.bet_or_leave(), -1)
+
+    def test_rule_files_round_trip(self):
+        tables = BasicStrategyPlayer('bot').tables
+        with tempfile.TemporaryDirectory() as directory:
+            for extension, save, load in [('csv', tables.save_csv, StrategyTables.load_csv),
+                                          ('json', tables.save_json, StrategyTables.load_json)]:
+                path = os.path.join(directory, 'strategy.' + extension)
+                save(path)
+                self.assertEqual(load(path).entries, tables.entries)
+
+    def test_rejects_bad_rows(self):
+        rows = {('hard', total): 'H' * 10 for total in range(4, 22)}
+        rows.update({('soft', total): 'S' * 10 for total in range(12, 22)})
+        StrategyTables(rows)
+        rows[('hard', 16)] = 'HHHQHHHHHH'
+        self.assertRaises(ValueError, StrategyTables, rows)
+
+    def test_simulates(self):
+        dealer = Dealer('test', 0)
+        player = BasicStrategyPlayer('bot', 1000000)
+        result = Simulator(dealer, [player], 2000).run()
+        self.assertEqual(result.rounds, 2000)
+        self.assertAlmostEqual(player.money, 1000000 + result.netWin)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from arrayshoe import ArrayShoe
+from basicstrategyplayer import BasicStrategyPlayer
+from dealer import Dealer
+from events import nullSink
+from rules import RuleSet, defaultRules
+from shuffler import CounterShuffler
+
+try:
+    import numpy
+    from batchtable import BatchTable
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class BatchTableTests(unittest.TestCase):
+
+    def test_matches_dealer(self):
+        for rules in [defaultRules, RuleSet(hitSoft17=False, decks=2, penetration=0.7),
+                      RuleSet(blackjackPayout=1.2, doubleAfterSplit=False, splitLimit=1)]:
+            self.check_matches_dealer(rules)
+
+    def check_matches_dealer(self, rules):
+        # Play each table's round again with a real Dealer and compare.
+        batch = BatchTable(200, seats=3, seed=5, rules=rules)
+        dealer = Dealer('Dealer', 0, ArrayShoe(rules=rules), nullSink, rules)
+        players = [BasicStrategyPlayer(f'Seat {seat}', 1e9) for seat in range(3)]
+        for _ in range(20):
+            batch.take_bets()
+            batch.deal()
+            batch.resolve_hands()
+            outcomes, bets, nets = batch.payout()
+            total = 0.0
+            for table in range(batch.tables):
+                start = batch.roundStart[table]
+                dealer.shoe.load(batch.shoes[table, :start])
+                dealer.players = list(players)
+                dealer.take_bets()
+                dealer.deal()
+                dealer.resolve_hands()
+                total += sum(net for outcome, bet, net in dealer.payout())
+                self.assertEqual(batch.cursors[table], start - dealer.shoe.position)
+            self.assertAlmostEqual(nets.sum(), total)
+            self.assertEqual(len(outcomes), len(bets))
+
+    def test_shoes_come_from_counter_shuffler(self):
+        # Table 3's shoes are stream 3's shoes, as an ArrayShoe would shuffle them.
+        batch = BatchTable(5, seed=8)
+        shoe = ArrayShoe(6, CounterShuffler(8, 3, useNumpy=True))
+        for _ in range(2):
+            batch.shuffle([3])
+            shoe.shuffle()
+            self.assertEqual(batch.shoes[3].tolist(), shoe.codes.tolist())
+            self.assertEqual(batch.cutCards[3], shoe.cutCard)
+
+    def test_exhausted_shoe(self):
+        batch = BatchTable(10, seats=7, seed=2)
+        batch.deal()
+        batch.cursors[4] = 0
+        with self.assertRaises(ValueError):
+            batch.draw(numpy.arange(10))
+        # Nothing is dealt from the other shoes either.
+        self.assertEqual(batch.cursors[0], batch.roundStart[0] - 16)
+
+    def test_run(self):
+        result = BatchTable(100, seats=2, seed=1).run(30)
+        self.assertEqual(result.rounds, 3000)
+        self.assertGreaterEqual(result.hands, 6000)
+        self.assertEqual(sum(result.outcomes.values()), result.hands)
+        again = BatchTable(100, seats=2, seed=1).run(30)
+        self.assertEqual((result.netWin, result.outcomes), (again.netWin, again.outcomes))
+
+
+if __name__ == '__main__':
+    unittest.main()
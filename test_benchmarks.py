@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import benchmarks
+
+
+class BenchmarkTests(unittest.TestCase):
+
+    def test_every_benchmark_runs(self):
+        for name, function in benchmarks.benchmarks.items():
+            with self.subTest(name):
+                self.assertGreater(function(2), 0)
+
+    def test_compare(self):
+        baseline = {'benchmarks': {'a': 1.0, 'b': 1.0, 'c': 1.0}}
+        results = {'benchmarks': {'a': 1.2, 'b': 1.3, 'd': 9.0}}
+        self.assertEqual(benchmarks.compare(results, baseline, 0.25), [('b', 1.0, 1.3, 1.3)])
+        self.assertEqual(benchmarks.compare(results, baseline, 0.5), [])
+
+    def test_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            baseline = os.path.join(directory, 'baseline.json')
+            with open(baseline, 'w') as file:
+                json.dump({'benchmarks': {'card.from_code': 1e-12}}, file)
+            with patch('builtins.print'), patch.multiple(benchmarks, baselineRepeat=1, baselineMinTime=0.001):
+                arguments = ['card.from_code', '--repeat', '1', '--min-time', '0.001', '--output', output]
+                self.assertEqual(benchmarks.main(arguments), 0)
+                self.assertEqual(benchmarks.main(arguments + ['--baseline', output, '--threshold', '10']), 0)
+                self.assertEqual(benchmarks.main(arguments + ['--baseline', baseline]), 1)
+            with open(output) as file:
+                self.assertIn('card.from_code', json.load(file)['benchmarks'])
+
+    def test_baseline_runs_are_long_enough(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, 'baseline.json')
+            with open(baseline, 'w') as file:
+                json.dump({'benchmarks': {'card.from_code': 1.0}}, file)
+            with patch('builtins.print'), patch.object(benchmarks, 'measure', return_value=0.5) as measure:
+                benchmarks.main(['card.from_code', '--repeat', '1', '--min-time', '0.01'])
+                measure.assert_called_with(benchmarks.card_from_code, 1, 0.01)
+                benchmarks.main(['card.from_code', '--repeat', '1', '--min-time', '0.01', '--baseline', baseline])
+                measure.assert_called_with(benchmarks.card_from_code, benchmarks.baselineRepeat,
+                                           benchmarks.baselineMinTime)
+
+    def test_confirm_keeps_the_best_time(self):
+        baseline = {'benchmarks': {'card.from_code': 1.0, 'deck.create': 1.0}}
+        results = {'benchmarks': {'card.from_code': 1.5, 'deck.create': 1.5}}
+        # A noisy first measurement of card.from_code; deck.create really is slower.
+        times = {'card.from_code': [1.1], 'deck.create': [1.6, 1.4]}
+        function = {benchmarks.benchmarks[name]: name for name in times}
+        with patch.object(benchmarks, 'measure', side_effect=lambda f, repeat, minTime: times[function[f]].pop(0)):
+            regressions = benchmarks.confirm(results, baseline, 0.25, retries=2)
+        self.assertEqual(regressions, [('deck.create', 1.0, 1.4, 1.4)])
+        self.assertEqual(results['benchmarks'], {'card.from_code': 1.1, 'deck.create': 1.4})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import MagicMock
+from arrayshoe import ArrayShoe
+from card import Card
+from countingplayer import HiLoPlayer, KOPlayer, OmegaIIPlayer
+from dealer import Dealer
+from events import nullSink
+from deck import Deck
+from humanplayer import HumanPlayer
+from player import Player
+from rules import RuleSet
+from simulator import Simulator
+
+
+class CountingPlayerTests(unittest.TestCase):
+
+    def test_full_deck_counts(self):
+        for playerClass, finalCount in [(HiLoPlayer, 0), (OmegaIIPlayer, 0), (KOPlayer, 4 - 24 + 4)]:
+            player = playerClass('counter', 1000)
+            deck = Deck()
+            deck.flip()
+            player.count_round(deck)
+            self.assertEqual(player.runningCount, finalCount, playerClass.__name__)
+            self.assertEqual(player.cardsSeen, 52)
+
+    def test_count_round_matches_count(self):
+        deck = Deck()
+        deck.flip()
+        batched = HiLoPlayer('batched')
+        single = HiLoPlayer('single')
+        batched.count_round(deck[:20])
+        for card in deck[:20]:
+            single.count(card)
+        self.assertEqual(batched.runningCount, single.runningCount)
+
+    def test_set_rules(self):
+        player = KOPlayer('counter', 1000)
+        player.runningCount = 7
+        player.set_rules(RuleSet(decks=2))
+        self.assertEqual(player.decks, 2)
+        self.assertEqual(player.runningCount, 4 - 4 * 2)
+        # Players that don't count ignore the rules.
+        Player('plain').set_rules(RuleSet(decks=2))
+
+    def test_bet_ramp(self):
+        player = HiLoPlayer('counter', 1000, unitBet=10, maxUnits=4)
+        player.set_rules(RuleSet(decks=2))
+        self.assertEqual(player.bet_or_leave(), 10)
+        # +6 with one deck left is a true count of +6: 5 units, capped at 4
+        player.runningCount = 6
+        player.cardsSeen = 52
+        self.assertEqual(player.trueCount, 6)
+        self.assertEqual(player.bet_or_leave(), 40)
+        self.assertTrue(player.insurance(None, None))
+        player.runningCount = 3
+        self.assertEqual(player.bet_or_leave(), 20)
+
+    def test_dealer_shows_cards_once_per_round(self):
+        dealer = Dealer('test', 0)
+        dealer.sink = nullSink
+        counter = HiLoPlayer('counter', 1000)
+        counter.count_round = MagicMock()
+        dealer.deal_in(counter)
+        dealer.take_bets()
+        dealer.deal()
+        dealer.resolve_hands()
+        cardsPlayed = len(dealer.hands[0]) + sum(len(hand) for hand in counter.hands)
+        dealer.payout()
+        counter.count_round.assert_called_once()
+        self.assertEqual(len(counter.count_round.call_args[0][0]), cardsPlayed)
+
+    def test_reset_on_shuffle(self):
+        dealer = Dealer('test', 0)
+        dealer.sink = nullSink
+        counter = HiLoPlayer('counter', 1000)
+        counter.runningCount = 5
+        dealer.deal_in(counter)
+        dealer.shoe.should_shuffle = MagicMock(return_value=True)
+        dealer.take_bets()
+        dealer.deal()
+        self.assertEqual(counter.runningCount, 0)
+
+    def test_non_counters_are_skipped(self):
+        self.assertFalse(Player('plain').countsCards)
+        self.assertFalse(HumanPlayer('human').countsCards)
+        self.assertTrue(HiLoPlayer('counter').countsCards)
+
+    def test_counter_tracks_the_shoe(self):
+        dealer = Dealer('test', 0, ArrayShoe(6))
+        counter = HiLoPlayer('counter', 1000000)
+        Simulator(dealer, [counter], 30).run()
+        shoe = dealer.shoe
+        # Every card that has left the shoe since the last shuffle was counted
+        self.assertEqual(counter.cardsSeen, 6 * 52 - len(shoe))
+        unseen = [Card.from_code(code).flip() for code in shoe.codes]
+        remaining = HiLoPlayer('remaining')
+        remaining.count_round(unseen)
+        self.assertEqual(counter.runningCount + remaining.runningCount, 0)
+
+    def test_counter_learns_the_decks_from_the_dealer(self):
+        # No MonteCarloRunner here: sitting down at the table is enough.
+        dealer = Dealer('test', 0, rules=RuleSet(decks=2))
+        counter = KOPlayer('counter', 1000000)
+        Simulator(dealer, [counter], 30).run()
+        self.assertEqual(counter.decks, 2)
+        self.assertEqual(counter.decksRemaining, max(len(dealer.shoe) / 52, 0.25))
+        fresh = KOPlayer('fresh')
+        dealer.deal_in(fresh)
+        self.assertEqual(fresh.runningCount, 4 - 4 * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,13 +2,13 @@ import unittest
 from unittest.mock import MagicMock
 from hand import Hand
 from card import Card
-from player import Player
+from testplayers import StubPlayer
 from dealer import Dealer
 
 class DealerTests(unittest.TestCase):
 
     def deal_in_player(self, dealer):
-        player = Player('name', 100)
+        player = StubPlayer('name', 100)
         dealer.deal_in(player)
         self.assertEqual(dealer.players[-1], player)
         return player
@@ -42,14 +42,24 @@ class DealerTests(unittest.TestCase):
         dealer = Dealer('test', 100)
         hand = Hand(100)
         hand.hit(Card('ace', 'diamonds').flip())
-        hand.hit(Card('7', 'diamonds').flip())
+        hand.hit(Card('6', 'diamonds').flip())
         dealer.play(hand, None)
         self.assertEqual(len(hand), 3)
         self.assertFalse(hand.isStanding)
 
+    def test_stands_on_soft_18(self):
+        dealer = Dealer('test', 100)
+        hand = Hand(100)
+        hand.hit(Card('ace', 'diamonds').flip())
+        hand.hit(Card('2', 'diamonds').flip())
+        hand.hit(Card('5', 'diamonds').flip())
+        dealer.play(hand, None)
+        self.assertEqual(len(hand), 3)
+        self.assertTrue(hand.isStanding)
+
     def test_deal_in(self):
         dealer = Dealer('test', 100)
-        player = Player('player', 100)
+        player = StubPlayer('player', 100)
         dealer.deal_in(player)
         self.assertEqual(len(dealer.players), 1)
         self.assertEqual(dealer.players[0], player)
@@ -57,14 +67,14 @@ class DealerTests(unittest.TestCase):
     def test_has_players(self):
         dealer = Dealer('test', 100)
         self.assertFalse(dealer.has_players())
-        player = Player('player', 100)
+        player = StubPlayer('player', 100)
         dealer.deal_in(player)
         self.assertTrue(dealer.has_players())
 
     def test_leave_table(self):
         dealer = Dealer('test', 100)
-        player = Player('player', 100)
-        lPlayer = Player('leavingPlayer', 100)
+        player = StubPlayer('player', 100)
+        lPlayer = StubPlayer('leavingPlayer', 100)
         dealer.deal_in(player)
         dealer.deal_in(lPlayer)
         self.assertEqual(len(dealer.players), 2)
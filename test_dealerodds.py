@@ -0,0 +1,70 @@
+import random
+import unittest
+from arrayshoe import ArrayShoe
+from card import Card
+from cardcollection import CardCollection
+from dealer import Dealer
+from dealerodds import (dealer_probabilities, full_composition, remove_card,
+                        composition_of, outcomes, BLACKJACK, BUST)
+from hand import Hand
+from shuffler import Shuffler
+
+
+class DealerOddsTests(unittest.TestCase):
+
+    def test_probabilities_add_up(self):
+        for upCard in range(1, 11):
+            for hitSoft17 in (True, False):
+                self.assertAlmostEqual(sum(dealer_probabilities(upCard, hitSoft17=hitSoft17)), 1)
+                composition = remove_card(full_composition(1), upCard - 1)
+                self.assertAlmostEqual(sum(dealer_probabilities(upCard, composition, hitSoft17)), 1)
+
+    def test_infinite_deck_values(self):
+        # Well-known figures for an infinite deck when the dealer stands on soft 17.
+        six = dealer_probabilities(6, hitSoft17=False)
+        self.assertAlmostEqual(six[BUST], 0.4232, places=4)
+        self.assertAlmostEqual(six[0], 0.1654, places=4)
+        self.assertAlmostEqual(dealer_probabilities(1)[BLACKJACK], 4 / 13)
+        self.assertAlmostEqual(dealer_probabilities(10)[BLACKJACK], 1 / 13)
+        self.assertGreater(dealer_probabilities(6)[BUST], six[BUST])
+
+    def test_composition(self):
+        self.assertEqual(composition_of(range(52)), full_composition(1))
+        shoe = ArrayShoe(2)
+        shoe.draw()
+        self.assertEqual(shoe.composition(), remove_card(full_composition(2), 9))
+
+    def test_exhausted_composition(self):
+        # Only tens left: a dealer showing a 7 must finish on 17
+        composition = (0,) * 9 + (5,)
+        self.assertEqual(dealer_probabilities(7, composition)[0], 1)
+
+    def test_matches_dealer_play(self):
+        #
+        # Play a lot of dealer hands from a single deck with the six of
+        # hearts taken out and compare the frequencies with the exact answer.
+        #
+        dealer = Dealer('test', 0)
+        upCard = Card('6', 'hearts').flip()
+        shuffler = Shuffler(random.Random(2))
+        trials = 10000
+        counts = dict.fromkeys(outcomes, 0)
+        for _ in range(trials):
+            dealer.shoe = CardCollection()
+            dealer.shoe.extend(Card.from_code(code) for code in range(52) if code != upCard.code)
+            dealer.shoe.shuffle(shuffler)
+            hand = Hand(0)
+            hand.hit(upCard)
+            while hand.can_hit():
+                dealer.play(hand, None)
+            if hand.isBusted:
+                counts['bust'] += 1
+            else:
+                counts[hand.value()] += 1
+        exact = dealer_probabilities(6, remove_card(full_composition(1), 5))
+        for outcome, probability in zip(outcomes, exact):
+            self.assertAlmostEqual(counts[outcome] / trials, probability, delta=0.015)
+
+
+if __name__ == '__main__':
+    unittest.main()
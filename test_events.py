@@ -0,0 +1,85 @@
+import io
+import unittest
+from unittest.mock import patch, MagicMock
+from card import Card
+from dealer import Dealer
+from events import (BinarySink, ConsoleSink, NullSink, read_binary_events,
+                    HAND_HIT, HAND_BUSTED, PAYOUT_STARTS, PLAYER_BUSTS, PLAYER_LOSES,
+                    PLAYER_PUSHES, PLAYER_BLACKJACK, PLAYER_WINS, PLAYER_BROKE)
+from hand import Hand
+from player import Player
+from testplayers import StubPlayer
+
+
+class EventTests(unittest.TestCase):
+
+    def play_round(self, sink):
+        dealer = Dealer('Dealer', 0, sink=sink)
+        player = StubPlayer('Ann', 100)
+        player.bet_or_leave = MagicMock(return_value=10)
+        player.play = MagicMock(return_value=('s', None))
+        dealer.deal_in(player)
+        dealer.take_bets()
+        dealer.deal()
+        dealer.resolve_hands()
+        return dealer.payout()
+
+    def test_console_sink_text(self):
+        with patch('builtins.print') as mockPrint:
+            ConsoleSink().emit(PLAYER_LOSES, Player('Ann'), 10)
+            ConsoleSink().emit(PAYOUT_STARTS)
+        self.assertEqual(mockPrint.call_args_list[0][0][0], 'Ann lost to the dealer, losing $10.00.')
+        self.assertEqual(mockPrint.call_args_list[1][0][0], 'Time to pay out!')
+
+    def test_null_sink_is_silent(self):
+        with patch('builtins.print') as mockPrint:
+            self.play_round(NullSink())
+        mockPrint.assert_not_called()
+
+    def test_null_sink_formats_nothing(self):
+        with patch.object(Hand, '__str__', side_effect=AssertionError('formatted a hand')):
+            self.play_round(NullSink())
+
+    def test_binary_sink(self):
+        file = io.BytesIO()
+        sink = BinarySink(file)
+        results = self.play_round(sink)
+        sink.close()
+        records = read_binary_events(file.getvalue())
+        outcome, bet, net = results[0]
+        settlements = {'bust': PLAYER_BUSTS, 'lose': PLAYER_LOSES, 'push': PLAYER_PUSHES,
+                       'blackjack': PLAYER_BLACKJACK, 'win': PLAYER_WINS}
+        event, seat, value, amount = records[-1]
+        self.assertEqual(event, settlements[outcome])
+        self.assertEqual(seat, 0)
+        self.assertEqual(amount, abs(net) if net else bet)
+        self.assertEqual(sink.seats, ['Ann', 'Dealer'])
+
+    def test_binary_sink_seats(self):
+        sink = BinarySink(io.BytesIO())
+        players = [Player(f'p{number}') for number in range(255)]
+        for player in players:
+            sink.emit(PLAYER_BROKE, player)
+        # A player seen before keeps their seat.
+        sink.emit(PLAYER_BROKE, players[3])
+        self.assertEqual(read_binary_events(sink._buffer)[-1][1], 3)
+        # Seat 255 is for hand events, so there is no room for one more.
+        with self.assertRaises(ValueError):
+            sink.emit(PLAYER_BROKE, Player('one too many'))
+
+    def test_binary_hand_events(self):
+        file = io.BytesIO()
+        hand = Hand(10)
+        hand.isVerbose = True
+        hand.sink = BinarySink(file)
+        king = Card('king', 'clubs').flip()
+        for card in [king, Card('queen', 'clubs').flip(), Card('5', 'clubs').flip()]:
+            hand.hit(card)
+        hand.sink.close()
+        records = read_binary_events(file.getvalue())
+        self.assertEqual(records[0], (HAND_HIT, 255, king.code, 0.0))
+        self.assertEqual(records[-1], (HAND_BUSTED, 255, 25, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
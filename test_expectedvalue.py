@@ -0,0 +1,116 @@
+import unittest
+from card import Card
+from dealerodds import full_composition, remove_card, value_index
+from expectedvalue import ExpectedValue
+from hand import Hand
+from rules import RuleSet
+
+
+def deal(composition, *names):
+    """Returns the cards named (face up) and the composition without them."""
+    cards = []
+    for name in names:
+        card = Card(name, 'hearts').flip()
+        composition = remove_card(composition, value_index(card.code))
+        cards.append(card)
+    return cards, composition
+
+
+def make_hand(cards, rules=None):
+    hand = Hand(10, rules)
+    for card in cards:
+        hand.hit(card)
+    return hand
+
+
+class ExpectedValueTests(unittest.TestCase):
+
+    def evs(self, playerCards, upCard, decks=6, engine=None, rules=None):
+        cards, composition = deal(full_composition(decks), *playerCards, upCard)
+        if engine is None:
+            engine = ExpectedValue()
+        return engine.action_evs(make_hand(cards[:-1], rules), cards[-1], composition)
+
+    def test_legal_actions(self):
+        self.assertEqual(set(self.evs(['10', '6'], '10')), {'s', 'h', 'd'})
+        self.assertEqual(set(self.evs(['8', '8'], '10')), {'s', 'h', 'd', 'p'})
+        self.assertEqual(set(self.evs(['ace', 'king'], '10')), {'s'})
+        surrender = RuleSet(surrender=True)
+        self.assertEqual(set(self.evs(['10', '6'], '10', rules=surrender)), {'s', 'h', 'd', 'u'})
+        # Late surrender: a dealer blackjack still takes the whole bet.
+        cards, composition = deal(full_composition(6), '10', '6', '10')
+        dealerBlackjack = composition[0] / sum(composition)
+        self.assertAlmostEqual(self.evs(['10', '6'], '10', rules=surrender)['u'], -0.5 - 0.5 * dealerBlackjack)
+        self.assertEqual(set(self.evs(['8', '8'], '10', rules=RuleSet(splitLimit=0))), {'s', 'h', 'd'})
+
+    def test_rules_come_from_the_hand(self):
+        engine = ExpectedValue()
+        threeToTwo = self.evs(['ace', 'king'], '10', engine=engine)
+        sixToFive = self.evs(['ace', 'king'], '10', engine=engine, rules=RuleSet(blackjackPayout=1.2))
+        self.assertEqual(engine.rules, RuleSet(blackjackPayout=1.2))
+        self.assertAlmostEqual(sixToFive['s'] / threeToTwo['s'], 1.2 / 1.5)
+
+    def test_split_hands(self):
+        # A hand split from 5s can't double if the rules don't allow it.
+        for doubleAfterSplit in (True, False):
+            rules = RuleSet(doubleAfterSplit=doubleAfterSplit)
+            cards, composition = deal(full_composition(6), '5', '5', '6', '6')
+            hand = make_hand(cards[:2], rules)
+            card = hand.split()
+            split = Hand(10, rules, hand)
+            split.hit(card)
+            split.hit(cards[2])
+            evs = ExpectedValue().action_evs(split, cards[3], composition)
+            self.assertEqual('d' in evs, doubleAfterSplit)
+        # Splitting with no resplits left is worth less than with some.
+        rules = RuleSet(splitLimit=2)
+        cards, composition = deal(full_composition(6), '8', '8', '8', '6')
+        hand = make_hand(cards[:2], rules)
+        first = ExpectedValue().action_evs(hand, cards[3], composition)['p']
+        card = hand.split()
+        split = Hand(10, rules, hand)
+        split.hit(card)
+        split.hit(cards[2])
+        self.assertEqual(split.splits, 1)
+        last = ExpectedValue().action_evs(split, cards[3], composition)['p']
+        self.assertLess(last, first)
+
+    def test_blackjack(self):
+        # Only a dealer blackjack stops a blackjack being paid 3:2.
+        cards, composition = deal(full_composition(6), 'ace', 'king', '10')
+        dealerBlackjack = composition[0] / sum(composition)
+        evs = ExpectedValue().action_evs(make_hand(cards[:2]), cards[2], composition)
+        self.assertAlmostEqual(evs['s'], 1.5 * (1 - dealerBlackjack))
+
+    def test_familiar_decisions(self):
+        cases = [(['10', '6'], '10', 'h'),
+                 (['10', '2'], '6', 's'),
+                 (['5', '6'], '6', 'd'),
+                 (['10', '10'], '6', 's'),
+                 (['8', '8'], '6', 'p'),
+                 (['ace', '7'], '9', 'h')]
+        engine = ExpectedValue()
+        for playerCards, upCard, best in cases:
+            evs = self.evs(playerCards, upCard, engine=engine)
+            self.assertEqual(max(evs, key=evs.get), best, f'{playerCards} vs {upCard}: {evs}')
+
+    def test_pruning_is_close_to_exact(self):
+        # From a six-deck shoe the pruned EVs are within 0.001 of the exact ones.
+        for playerCards, upCard in [(['4', '3'], '10'), (['8', '8'], '6')]:
+            exact = self.evs(playerCards, upCard, engine=ExpectedValue(RuleSet(splitLimit=3), exactDepth=None),
+                             rules=RuleSet(splitLimit=3))
+            pruned = self.evs(playerCards, upCard, rules=RuleSet(splitLimit=3))
+            for choice in exact:
+                self.assertAlmostEqual(exact[choice], pruned[choice], delta=0.001)
+
+    def test_composition_matters(self):
+        # 16 against a ten: with only small cards left, hitting is a sure thing.
+        cards, _ = deal(full_composition(6), '10', '6', '10')
+        composition = (0, 3, 3, 3, 3, 0, 0, 0, 0, 0)
+        evs = ExpectedValue().action_evs(make_hand(cards[:2]), cards[2], composition)
+        self.assertGreater(evs['h'], evs['s'])
+        self.assertGreater(evs['h'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import MagicMock
+from card import Card
+from errors import RuleError
+from hand import Hand
+
+
+def make_hand(*names, bet=10):
+    hand = Hand(bet)
+    for name in names:
+        hand.hit(Card(name, 'hearts').flip())
+    return hand
+
+
+class HandTests(unittest.TestCase):
+
+    def test_values(self):
+        hand = make_hand('ace', '6')
+        self.assertEqual((hand.soft_value(), hand.hard_value(), hand.value()), (17, 7, 17))
+        self.assertTrue(hand.is_soft())
+        hand.hit(Card('9', 'clubs').flip())
+        self.assertEqual((hand.soft_value(), hand.hard_value(), hand.value()), (26, 16, 16))
+        self.assertFalse(hand.is_soft())
+
+    def test_only_one_ace_counts_as_eleven(self):
+        hand = make_hand('ace', 'ace', 'ace')
+        self.assertEqual(hand.value(), 13)
+        self.assertTrue(hand.is_soft())
+
+    def test_status_after_hit(self):
+        self.assertTrue(make_hand('ace', 'king').isBlackJack)
+        twentyOne = make_hand('7', '7', '7')
+        self.assertTrue(twentyOne.isStanding)
+        self.assertFalse(twentyOne.isBlackJack)
+        self.assertTrue(make_hand('king', 'queen', '2').isBusted)
+
+    def test_split_updates_totals(self):
+        hand = make_hand('ace', 'ace')
+        card = hand.split()
+        self.assertTrue(card.isAce)
+        self.assertEqual(hand.value(), 11)
+        hand.hit(Card('king', 'clubs').flip())
+        self.assertEqual(hand.value(), 21)
+
+    def test_hit_face_down_card(self):
+        hand = make_hand('5')
+        with self.assertRaises(Exception):
+            hand.hit(Card('6', 'clubs'))
+        self.assertEqual(len(hand), 1)
+        self.assertEqual(hand.value(), 5)
+        # A card that doesn't go in the hand isn't narrated as a hit.
+        hand.isVerbose = True
+        hand.sink = MagicMock()
+        with self.assertRaises(RuleError):
+            hand.hit(Card('6', 'clubs'))
+        hand.sink.emit.assert_not_called()
+
+    def test_comparisons(self):
+        busted = make_hand('king', 'queen', '5')
+        eighteen = make_hand('king', '8')
+        blackjack = make_hand('ace', 'queen')
+        twentyOne = make_hand('7', '7', '7')
+        self.assertTrue(eighteen > busted)
+        self.assertTrue(busted < eighteen)
+        self.assertTrue(blackjack > twentyOne)
+        self.assertTrue(twentyOne < blackjack)
+        self.assertFalse(twentyOne == blackjack)
+        self.assertTrue(twentyOne > eighteen)
+        self.assertTrue(make_hand('9', '9') == make_hand('10', '8'))
+
+    def test_no_instance_dict_until_needed(self):
+        hand = make_hand('9', '7')
+        self.assertEqual(hand.__dict__, {})
+        self.assertIs(hand.rules, Hand(10).rules)
+        # Anything else can still be set on a hand.
+        hand.isVerbose = True
+        hand.note = 'kept'
+        self.assertEqual(hand.__dict__, {'note': 'kept'})
+
+
+if __name__ == '__main__':
+    unittest.main()
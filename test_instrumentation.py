@@ -0,0 +1,70 @@
+import unittest
+from arrayshoe import ArrayShoe
+from dealer import Dealer
+from instrumentation import Instrumentation, dealerPhases
+from shoe import Shoe
+from shuffler import CounterShuffler
+from simulator import Simulator
+from testplayers import MimicPlayer
+
+
+def play(shoe, rounds=300, instrumentation=None):
+    dealer = Dealer('Dealer', 0, shoe)
+    if instrumentation is not None:
+        instrumentation.attach(dealer)
+    player = MimicPlayer('bot', 1000000)
+    result = Simulator(dealer, [player], rounds).run()
+    return dealer, result
+
+
+class InstrumentationTests(unittest.TestCase):
+
+    def test_counts_phases(self):
+        for shoe in (Shoe(2, CounterShuffler(4)), ArrayShoe(2, CounterShuffler(4))):
+            with self.subTest(type(shoe).__name__):
+                instrumentation = Instrumentation()
+                dealer, result = play(shoe, instrumentation=instrumentation)
+                phases = instrumentation.phases
+                for phase in ('take_bets', 'deal', 'resolve_hands', 'payout'):
+                    self.assertEqual(phases[phase][0], 300)
+                    self.assertGreater(phases[phase][1], 0)
+                self.assertGreaterEqual(phases['play'][0], 300)
+                # The Simulator shuffles once before the first round.
+                self.assertGreater(instrumentation.shuffles, 1)
+                self.assertEqual(phases['shoe.shuffle'][0], instrumentation.shuffles)
+                # Every hand has at least two cards, and the dealer's too.
+                self.assertGreaterEqual(instrumentation.cardsDrawn, 2 * (result.hands + result.rounds))
+
+    def test_results_unchanged(self):
+        instrumentation = Instrumentation()
+        plain = play(Shoe(6, CounterShuffler(7)))[1]
+        timed = play(Shoe(6, CounterShuffler(7)), instrumentation=instrumentation)[1]
+        self.assertEqual(plain.outcomes, timed.outcomes)
+        self.assertEqual(plain.netWin, timed.netWin)
+
+    def test_detach(self):
+        dealer = Dealer('Dealer', 0, Shoe(2, CounterShuffler(1)))
+        play = dealer.play
+        instrumentation = Instrumentation().attach(dealer)
+        self.assertNotEqual(dealer.play, play)
+        instrumentation.detach()
+        self.assertEqual(dealer.play, play)
+        self.assertNotIn('deal', vars(dealer))
+        self.assertNotIn('shuffle', vars(dealer.shoe))
+
+    def test_reports(self):
+        instrumentation = Instrumentation()
+        play(Shoe(1, CounterShuffler(2)), 50, instrumentation)
+        summary = instrumentation.summary()
+        prometheus = instrumentation.prometheus()
+        for phase in dealerPhases:
+            self.assertIn(phase, summary)
+            self.assertIn(f'blackjack_phase_calls_total{{phase="{phase}"}}', prometheus)
+        self.assertIn('blackjack_phase_calls_total{phase="deal"} 50\n', prometheus)
+        self.assertIn(f'blackjack_shuffles_total {instrumentation.shuffles}\n', prometheus)
+        instrumentation.reset()
+        self.assertEqual(instrumentation.phases['deal'], [0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
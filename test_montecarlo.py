@@ -0,0 +1,38 @@
+import unittest
+from montecarlo import MonteCarloRunner
+from simulator import SimulationResult
+from testplayers import MimicPlayer
+
+
+class MonteCarloTests(unittest.TestCase):
+
+    def test_splits_rounds(self):
+        runner = MonteCarloRunner([MimicPlayer], 10, workers=3)
+        self.assertEqual([shard[1] for shard in runner.shards()], [4, 3, 3])
+        self.assertEqual([shard[3] for shard in runner.shards()], [0, 1, 2])
+
+    def test_reproducible(self):
+        first = MonteCarloRunner([MimicPlayer], 600, workers=2, seed=11).run()
+        second = MonteCarloRunner([MimicPlayer], 600, workers=2, seed=11).run()
+        self.assertEqual(first.rounds, 600)
+        self.assertEqual((first.netWin, first.variance, first.outcomes), (second.netWin, second.variance, second.outcomes))
+        other = MonteCarloRunner([MimicPlayer], 600, workers=2, seed=12).run()
+        self.assertNotEqual((first.netWin, first.outcomes), (other.netWin, other.outcomes))
+
+    def test_merge_matches_single_pass(self):
+        hands = [('win', 10, 10), ('lose', 10, -10), ('push', 10, 0), ('blackjack', 10, 15), ('bust', 20, -20)]
+        whole = SimulationResult()
+        first = SimulationResult()
+        second = SimulationResult()
+        for index, hand in enumerate(hands):
+            whole.add_hand(*hand)
+            (first if index < 2 else second).add_hand(*hand)
+        merged = first.merge(second)
+        self.assertEqual(merged.hands, whole.hands)
+        self.assertEqual(merged.outcomes, whole.outcomes)
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.variance, whole.variance)
+
+
+if __name__ == '__main__':
+    unittest.main()
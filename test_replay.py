@@ -0,0 +1,107 @@
+import os
+import random
+import tempfile
+import unittest
+from arrayshoe import ArrayShoe
+from basicstrategyplayer import BasicStrategyPlayer
+from countingplayer import HiLoPlayer
+from dealer import Dealer
+from shuffler import CounterShuffler, Shuffler
+from simulator import Simulator
+from roundlog import RoundLogWriter, RoundLogReader
+from hand import Hand
+from roundlog import RoundRecord
+from replay import Replayer, ScriptedPlayer
+from rules import RuleSet
+
+
+class InsuringPlayer(BasicStrategyPlayer):
+    """Insures every other hand it is offered insurance on."""
+
+    def insurance(self, hand, dealerShowing):
+        self.offers = getattr(self, 'offers', 0) + 1
+        return self.offers % 2 == 1
+
+
+class ReplayTests(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.bjrl')
+        os.close(handle)
+        dealer = Dealer('Dealer', 0, ArrayShoe(6, CounterShuffler(11, 2)))
+        players = [BasicStrategyPlayer('flat', 100000), HiLoPlayer('counter', 100000)]
+        with RoundLogWriter(self.path) as writer:
+            dealer.recorder = writer
+            self.recorded = Simulator(dealer, players, 400).run()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_replay_matches_log(self):
+        replayer = Replayer(self.path)
+        result = replayer.run()
+        self.assertEqual(replayer.mismatches, [])
+        self.assertEqual(result.rounds, self.recorded.rounds)
+        self.assertEqual(result.hands, self.recorded.hands)
+        self.assertAlmostEqual(result.netWin, self.recorded.netWin)
+
+    def test_rule_change_shows_up(self):
+        class StandOnSoft17(Dealer):
+            def play(self, hand, dealerShowing):
+                if hand.value() >= 17:
+                    hand.stand()
+                else:
+                    hand.hit(self.shoe.draw().flip())
+        replayer = Replayer(self.path, dealer=StandOnSoft17('Dealer', 0))
+        replayer.run()
+        self.assertTrue(any(m.field == 'cards' for m in replayer.mismatches))
+
+    def test_stops_after_max_mismatches(self):
+        replayer = Replayer(self.path)
+        # A different seed's shoes won't match anything.
+        replayer.shoe.seek = lambda seed, stream, shoe, position, seek=replayer.shoe.seek: seek(seed + 1, stream, shoe, position)
+        result = replayer.run(maxMismatches=5)
+        self.assertGreaterEqual(len(replayer.mismatches), 5)
+        self.assertLess(result.rounds, self.recorded.rounds)
+
+    def test_scripted_hands_found_by_position(self):
+        # The middle hand was a blackjack off a split, so it is never played.
+        records = [RoundRecord(1, 0, 0, 0, 0, 6, 0, 0, index, (), actions, 10.0, 0.0, 0.0, 0)
+                   for index, actions in enumerate(['ipps', '', 'hs'])]
+        player = ScriptedPlayer('seat')
+        player.load(records)
+        hands = [Hand(10), Hand(10), Hand(10)]
+        for hand in hands:
+            player.add_hand(hand)
+        self.assertEqual(player.play(hands[2], None), ('h', None))
+        self.assertEqual(player.play(hands[0], None), ('p', None))
+        self.assertEqual([player.insurance(hand, None) for hand in hands], [True, False, False])
+
+    def test_insurance_is_replayed(self):
+        rules = RuleSet(insurance=True, decks=2)
+        dealer = Dealer('Dealer', 0, ArrayShoe(2, CounterShuffler(4), rules), rules=rules)
+        with RoundLogWriter(self.path) as writer:
+            dealer.recorder = writer
+            recorded = Simulator(dealer, [InsuringPlayer('insurer', 100000)], 300).run()
+        actions = [record.actions for record in RoundLogReader(self.path)]
+        self.assertTrue(any(action.startswith('i') for action in actions))
+        replayer = Replayer(self.path, dealer=Dealer('Dealer', 0, rules=rules))
+        result = replayer.run()
+        self.assertEqual(replayer.mismatches, [])
+        self.assertAlmostEqual(result.netWin, recorded.netWin)
+
+    def test_shoe_must_match(self):
+        with self.assertRaises(ValueError):
+            Replayer(self.path, decks=2)
+        self.assertEqual(Replayer(self.path, decks=6).decks, 6)
+        # Shoes shuffled by anything but a CounterShuffler can't be rebuilt.
+        dealer = Dealer('Dealer', 0, ArrayShoe(6, Shuffler(random.Random(3))))
+        with RoundLogWriter(self.path) as writer:
+            dealer.recorder = writer
+            Simulator(dealer, [BasicStrategyPlayer('flat', 100000)], 10).run()
+        with self.assertRaises(ValueError):
+            Replayer(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from arrayshoe import ArrayShoe
+from basicstrategyplayer import BasicStrategyPlayer
+from dealer import Dealer
+from events import nullSink
+from shuffler import CounterShuffler
+from simulator import Simulator
+import roundlog
+from roundlog import RoundLogWriter, RoundLogReader
+
+
+class RoundLogTests(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.bjrl')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def simulate(self, rounds, bufferSize=4096):
+        dealer = Dealer('Dealer', 0, ArrayShoe(6, CounterShuffler(7, 3)))
+        players = [BasicStrategyPlayer('one', 100000), BasicStrategyPlayer('two', 100000)]
+        with RoundLogWriter(self.path, bufferSize) as writer:
+            dealer.recorder = writer
+            result = Simulator(dealer, players, rounds).run()
+        return result
+
+    def test_records_every_hand(self):
+        result = self.simulate(300)
+        records = list(RoundLogReader(self.path))
+        playerRecords = [r for r in records if r.seat != roundlog.DEALER_SEAT]
+        self.assertEqual(len(playerRecords), result.hands)
+        self.assertEqual(len(records), result.hands + result.rounds)
+        self.assertAlmostEqual(sum(r.net for r in playerRecords), result.netWin)
+        for r in records:
+            self.assertEqual((r.seed, r.stream), (7, 3))
+            self.assertEqual((r.decks, r.shuffler), (6, roundlog.COUNTER_SHUFFLER))
+            self.assertGreaterEqual(len(r.cards), 2)
+
+    def test_rounds_and_actions(self):
+        self.simulate(200)
+        rounds = list(RoundLogReader(self.path).rounds())
+        self.assertEqual([r[0].round for r in rounds], list(range(1, 201)))
+        for hands in rounds:
+            self.assertEqual(hands[-1].seat, roundlog.DEALER_SEAT)
+            for hand in hands[:-1]:
+                self.assertEqual(roundlog.outcomes[hand.outcome] == 'push', hand.net == 0)
+                if 'd' in hand.actions:
+                    self.assertEqual(hand.bet, 10 + hand.doubleBet)
+                    self.assertTrue(hand.actions.endswith('d'))
+
+    def test_memory_mapped_records(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        self.simulate(100)
+        reader = RoundLogReader(self.path)
+        records = reader.records
+        self.assertEqual(len(records), len(reader))
+        for row, record in zip(records, reader):
+            self.assertEqual(int(row['round']), record.round)
+            self.assertEqual(tuple(row['cards'][:row['cardCount']]), record.cards)
+            self.assertEqual(float(row['net']), record.net)
+
+    def test_rejects_truncated_logs(self):
+        self.simulate(20)
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 5)
+        with self.assertRaisesRegex(ValueError, 'truncated'):
+            RoundLogReader(self.path)
+
+    def test_unshuffled_shoe(self):
+        # A shoe still in box order is logged, not refused.
+        dealer = Dealer('Dealer', 0, ArrayShoe(6, CounterShuffler(7, 3)))
+        dealer.sink = nullSink
+        dealer.deal_in(BasicStrategyPlayer('one', 1000))
+        with RoundLogWriter(self.path) as writer:
+            dealer.recorder = writer
+            dealer.take_bets()
+            dealer.deal()
+            dealer.resolve_hands()
+            dealer.payout()
+        records = list(RoundLogReader(self.path))
+        self.assertEqual(records[0].shoe, roundlog.UNSHUFFLED)
+        self.assertEqual(len(RoundLogReader(self.path)), len(records))
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a round log')
+        with self.assertRaises(ValueError):
+            RoundLogReader(self.path)
+
+    def test_rejects_hands_that_do_not_fit(self):
+        roundInfo = (1, 7, 3, 0, 0, 6, roundlog.COUNTER_SHUFFLER)
+        with RoundLogWriter(self.path) as writer:
+            writer.write_hand(roundInfo, 0, 0, [1, 2], 'hs', 10, 0, 10, 0)
+            with self.assertRaisesRegex(ValueError, 'actions'):
+                writer.write_hand(roundInfo, 0, 0, [1, 2], 'h' * 22, 10, 0, 10, 0)
+            with self.assertRaisesRegex(ValueError, 'seed'):
+                writer.write_hand((1, 2 ** 64, 3, 0, 0, 6, 0), 0, 0, [1, 2], 'hs', 10, 0, 10, 0)
+            with self.assertRaisesRegex(ValueError, 'position'):
+                writer.write_hand((1, 7, 3, 0, -1, 6, 0), 0, 0, [1, 2], 'hs', 10, 0, 10, 0)
+            with self.assertRaisesRegex(ValueError, 'seat'):
+                writer.write_hand(roundInfo, 256, 0, [1, 2], 'hs', 10, 0, 10, 0)
+        # Nothing half-written from the rejected hands.
+        self.assertEqual(len(RoundLogReader(self.path)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
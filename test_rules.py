@@ -0,0 +1,172 @@
+import unittest
+from unittest.mock import MagicMock
+from dataclasses import FrozenInstanceError
+from arrayshoe import ArrayShoe
+from card import Card
+from dealer import Dealer
+from errors import RuleError
+from events import nullSink
+from hand import Hand
+from testplayers import StubPlayer
+from rules import RuleSet, defaultRules
+from shoe import Shoe
+from simulator import Simulator
+from testplayers import MimicPlayer
+
+
+def card(name, suit='hearts'):
+    return Card(name, suit).flip()
+
+
+def make_hand(rules, *names, bet=10):
+    hand = Hand(bet, rules)
+    for name in names:
+        hand.hit(card(name))
+    return hand
+
+
+class RuleSetTests(unittest.TestCase):
+
+    def test_frozen_and_variants(self):
+        rules = RuleSet()
+        with self.assertRaises(FrozenInstanceError):
+            rules.decks = 2
+        sixToFive = rules.variant(blackjackPayout=1.2)
+        self.assertEqual(sixToFive.blackjackPayout, 1.2)
+        self.assertEqual(rules, defaultRules)
+        self.assertEqual(len({rules, sixToFive, RuleSet()}), 2)
+        with self.assertRaises(ValueError):
+            RuleSet(decks=0)
+        with self.assertRaises(ValueError):
+            RuleSet(penetration=1.5)
+
+    def test_shoes_follow_rules(self):
+        rules = RuleSet(decks=2, penetration=0.75)
+        for shoe in [Shoe(rules=rules), ArrayShoe(rules=rules), Shoe(2, rules=rules)]:
+            self.assertEqual(len(shoe), 104)
+            shoe.shuffle()
+            self.assertEqual(shoe.cutCard, 40)
+        self.assertEqual(Shoe(rules=RuleSet(penetration=0.75)).cutCard, 78)
+        for shoeClass in (Shoe, ArrayShoe):
+            self.assertEqual(shoeClass(2).decks, 2)
+            with self.assertRaises(ValueError):
+                shoeClass(6, rules=rules)
+
+    def test_high_penetration_leaves_a_round(self):
+        # Even a shoe dealt almost to the end keeps enough cards for seven players.
+        for decks, penetration in [(1, 0.8), (2, 0.85), (6, 0.95), (1, 1.0)]:
+            dealer = Dealer('Dealer', 10 ** 9, rules=RuleSet(decks=decks, penetration=penetration))
+            players = [MimicPlayer(f'Seat {seat}', 10 ** 9) for seat in range(7)]
+            result = Simulator(dealer, players, 2000).run()
+            self.assertEqual(result.rounds, 2000)
+
+    def test_dealer_hand_follows_rules(self):
+        rules = RuleSet(decks=2, surrender=True)
+        dealer = Dealer('test', 1000, sink=nullSink, rules=rules)
+        dealer.deal()
+        self.assertIs(dealer.hands[0].rules, rules)
+
+    def test_dealer_soft_17(self):
+        for hitSoft17, cards in [(True, 3), (False, 2)]:
+            dealer = Dealer('test', 100, rules=RuleSet(hitSoft17=hitSoft17))
+            hand = make_hand(dealer.rules, 'ace', '6')
+            dealer.play(hand, None)
+            self.assertEqual(len(hand), cards)
+
+    def test_split_limit(self):
+        rules = RuleSet(splitLimit=1)
+        hand = make_hand(rules, '8', '8')
+        card8 = hand.split()
+        hand.hit(card('8', 'clubs'))
+        other = Hand(10, rules, hand)
+        other.hit(card8)
+        other.hit(card('8', 'spades'))
+        self.assertFalse(hand.can_split())
+        self.assertFalse(other.can_split())
+        self.assertTrue(make_hand(defaultRules, '8', '8').can_split())
+        self.assertFalse(make_hand(RuleSet(splitLimit=0), '8', '8').can_split())
+
+    def test_double_after_split(self):
+        for doubleAfterSplit in [True, False]:
+            rules = RuleSet(doubleAfterSplit=doubleAfterSplit)
+            hand = make_hand(rules, '5', '5')
+            hand.split()
+            hand.hit(card('6'))
+            self.assertEqual(hand.can_double(), doubleAfterSplit)
+            self.assertTrue(make_hand(rules, '5', '6').can_double())
+
+
+class DealerRuleTests(unittest.TestCase):
+
+    def play_round(self, rules, choice, dealerCards=('10', '7'), insure=False):
+        dealer = Dealer('test', 1000, sink=nullSink, rules=rules)
+        player = StubPlayer('player', 100)
+        player.bet_or_leave = MagicMock(return_value=20)
+        player.insurance = MagicMock(return_value=False)
+        player.play = MagicMock(return_value=(choice, None))
+        dealer.deal_in(player)
+        dealer.take_bets()
+        dealer.deal()
+        player.insurance = MagicMock(return_value=insure)
+        player.hands[0] = make_hand(rules, '10', '6', bet=20)
+        dealerHand = make_hand(rules, *dealerCards, bet=0)
+        dealer.hands[0] = dealerHand
+        if insure:
+            dealer.offer_insurance()
+        dealer.resolve_hands()
+        return player, dealer.payout()
+
+    def test_surrender(self):
+        player, results = self.play_round(RuleSet(surrender=True), 'u')
+        self.assertEqual(results, [('surrender', 20, -10)])
+        self.assertEqual(player.money, 90)
+
+    def test_surrender_is_late(self):
+        player, results = self.play_round(RuleSet(surrender=True), 'u', dealerCards=('10', 'ace'))
+        self.assertEqual(results, [('lose', 20, -20)])
+        self.assertEqual(player.money, 80)
+
+    def test_surrender_not_allowed(self):
+        with self.assertRaises(RuleError):
+            self.play_round(defaultRules, 'u')
+
+    def test_unknown_play(self):
+        with self.assertRaises(RuleError):
+            self.play_round(defaultRules, 'x')
+
+    def test_insurance(self):
+        rules = RuleSet(insurance=True)
+        player, results = self.play_round(rules, 's', dealerCards=('10', 'ace'), insure=True)
+        # Loses the hand but insurance pays 2:1
+        self.assertEqual(results, [('lose', 20, 0)])
+        self.assertEqual(player.money, 100)
+        player, results = self.play_round(rules, 's', dealerCards=('7', 'ace'), insure=True)
+        # Soft 18 beats 16 and the insurance is lost too
+        self.assertEqual(results, [('lose', 20, -30)])
+        self.assertEqual(player.money, 70)
+
+    def test_players_are_told_the_rules(self):
+        rules = RuleSet(decks=2)
+        dealer = Dealer('test', 1000, sink=nullSink, rules=rules)
+        player = StubPlayer('player', 100)
+        player.set_rules = MagicMock()
+        dealer.deal_in(player)
+        player.set_rules.assert_called_once_with(rules)
+        eightDecks = rules.variant(decks=8)
+        dealer.set_rules(eightDecks)
+        player.set_rules.assert_called_with(eightDecks)
+
+    def test_six_to_five(self):
+        dealer = Dealer('test', 1000, sink=nullSink, rules=RuleSet(blackjackPayout=1.2))
+        player = StubPlayer('player', 100)
+        player.bet_or_leave = MagicMock(return_value=10)
+        dealer.deal_in(player)
+        dealer.take_bets()
+        dealer.deal()
+        player.hands[0] = make_hand(dealer.rules, 'ace', 'king')
+        dealer.hands[0] = make_hand(dealer.rules, '10', '9', bet=0)
+        self.assertEqual(dealer.payout(), [('blackjack', 10, 12)])
+
+
+if __name__ == '__main__':
+    unittest.main()
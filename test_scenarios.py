@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from arrayshoe import ArrayShoe
+from deck import Deck
+from errors import ScenarioError
+from shoe import Shoe
+from scenarios import parse_text, read_scenarios, write_binary
+
+
+class ScenarioTests(unittest.TestCase):
+
+    text = ('# dealer gets a blackjack\n'
+            'King of Hearts\n'
+            '10 of Clubs\n'
+            'Ace of Spades\n'
+            'jack  of  diamonds\n'
+            '\n\n'
+            '2 of Clubs\n'
+            'A of Clubs\n')
+
+    def test_parse_text(self):
+        shoes = parse_text(ScenarioTests.text)
+        self.assertEqual([list(shoe) for shoe in shoes], [[50, 36, 1, 43], [4, 0]])
+
+    def test_error_positions(self):
+        with self.assertRaises(ScenarioError) as context:
+            parse_text('Ace of Spades\nAce of Spudes\n', source='bad.txt')
+        self.assertEqual(context.exception.line, 2)
+        self.assertIn('bad.txt, line 2', str(context.exception))
+        with self.assertRaises(ScenarioError) as context:
+            parse_text('Ace of Spades\n2 of Clubs\nace of spades\n')
+        self.assertEqual(context.exception.line, 3)
+        # Two decks can have two of them
+        self.assertEqual(len(parse_text('Ace of Spades\nace of spades\n', decks=2)[0]), 2)
+
+    def test_binary_round_trip(self):
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            shoes = [list(Deck.codes) * 2, [0, 1, 2]]
+            write_binary(path, shoes)
+            self.assertEqual([list(shoe) for shoe in read_scenarios(path, decks=2)], shoes)
+            with self.assertRaises(ScenarioError):
+                read_scenarios(path, decks=1)
+        finally:
+            os.remove(path)
+
+    def test_load_into_shoes(self):
+        codes = parse_text(ScenarioTests.text)[0]
+        for shoe in [Shoe(), ArrayShoe()]:
+            shoe.load(codes)
+            self.assertEqual(len(shoe), 4)
+            self.assertFalse(shoe.should_shuffle())
+            self.assertEqual(shoe.position, 0)
+            self.assertEqual([shoe.draw().flip().code for _ in range(4)], [43, 1, 36, 50])
+            self.assertEqual(shoe.position, 4)
+
+    def test_load_checks_the_shoe(self):
+        for shoeClass in (Shoe, ArrayShoe):
+            with self.assertRaises(ScenarioError):
+                shoeClass(1).load([0, 5, 0])
+            with self.assertRaises(ScenarioError):
+                shoeClass(1).load([60])
+            with self.assertRaises(ScenarioError):
+                shoeClass(1).load(list(Deck.codes) * 2)
+            shoe = shoeClass(2)
+            shoe.load(list(Deck.codes) * 2)
+            self.assertEqual(len(shoe), 104)
+
+    def test_deck_stack(self):
+        deck = Deck()
+        deck.stack()
+        self.assertEqual(len(deck), 52)
+        self.assertEqual(str(deck.draw().flip()), 'K♢')
+        self.assertEqual(sorted(card.flip().code for card in deck), sorted(set(Deck.codes) - {51}))
+
+
+if __name__ == '__main__':
+    unittest.main()
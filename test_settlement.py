@@ -0,0 +1,61 @@
+import unittest
+from settlement import settle, BUST, LOSE, PUSH, BLACKJACK, WIN, SURRENDER
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#
+# (value, blackjack, bust) for a few player hands.
+#
+hands = [(22, False, True), (20, False, False), (18, False, False), (21, True, False), (21, False, False)]
+
+
+class SettlementTests(unittest.TestCase):
+
+    def settle_lists(self, dealer, payout=1.5):
+        values, blackjacks, busts = zip(*hands)
+        return settle(list(values), list(blackjacks), list(busts), [10] * len(hands), *dealer, payout)
+
+    def test_against_standing_dealer(self):
+        outcomes, nets = self.settle_lists((20, False, False))
+        self.assertEqual(outcomes, [BUST, PUSH, LOSE, BLACKJACK, WIN])
+        self.assertEqual(nets, [-10, 0, -10, 15, 10])
+
+    def test_against_dealer_bust_and_blackjack(self):
+        outcomes, nets = self.settle_lists((24, False, True))
+        self.assertEqual(outcomes, [BUST, WIN, WIN, BLACKJACK, WIN])
+        outcomes, nets = self.settle_lists((21, True, False))
+        self.assertEqual(outcomes, [BUST, LOSE, LOSE, PUSH, LOSE])
+
+    def test_six_to_five(self):
+        outcomes, nets = self.settle_lists((20, False, False), payout=1.2)
+        self.assertAlmostEqual(nets[3], 12)
+
+    def test_late_surrender(self):
+        # Half the bet back, unless the dealer has blackjack.
+        for dealer, outcome, net in [((20, False, False), SURRENDER, -5), ((21, True, False), LOSE, -10)]:
+            self.assertEqual(settle([16], [False], [False], [10], *dealer, surrenders=[True]), ([outcome], [net]))
+            if numpy is not None:
+                outcomes, nets = settle(numpy.array([16]), numpy.array([False]), numpy.array([False]),
+                                        numpy.array([10.0]), *dealer, surrenders=numpy.array([True]))
+                self.assertEqual((outcomes.tolist(), nets.tolist()), ([outcome], [net]))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_arrays_match_lists(self):
+        values, blackjacks, busts = (numpy.array(column) for column in zip(*hands))
+        bets = numpy.full(len(hands), 10.0)
+        for dealer in [(20, False, False), (24, False, True), (21, True, False), (17, False, False)]:
+            outcomes, nets = settle(values, blackjacks, busts, bets, *dealer)
+            expectedOutcomes, expectedNets = self.settle_lists(dealer)
+            self.assertEqual(outcomes.tolist(), expectedOutcomes)
+            self.assertEqual(nets.tolist(), expectedNets)
+        # One dealer per table, broadcast across the seats
+        outcomes, nets = settle(values[None, :].repeat(2, 0), blackjacks, busts, bets,
+                                numpy.array([[20], [17]]), False, numpy.array([[False], [True]]))
+        self.assertEqual(outcomes.tolist(), [[BUST, PUSH, LOSE, BLACKJACK, WIN], [BUST, WIN, WIN, BLACKJACK, WIN]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import random
+import unittest
+from collections import Counter
+from arrayshoe import ArrayShoe
+from shoe import Shoe
+from shuffler import Shuffler, CounterShuffler, fisher_yates, numpy
+
+
+class ShufflerTests(unittest.TestCase):
+
+    def test_reproducible_with_seed(self):
+        first = Shoe(2, Shuffler(random.Random(7)))
+        second = Shoe(2, Shuffler(random.Random(7)))
+        first.shuffle()
+        second.shuffle()
+        self.assertEqual(repr(first), repr(second))
+        self.assertEqual(first.cutCard, second.cutCard)
+
+    def test_shoe_and_array_shoe_agree(self):
+        shoe = Shoe(6, CounterShuffler(42))
+        arrayShoe = ArrayShoe(6, CounterShuffler(42))
+        for _ in range(3):
+            shoe.shuffle()
+            arrayShoe.shuffle()
+        self.assertEqual([card.flip().code for card in shoe], list(arrayShoe.codes))
+
+    def test_counter_shuffler_reproduces_any_shoe(self):
+        shuffler = CounterShuffler(3, stream=1)
+        shoe = ArrayShoe(1, shuffler)
+        for _ in range(5):
+            shoe.shuffle()
+        fifthShoe = shoe.codes
+        replay = CounterShuffler(3, stream=1)
+        replay.shoeNumber = 3
+        replayShoe = ArrayShoe(1, replay)
+        replayShoe.shuffle()
+        self.assertEqual(replayShoe.codes, fifthShoe)
+        otherStream = ArrayShoe(1, CounterShuffler(3, stream=2))
+        otherStream.shuffle()
+        self.assertNotEqual(otherStream.codes, ArrayShoe(1, CounterShuffler(3, stream=1)).codes)
+
+    def test_fisher_yates_is_unbiased(self):
+        #
+        # Every ordering of 3 cards should come up about 1/6 of the time. The
+        # old naive shuffle gives some orderings 5/27 and others 4/27.
+        #
+        rng = random.Random(1)
+        trials = 60000
+        counts = Counter()
+        for _ in range(trials):
+            cards = [0, 1, 2]
+            fisher_yates(cards, RandrangeOnly(rng))
+            counts[tuple(cards)] += 1
+        self.assertEqual(len(counts), 6)
+        expected = trials / 6
+        chiSquared = sum((count - expected) ** 2 / expected for count in counts.values())
+        # 5 degrees of freedom, p = 0.001
+        self.assertLess(chiSquared, 20.5)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy_generators(self):
+        for shuffler in [Shuffler(numpy.random.default_rng(5)), CounterShuffler(5, useNumpy=True)]:
+            arrayShoe = ArrayShoe(6, shuffler)
+            arrayShoe.shuffle()
+            self.assertEqual(Counter(arrayShoe.codes), Counter(list(range(52)) * 6))
+            shoe = Shoe(2, shuffler)
+            shoe.shuffle()
+            self.assertEqual(len(shoe), 104)
+        first = ArrayShoe(6, CounterShuffler(5, useNumpy=True))
+        second = ArrayShoe(6, CounterShuffler(5, useNumpy=True))
+        first.shuffle()
+        second.shuffle()
+        self.assertEqual(first.codes, second.codes)
+
+
+class RandrangeOnly(object):
+    """Hides Random.shuffle() so fisher_yates() uses its own loop."""
+
+    def __init__(self, rng):
+        self.randrange = rng.randrange
+
+
+if __name__ == '__main__':
+    unittest.main()
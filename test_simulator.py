@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import patch
+from dealer import Dealer
+from simulator import Simulator, SimulationResult
+from testplayers import MimicPlayer
+
+
+class SimulatorTests(unittest.TestCase):
+
+    def test_plays_requested_rounds(self):
+        dealer = Dealer('test', 10000)
+        player = MimicPlayer('bot', 100000)
+        result = Simulator(dealer, [player], 500).run()
+        self.assertEqual(result.rounds, 500)
+        self.assertGreaterEqual(result.hands, 500)
+        self.assertEqual(sum(result.outcomes.values()), result.hands)
+        # Every dollar the player won or lost is accounted for
+        self.assertAlmostEqual(player.money, 100000 + result.netWin)
+
+    def test_no_console_output(self):
+        dealer = Dealer('test', 10000)
+        with patch('builtins.print') as mockPrint:
+            Simulator(dealer, [MimicPlayer('bot', 1000)], 50).run()
+        mockPrint.assert_not_called()
+
+    def test_stops_when_players_leave(self):
+        dealer = Dealer('test', 10000)
+        result = Simulator(dealer, [MimicPlayer('bot', 10)], 1000).run()
+        self.assertLess(result.rounds, 1000)
+        self.assertFalse(dealer.has_players())
+
+    def test_result_statistics(self):
+        result = SimulationResult()
+        for outcome, bet, net in [('win', 10, 10), ('lose', 10, -10), ('push', 10, 0), ('blackjack', 10, 15)]:
+            result.add_hand(outcome, bet, net)
+        self.assertEqual(result.hands, 4)
+        self.assertEqual(result.netWin, 15)
+        self.assertAlmostEqual(result.mean, 3.75)
+        self.assertAlmostEqual(result.variance, 368.75 / 3)
+        self.assertAlmostEqual(result.edge, 15 / 40)
+        self.assertEqual(result.outcomes['blackjack'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
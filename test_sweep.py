@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from rules import RuleSet
+from sweep import Sweep, rule_grid, report
+from testplayers import MimicPlayer
+
+
+class SweepTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_rule_grid(self):
+        grid = rule_grid(decks=[2, 6], hitSoft17=[True, False])
+        self.assertEqual(len(grid), 4)
+        self.assertIn(RuleSet(decks=2, hitSoft17=False), grid)
+
+    def test_caches_cells(self):
+        grid = rule_grid(decks=[2, 6], blackjackPayout=[1.5, 1.2])
+        first = Sweep(grid, [MimicPlayer], 200, seed=3, workers=2, cacheDirectory=self.directory)
+        cells = first.run()
+        self.assertEqual(first.computed, 4)
+        self.assertEqual([cell.rules for cell in cells], grid)
+        self.assertFalse(any(cell.cached for cell in cells))
+
+        again = Sweep(grid, [MimicPlayer], 200, seed=3, workers=2, cacheDirectory=self.directory)
+        cachedCells = again.run()
+        self.assertEqual(again.computed, 0)
+        self.assertTrue(all(cell.cached for cell in cachedCells))
+        for cell, cachedCell in zip(cells, cachedCells):
+            self.assertEqual(cell.result.netWin, cachedCell.result.netWin)
+            self.assertAlmostEqual(cell.result.variance, cachedCell.result.variance)
+
+        # Only the new cells are played
+        bigger = Sweep(grid + [RuleSet(hitSoft17=False)], [MimicPlayer], 200, seed=3, workers=1,
+                       cacheDirectory=self.directory)
+        bigger.run()
+        self.assertEqual(bigger.computed, 1)
+        self.assertIn('hitSoft17=False', report(bigger.run()))
+
+        # A player who can go broke plays a different game.
+        poorer = Sweep(grid, [MimicPlayer], 200, seed=3, workers=1, cacheDirectory=self.directory, bankroll=500)
+        poorer.run()
+        self.assertEqual(poorer.computed, 4)
+
+    def test_deep_penetration(self):
+        # A full table dealt deep into a small shoe must finish every cell.
+        grid = rule_grid(decks=[1, 2], penetration=[0.8, 0.95, 1.0])
+        sweep = Sweep(grid, [MimicPlayer], 500, seed=4, seats=7, workers=2, cacheDirectory=self.directory)
+        cells = sweep.run()
+        self.assertEqual(sweep.computed, 6)
+        self.assertEqual([cell.result.rounds for cell in cells], [500] * 6)
+
+    def test_default_cache_directory(self):
+        with patch.dict(os.environ, {'XDG_CACHE_HOME': self.directory}):
+            sweep = Sweep([RuleSet()], [MimicPlayer], 10)
+        self.assertTrue(sweep.cache.directory.startswith(self.directory))
+        self.assertTrue(os.path.isdir(sweep.cache.directory))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,228 @@
+import asyncio
+import unittest
+from basicstrategyplayer import BasicStrategyPlayer
+from card import Card
+from dealer import Dealer
+from events import EventSink, HAND_FINISHED, nullSink
+from hand import Hand
+from rules import RuleSet
+from shoe import Shoe
+from shuffler import CounterShuffler
+from tableserver import AsyncDealer, RemotePlayer, Table, TableServer
+from testplayers import MimicPlayer
+
+
+class AsyncMimicPlayer(MimicPlayer):
+    """MimicPlayer, but every decision has to be awaited."""
+
+    async def bet_or_leave(self):
+        await asyncio.sleep(0)
+        return super().bet_or_leave()
+
+    async def play(self, hand, dealerShowing):
+        await asyncio.sleep(0)
+        return super().play(hand, dealerShowing)
+
+
+class BrokenPlayer(MimicPlayer):
+    """Bets, and then fails when asked to play."""
+
+    def play(self, hand, dealerShowing):
+        raise RuntimeError('broken player')
+
+
+class Writer(object):
+    """Collects what a RemotePlayer sends, in place of a connection."""
+
+    def __init__(self):
+        self.lines = []
+        self.isClosed = False
+
+    def write(self, data):
+        self.lines.append(data.decode().strip())
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.isClosed = True
+
+
+class Client(object):
+    """A stand-in for a remote player: answers the server's questions from a few rules."""
+
+    def __init__(self, name, bets, table=None, play='s', insurance='n'):
+        self.name = name
+        self.bets = list(bets)
+        self.table = table
+        self.playChoice = play
+        self.insuranceChoice = insurance
+        self.lines = []
+
+    async def run(self, port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        join = f'JOIN {self.name}' + ('' if self.table is None else f' {self.table}')
+        writer.write((join + '\n').encode())
+        while True:
+            line = (await reader.readline()).decode().strip()
+            if not line:
+                break
+            self.lines.append(line)
+            word = line.split()[0]
+            if word == 'BET':
+                writer.write((self.bets.pop(0) if self.bets else '-1').encode() + b'\n')
+            elif word == 'PLAY':
+                writer.write(self.playChoice.encode() + b'\n')
+            elif word == 'INSURANCE':
+                writer.write(self.insuranceChoice.encode() + b'\n')
+            elif word == 'BYE':
+                break
+        writer.close()
+        await writer.wait_closed()
+        return self
+
+    def sent(self, word):
+        return [line for line in self.lines if line.split()[0] == word]
+
+
+class RecordingSink(EventSink):
+    """Keeps every event it is sent."""
+
+    isActive = True
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, *args):
+        self.events.append((event, args))
+
+
+def sync_rounds(seed, rounds, player, sink=nullSink):
+    dealer = Dealer('Dealer', 0, Shoe(2, CounterShuffler(seed)), sink)
+    dealer.deal_in(player)
+    for _ in range(rounds):
+        dealer.take_bets()
+        dealer.deal()
+        dealer.resolve_hands()
+        dealer.payout()
+    return player.money
+
+
+class AsyncDealerTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_same_game_as_dealer(self):
+        expected = sync_rounds(5, 200, MimicPlayer('bot', 10000))
+        for player in (MimicPlayer('bot', 10000), AsyncMimicPlayer('bot', 10000)):
+            dealer = AsyncDealer('Dealer', 0, Shoe(2, CounterShuffler(5)), nullSink)
+            dealer.deal_in(player)
+            for _ in range(200):
+                await dealer.play_round()
+            self.assertEqual(player.money, expected)
+
+    async def test_same_events_as_dealer(self):
+        expected = RecordingSink()
+        sync_rounds(5, 50, MimicPlayer('bot', 10000), expected)
+        sink = RecordingSink()
+        dealer = AsyncDealer('Dealer', 0, Shoe(2, CounterShuffler(5)), sink)
+        dealer.deal_in(AsyncMimicPlayer('bot', 10000))
+        for _ in range(50):
+            await dealer.play_round()
+        self.assertIn(HAND_FINISHED, [event for event, args in sink.events])
+        self.assertEqual([event for event, args in sink.events], [event for event, args in expected.events])
+
+    async def test_no_questions_after_a_timeout(self):
+        reader = asyncio.StreamReader()
+        writer = Writer()
+        player = RemotePlayer('slow', 100, reader, writer, timeout=0.05)
+        self.assertEqual(await player.bet_or_leave(), -1)
+        # The answer comes too late: it is left unread and the player just stands.
+        reader.feed_data(b'h\n')
+        hand = Hand(10)
+        for name in ('10', '6'):
+            hand.hit(Card(name, 'hearts').flip())
+        self.assertEqual(await asyncio.wait_for(player.play(hand, Card('10', 'clubs').flip()), 0.01), ('s', None))
+        self.assertEqual(writer.lines, ['BET 100.00', 'ERROR too slow'])
+
+    async def test_failed_round_sends_players_away(self):
+        table = Table(0, shoe=Shoe(1, CounterShuffler(1)))
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'10\ns\ns\n')
+        remote = RemotePlayer('remote', 100, reader, Writer())
+        table.join(remote)
+        table.join(BrokenPlayer('broken', 100))
+        with self.assertLogs('tableserver', 'ERROR'):
+            task = asyncio.ensure_future(table.run())
+            await asyncio.wait_for(remote.left.wait(), 2)
+        self.assertTrue(remote.writer.isClosed)
+        self.assertEqual((table.dealer.players, table.dealer.hands, table.rounds), ([], [], 0))
+        # The table carries on for anyone who joins later.
+        bot = BasicStrategyPlayer('bot', 1000)
+        table.join(bot)
+        while table.rounds < 3:
+            await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def test_many_tables_share_the_loop(self):
+        tables = [Table(number, shoe=Shoe(1, CounterShuffler(number))) for number in range(100)]
+        for table in tables:
+            table.join(BasicStrategyPlayer('bot', 100000))
+            table.join(AsyncMimicPlayer('mimic', 100000))
+        await asyncio.gather(*[table.run(5) for table in tables])
+        self.assertEqual([table.rounds for table in tables], [5] * 100)
+
+
+class TableServerTests(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await TableServer(tables=2, seats=2, timeout=5,
+                                        rules=RuleSet(insurance=True, surrender=True)).start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_plays_rounds(self):
+        client = await asyncio.wait_for(Client('alice', ['abc', '5000', '10', '10', '0', '10'], 1)
+                                        .run(self.server.port), 10)
+        self.assertEqual(client.lines[0], 'WELCOME 1 1000.00')
+        # Both bad bets are asked again.
+        self.assertEqual(len(client.sent('ERROR')), 2)
+        self.assertEqual(len(client.sent('RESULT')), 3)
+        self.assertEqual(len(client.sent('DEALER')), 3)
+        chips = float(client.sent('RESULT')[-1].split()[-1])
+        self.assertEqual(client.lines[-1], f'BYE {chips:.2f}')
+        for line in client.sent('PLAY'):
+            self.assertTrue(line.split()[-1].startswith('sh'))
+
+    async def test_slow_player_only_holds_up_their_table(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        writer.write(b'JOIN slow 0\n')
+        # The slow player never answers, but table 1 carries on.
+        client = await asyncio.wait_for(Client('fast', ['10'] * 5, 1).run(self.server.port), 4)
+        self.assertEqual(len(client.sent('RESULT')), 5)
+        self.assertEqual(self.server.tables[0].rounds, 0)
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_timeout(self):
+        self.server.timeout = 0.1
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        writer.write(b'JOIN slow 0\n')
+        lines = [(await asyncio.wait_for(reader.readline(), 2)).decode().strip() for _ in range(4)]
+        # No answer to the bet counts as leaving the table.
+        self.assertEqual(lines, ['WELCOME 0 1000.00', 'BET 1000.00', 'ERROR too slow', 'BYE 1000.00'])
+        # The server hangs up after the BYE.
+        self.assertEqual(await reader.read(), b'')
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_join_errors(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        writer.write(b'JOIN bob 7\n')
+        self.assertEqual(await reader.readline(), b'ERROR There is no table 7.\n')
+        writer.close()
+        await writer.wait_closed()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import toolbox
+from dealer import Dealer
+from card import Card
+from hand import Hand
+from humanplayer import HumanPlayer
+from rules import RuleSet, defaultRules
+from shoe import Shoe
+from shuffler import CounterShuffler
+from errors import ParseError
+from toolbox import (ScriptedInput, FileInput, BatchedStdinInput, set_input_provider, get_integer,
+                     get_number_between, get_boolean, get_string, is_integer, is_number, parse_integer,
+                     parse_number, parse_choice, parse_column, parse_numbers, parse_integers)
+
+
+class Pipe(object):
+    """
+    A pipe with someone typing into the other end: only what has been sent
+    can be read, and asking for more than that would wait forever.
+    """
+
+    def __init__(self, binary):
+        self.data = b''
+        self.isClosed = False
+        if binary:
+            self.read1 = self._read1
+
+    def send(self, text):
+        self.data += text.encode('utf-8')
+
+    def close(self):
+        self.isClosed = True
+
+    def _read1(self, size=-1):
+        if not self.data and not self.isClosed:
+            raise AssertionError('read1() would wait on an empty pipe')
+        data, self.data = self.data[:size], self.data[size:]
+        return data
+
+    def readline(self):
+        if b'\n' not in self.data and not self.isClosed:
+            raise AssertionError('readline() would wait for a line that has not been sent')
+        end = self.data.find(b'\n') + 1 or len(self.data)
+        line, self.data = self.data[:end], self.data[end:]
+        return line.decode('utf-8')
+
+    def read(self, size=-1):
+        raise AssertionError('read() would wait for a whole block')
+
+class InputProviderTests(unittest.TestCase):
+
+    def tearDown(self):
+        set_input_provider(None)
+
+    def test_scripted_reprompts(self):
+        script = ScriptedInput(['ten', '12', '-.5', '', '42', 'maybe', 'yes', '', 'Lloyd'])
+        set_input_provider(script)
+        self.assertEqual(get_integer('How many?'), 12)
+        self.assertEqual(get_number_between(0, 100, 'How much?'), 42)
+        self.assertTrue(get_boolean('Sure?'))
+        self.assertEqual(get_string('Name?'), 'Lloyd')
+        self.assertEqual(script.remaining, 0)
+        self.assertEqual(script.prompts[:2], ['How many? ', 'How many? (integers only) '])
+        with self.assertRaises(EOFError):
+            get_string('More?')
+
+    def test_set_input_provider(self):
+        script = ScriptedInput(['7'])
+        previous = set_input_provider(script)
+        self.assertIsInstance(previous, toolbox.ConsoleInput)
+        self.assertIs(set_input_provider(None), script)
+        with patch('builtins.input', return_value='7') as mockInput:
+            self.assertEqual(get_integer('Number:'), 7)
+        mockInput.assert_called_once_with('Number: ')
+
+    def test_file_input(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'answers.txt')
+            with open(path, 'w') as file:
+                file.write('3\nn\n')
+            set_input_provider(FileInput(path))
+            self.assertEqual(get_integer('Number:'), 3)
+            self.assertFalse(get_boolean('Again?'))
+
+    def test_batched_stdin(self):
+        text = '1\r\n22\n\n333\n♢♢\n4444'
+        for stream in (io.StringIO(text), io.BytesIO(text.encode('utf-8'))):
+            provider = BatchedStdinInput(stream, blockSize=3)
+            self.assertEqual([provider() for _ in range(6)], ['1', '22', '', '333', '♢♢', '4444'])
+            with self.assertRaises(EOFError):
+                provider()
+
+    def test_batched_stdin_does_not_wait_on_a_live_pipe(self):
+        for binary in (True, False):
+            pipe = Pipe(binary)
+            provider = BatchedStdinInput(pipe)
+            for answer in ('10', 'h', 's'):
+                pipe.send(answer + '\n')
+                self.assertEqual(provider(), answer)
+            pipe.send('two\nlines\n')
+            self.assertEqual([provider(), provider()], ['two', 'lines'])
+            pipe.close()
+            with self.assertRaises(EOFError):
+                provider()
+
+    def test_drives_human_player(self):
+        dealer = Dealer('Dealer', 1000, Shoe(6, CounterShuffler(3)))
+        dealer.shoe.shuffle()
+        player = HumanPlayer('Lloyd', 100)
+        dealer.deal_in(player)
+        script = ScriptedInput(['oops', '10'] + ['s'] * 4)
+        set_input_provider(script)
+        with patch('builtins.print'):
+            dealer.take_bets()
+            dealer.deal()
+            dealer.resolve_hands()
+            dealer.payout()
+        self.assertIn(player.money, [90, 100, 110, 115])
+        self.assertTrue(script.prompts[1].endswith('(numbers only) '))
+        self.assertLessEqual(script.position, 3)
+
+    def test_human_player_can_surrender(self):
+        dealerShowing = Card('10', 'clubs').flip()
+        for rules, choice in [(RuleSet(surrender=True), 'u'), (defaultRules, 's')]:
+            hand = Hand(10, rules)
+            for name in ('10', '6'):
+                hand.hit(Card(name, 'hearts').flip())
+            # Without surrender in the rules 'u' is asked again.
+            set_input_provider(ScriptedInput(['u', 's']))
+            with patch('builtins.print'):
+                self.assertEqual(HumanPlayer('Lloyd', 100).play(hand, dealerShowing), (choice, None))
+
+
+class ParseTests(unittest.TestCase):
+
+    def test_parse_integer(self):
+        for text, value in [('12', 12), (' -7 ', -7), ('+3', 3), ('5.0', 5), ('5.', 5), ('-.0', 0),
+                            ('123456789012345678901234567890.00', 123456789012345678901234567890), (8, 8)]:
+            self.assertEqual(parse_integer(text), value, text)
+            self.assertIsInstance(parse_integer(text), int)
+            self.assertTrue(is_integer(text))
+        for text in ['', '.', '+', '-', '-.', '5.5', '1e3', 'ten', '1 2', '0x10']:
+            error = parse_integer(text)
+            self.assertIsInstance(error, ParseError, text)
+            self.assertEqual(error.text, text)
+            self.assertFalse(is_integer(text))
+
+    def test_parse_number(self):
+        for text, value in [('12', 12.0), ('-.5', -0.5), ('5.', 5.0), (' +2.25', 2.25), (1.5, 1.5)]:
+            self.assertEqual(parse_number(text), value, text)
+            self.assertTrue(is_number(text))
+        for text in ['', '.', '-', '-.', '+.', '1.2.3', '1e3', 'nan', 'inf', '1_000', '$5']:
+            self.assertIsInstance(parse_number(text), ParseError, text)
+            self.assertFalse(is_number(text))
+
+    def test_parse_choice(self):
+        choices = {'s', 'h', 'd'}
+        self.assertEqual(parse_choice(' H ', choices), 'h')
+        self.assertIsInstance(parse_choice('sh', choices), ParseError)
+        self.assertIsInstance(parse_choice('', choices), ParseError)
+
+    def test_columns(self):
+        values, errors = parse_numbers(['10', '2.5', '-.', '40', 'x'])
+        self.assertEqual(values, [10.0, 2.5, None, 40.0, None])
+        self.assertEqual([(error.index, error.text) for error in errors], [(2, '-.'), (4, 'x')])
+        self.assertIn('entry 2', str(errors[0]))
+        values, errors = parse_column(['s', 'P', 'q'], parse_choice, choices={'s', 'h', 'p'})
+        self.assertEqual(values, ['s', 'p', None])
+        self.assertEqual(errors[0].index, 2)
+
+    def test_columns_from_generators(self):
+        lines = io.StringIO('10\nten\n2.5\n')
+        values, errors = parse_numbers(line.strip() for line in lines)
+        self.assertEqual(values, [10.0, None, 2.5])
+        self.assertEqual([(error.index, error.text) for error in errors], [(1, 'ten')])
+        values, errors = parse_integers(text for text in ['1', '1.5'])
+        self.assertEqual((values, errors[0].index), ([1, None], 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
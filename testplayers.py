@@ -0,0 +1,23 @@
+#
+# Players shared by the tests. This isn't a test module itself, so pytest
+# doesn't collect it, and the classes can be pickled by name for the
+# worker processes of MonteCarloRunner and Sweep.
+#
+from player import Player
+
+
+class MimicPlayer(Player):
+    """Bets a flat amount and plays like the dealer."""
+
+    def bet_or_leave(self):
+        return 10 if self.money >= 10 else -1
+
+    def play(self, hand, dealerShowing):
+        return ('h' if hand.value() < 17 else 's'), None
+
+
+class StubPlayer(Player):
+    """
+    A Player that the tests can give mock methods. Player has no __dict__,
+    but a subclass without __slots__ gets one.
+    """
@@ -1,6 +1,135 @@
 #
 # These are procedures that I'm going to use over and over again.
 #
+import codecs
+import re
+import sys
+from errors import ParseError
+
+
+#
+# Where the get_ procedures below read their answers from. The console is
+# the default; set_input_provider() swaps in a script, a file or a batched
+# stdin reader so a game can be played without anyone typing. A provider
+# is anything that can be called like input(): it takes a prompt and
+# returns one line without its newline, and raises EOFError when it has no
+# more lines.
+#
+class ConsoleInput(object):
+    """Asks on the console with input(), showing the prompt."""
+
+    def __call__(self, prompt=''):
+        return input(prompt)
+
+
+class ScriptedInput(object):
+    """
+    Answers from a list of strings kept in memory, one per question, without
+    showing the prompts. The prompts it was asked are kept in prompts, which
+    helps to see where a script went wrong.
+    """
+
+    def __init__(self, answers, echo=False):
+        self.answers = list(answers)
+        self.position = 0
+        self.prompts = []
+        self.echo = echo
+
+    def __call__(self, prompt=''):
+        self.prompts.append(prompt)
+        if self.position >= len(self.answers):
+            raise EOFError(f'The script ran out of answers at: {prompt}')
+        answer = self.answers[self.position]
+        self.position += 1
+        if self.echo:
+            print(prompt + answer)
+        return answer
+
+    def get_remaining(self):
+        return len(self.answers) - self.position
+
+    remaining = property(get_remaining)
+
+
+class FileInput(ScriptedInput):
+    """Answers from the lines of a text file, one per question."""
+
+    def __init__(self, path, echo=False):
+        with open(path) as file:
+            super().__init__(file.read().splitlines(), echo)
+        self.path = path
+
+
+class BatchedStdinInput(object):
+    """
+    Answers from a stream (stdin by default) without writing the prompts,
+    so piping a long session into a game isn't held up by the terminal.
+    Only input that is already there is read: a binary stream such as
+    sys.stdin.buffer is read up to blockSize bytes at a time with read1(),
+    and a text stream a line at a time (its own buffer reads ahead in
+    blocks). Nothing waits for more input than the next answer, so a
+    player on the other end of a live pipe is never left hanging.
+    """
+
+    def __init__(self, stream=None, blockSize=1 << 16):
+        if stream is None:
+            stream = sys.stdin
+        self.stream = stream
+        self.blockSize = blockSize
+        self._lines = []
+        self._position = 0
+        self._partial = ''
+        # Binary streams come in as bytes, and a character may be split between reads.
+        self._decoder = codecs.getincrementaldecoder('utf-8')() if hasattr(stream, 'read1') else None
+
+    def read_block(self):
+        """Returns the input that is ready, waiting only if there is none, and '' at the end."""
+        if self._decoder is None:
+            return self.stream.readline()
+        while True:
+            data = self.stream.read1(self.blockSize)
+            text = self._decoder.decode(data, final=not data)
+            # Only the start of a character came in; it isn't the end of the input.
+            if text or not data:
+                return text
+
+    def __call__(self, prompt=''):
+        while self._position >= len(self._lines):
+            block = self.read_block()
+            if not block:
+                if self._partial:
+                    line, self._partial = self._partial, ''
+                    return line
+                raise EOFError(f'No more input at: {prompt}')
+            lines = (self._partial + block).split('\n')
+            self._partial = lines.pop()
+            self._lines = lines
+            self._position = 0
+        line = self._lines[self._position]
+        self._position += 1
+        return line.rstrip('\r')
+
+
+_inputProvider = ConsoleInput()
+
+
+def set_input_provider(provider):
+    """
+    Makes provider the source of every answer the get_ procedures read, and
+    returns the provider it replaces. None goes back to the console.
+    """
+    global _inputProvider
+    previous = _inputProvider
+    if provider is None:
+        provider = ConsoleInput()
+    _inputProvider = provider
+    return previous
+
+
+def get_input(prompt=''):
+    """Reads one line from the current input provider."""
+    return _inputProvider(prompt)
+
 
 def get_integer(prompt):
     """Asks the user the prompt and verifies they enter an integer"""
@@ -9,7 +138,7 @@ def get_integer(prompt):
     #
     if prompt[-1] != " ":
         prompt = prompt + " "
-    number = input(prompt)
+    number = parse_integer(get_input(prompt))
     #
     # We're only going to use prompt again if they entered something that
     # is not an integer, so it's simpler just to change the prompt once
@@ -19,81 +148,118 @@ def get_integer(prompt):
     #
     # If they didn't enter an integer, ask them to enter one.
     #
-    while not is_integer(number):
-        number = input(prompt)
-    number = int(number)
+    while isinstance(number, ParseError):
+        number = parse_integer(get_input(prompt))
     return number
 
 
+#
+# What the parse_ procedures accept, checked in one pass by the regular
+# expression engine instead of a character at a time. An integer may have a
+# sign and a decimal point followed only by zeros ("5.0" is 5). A number
+# may have a sign and one decimal point, but no exponent, and neither may
+# be only a sign and a point ("-."). Spaces around either are ignored.
+#
+_integerPattern = re.compile(r'\s*([+-]?(?:[0-9]+(?:\.0*)?|\.0+))\s*')
+_numberPattern = re.compile(r'\s*([+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+))\s*')
+
+
+def parse_integer(text):
+    """Returns text as an int, or a ParseError saying why it isn't one."""
+    string = str(text)
+    if string.isdigit() and string.isascii():
+        return int(string)
+    match = _integerPattern.fullmatch(string)
+    if match is None:
+        return ParseError(text, 'is not an integer')
+    # Anything after the point is zeros, and a bare ".0" is zero.
+    whole = match.group(1).partition('.')[0]
+    return int(whole) if whole not in ('', '+', '-') else 0
+
+
+def parse_number(text):
+    """Returns text as a float, or a ParseError saying why it isn't a number."""
+    string = str(text)
+    # Most input is plain digits, which doesn't need the pattern.
+    if string.isdigit() and string.isascii():
+        return float(string)
+    match = _numberPattern.fullmatch(string)
+    if match is None:
+        return ParseError(text, 'is not a number')
+    return float(match.group(1))
+
+
+def parse_choice(text, choices):
+    """
+    Returns text, stripped and in lower case, if it is one of choices (a
+    collection of lower case strings such as {'s', 'h', 'd'}), or a
+    ParseError.
+    """
+    choice = str(text).strip().lower()
+    if choice not in choices:
+        return ParseError(text, f'is not one of {", ".join(sorted(choices))}')
+    return choice
+
+
+def parse_column(texts, parse=parse_number, **options):
+    """
+    Parses every entry of a column of input, a whole file of scripted bets
+    or plays for instance, with one of the parse_ procedures (and any
+    keyword arguments it takes, like choices for parse_choice()). Returns
+    (values, errors): the parsed values, with None where an entry was bad,
+    and a ParseError for each bad entry, its index set.
+    """
+    values = [parse(text, **options) for text in texts]
+    errors = []
+    for index, value in enumerate(values):
+        if isinstance(value, ParseError):
+            errors.append(ParseError(value.text, value.reason, index))
+            values[index] = None
+    return values, errors
+
+
+def parse_integers(texts):
+    """parse_column() for a column of integers."""
+    return parse_column(texts, parse_integer)
+
+
+def parse_numbers(texts):
+    """
+    parse_column() for a column of numbers, bets for instance. This is the
+    one to use for big columns: it checks each entry with the pattern
+    directly instead of calling parse_number() for it. texts is read once,
+    so it can be a generator, the lines of a file for instance.
+    """
+    texts = list(texts)
+    fullmatch = _numberPattern.fullmatch
+    # float() ignores the same spaces around a number that the pattern does.
+    values = [float(text) if (text.isdigit() and text.isascii()) or fullmatch(text) else None
+              for text in map(str, texts)]
+    errors = [ParseError(text, 'is not a number', index)
+              for index, text in enumerate(texts) if values[index] is None]
+    return values, errors
+
+
 def is_integer(number):
     """Returns True is number is an interger else it returns False."""
-    isInteger = True
-    #
-    # Remove leading and trailing whites space and
-    # check for 4 special cases of non-integers. Then
-    # remove any leading positive or negative signs.
-    #
-    number = str(number).strip()
-    if number in ['', '.', '+', '-']:
-        isInteger = False
-    if isInteger and number[0] in '+-':
-        number = number[1:]
-        #
-    # Loop through the string checking to make sure
-    # the characters are all legal integer characters.
-    #
-    position = 0
-    legalValues = '0123456789.'
-    while isInteger and position <= len(number) - 1:
-        if number[position] not in legalValues:
-            isInteger = False
-        if number[position] == '.':
-            legalValues = '0'
-        position += 1
-
-    return isInteger
+    return not isinstance(parse_integer(number), ParseError)
 
 
 def get_number(prompt):
     """Asks the user the prompt and verifies they enter a float"""
     if prompt[-1] != " ":
         prompt += " "
-    number = input(prompt)
-    while not is_number(number):
+    number = parse_number(get_input(prompt))
+    while isinstance(number, ParseError):
         if prompt[-16:] != " (numbers only) ":
             prompt = prompt + "(numbers only) "
-        number = input(prompt)
-    number = float(number)
+        number = parse_number(get_input(prompt))
     return number
 
 
 def is_number(number):
     '''Returns True is testValue is a number, otherwise returns False.'''
-    isNumber = True
-    testValue = str(number)
-    isNumber = True
-    #
-    # Remove leading and trailing whites space and
-    # check for 4 special cases of non-numbers. Then
-    # remove any leading positive or negative signs.
-    #
-    number = str(number).strip()
-    if number in ['', '.', '+', '-']:
-        isNumber = False
-    if isNumber and number[0] in '+-':
-        number = number[1:]
-        #
-    # Loop through the string checking to make sure
-    # the characters are all legal integer characters.
-    #
-    legalValues = '.0123456789'
-    for character in number:
-        if character not in legalValues:
-            isNumber = False
-        if character == '.':
-            legalValues = '0123456789'
-
-    return isNumber
+    return not isinstance(parse_number(number), ParseError)
 
 
 def get_positive_number(prompt):
@@ -124,7 +290,7 @@ def get_number_between(low, high, prompt="Enter a number:"):
 def get_boolean(prompt):
     """Ask the user a yes or no question"""
     prompt = prompt + " (y/n) "
-    answer = input(prompt)
+    answer = get_input(prompt)
     answer = answer.lower()
     if answer in ['yes', 'sure', 'yeah', 'true', 'absolutely', 'y', 'da', 'si']:
         answer = True
@@ -140,11 +306,11 @@ def get_string(prompt):
     """Get and return a non-empty string"""
     if prompt[-1] != " ":
         prompt = prompt + " "
-    string = input(prompt)
+    string = get_input(prompt)
     while not string:
         if prompt[-31:] != " (you have to enter something) ":
             prompt = prompt + "(you have to enter something) "
-        string = input(prompt)
+        string = get_input(prompt)
     return string
 
 